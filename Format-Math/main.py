@@ -7,7 +7,7 @@ from copy import deepcopy
 from dataclasses import dataclass
 import re
 from dotenv import load_dotenv
-from math_verify import parse, verify
+from math_verify import extract_candidates, verify
 from math_verify.parser import LatexExtractionConfig, StringExtractionConfig, ExprExtractionConfig, MultiChoiceExtractionConfig
 from tqdm import tqdm
 from utils import read_data_file, format_prompt, ensure_math_delimiters
@@ -313,15 +313,6 @@ def parse_llm_response(response_text):
         traceback.print_exc()
         return None
 
-def format_boxed(response_text: str) -> str:
-    if "boxed" in response_text:
-        response_text = re.sub(
-            r"(\\boxed\{)\s*([^}]+?)\s*(\})",  
-            r"\1 \2 \3",                       
-            response_text
-        )
-    return response_text
-        
 def verify_answer(response_json):
     """Verify the answer using math_verify, trying all extraction configs if the initial one fails"""
     if not response_json:
@@ -337,37 +328,31 @@ def verify_answer(response_json):
             
         answer = ensure_math_delimiters(answer)
         
-        if answer_type == "LatexExtractionConfig":
-            config = [LatexExtractionConfig(), ExprExtractionConfig()]
-        elif answer_type == "ExprExtractionConfig":
-            config = [ExprExtractionConfig()]
-        # elif answer_type == "StringExtractionConfig":
-        #     config = [StringExtractionConfig()]
-        elif answer_type == "MultiChoiceExtractionConfig":
-            config = [MultiChoiceExtractionConfig()]
-        else:
-            config = [LatexExtractionConfig(), ExprExtractionConfig()]
-        
-        gold = parse(answer, extraction_config=config)
-        parsed_explanation = parse(explanation, extraction_config=config)
-        
-        if verify(gold, parsed_explanation):
-            return True, answer_type
-        
         config_types = [
             ("LatexExtractionConfig", [LatexExtractionConfig(), ExprExtractionConfig()]),
             ("ExprExtractionConfig", [ExprExtractionConfig()]),
             # ("StringExtractionConfig", [StringExtractionConfig()]),
             ("MultiChoiceExtractionConfig", [MultiChoiceExtractionConfig()])
         ]
+        # Each text is scanned and parsed once, every config below reuses those extractions
+        extraction_targets = [LatexExtractionConfig(), ExprExtractionConfig(), MultiChoiceExtractionConfig()]
+        answer_candidates = extract_candidates(answer, extraction_targets)
+        explanation_candidates = extract_candidates(explanation, extraction_targets)
+        
+        config = dict(config_types).get(answer_type, [LatexExtractionConfig(), ExprExtractionConfig()])
+        gold = answer_candidates.parse(config)
+        parsed_explanation = explanation_candidates.parse(config)
+        
+        if verify(gold, parsed_explanation):
+            return True, answer_type
         
         for type_name, config in config_types:
             if type_name == answer_type:
                 continue 
                 
             try:
-                gold = parse(format_boxed(answer), extraction_config=config)
-                parsed_explanation = parse(format_boxed(explanation), extraction_config=config)
+                gold = answer_candidates.parse(config)
+                parsed_explanation = explanation_candidates.parse(config)
                 
                 if verify(gold, parsed_explanation):
                     print(f"Verification succeeded with alternative type: {type_name}")
@@ -0,0 +1,86 @@
+"""Benchmark of the columnar numeric evaluation against `math_metric` on GSM8K-like outputs.
+
+Scores a column of predictions with `evaluate_numeric_column` and a sample of it row by row with
+`math_metric` (the per-row time is extrapolated to the whole column), and checks that both agree
+on the sample.
+
+Usage:
+    python benchmarks/bench_columnar.py --num_rows 1000000 --metric_rows 2000
+"""
+
+import argparse
+import random
+import time
+
+from math_verify import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    evaluate_numeric_column,
+    math_metric,
+)
+from math_verify.parser import clear_parse_caches
+
+TEMPLATES = [
+    "She sold {} clips in total. The final answer is {}. I hope it is correct.",
+    "Adding both days gives {}, so the answer is {}",
+    "The total cost is {} dollars. Therefore the answer is $\\boxed{{{}}}$.",
+    "Đáp án đúng là {}",
+]
+
+GOLD_TARGET = (ExprExtractionConfig(),)
+PRED_TARGET = (LatexExtractionConfig(), ExprExtractionConfig())
+
+
+def make_row(rng: random.Random) -> tuple[str, str]:
+    gold = rng.randint(1, 2000)
+    answer = gold if rng.random() < 0.6 else rng.randint(1, 2000)
+    template = rng.choice(TEMPLATES)
+    answer_text = rng.choice([str(answer), f"{answer}.0", f"{answer:,}"])
+    if template.count("{}") == 2:
+        return str(gold), template.format(rng.randint(1, 2000), answer_text)
+    return str(gold), template.format(answer_text)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the columnar numeric evaluation"
+    )
+    parser.add_argument(
+        "--num_rows", type=int, default=100_000, help="Rows of the column"
+    )
+    parser.add_argument(
+        "--metric_rows", type=int, default=1000, help="Rows scored with math_metric"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rows = [make_row(rng) for _ in range(args.num_rows)]
+    golds = [gold for gold, _ in rows]
+    predictions = [prediction for _, prediction in rows]
+
+    clear_parse_caches()
+    metric = math_metric(GOLD_TARGET, PRED_TARGET)
+    sample = rows[: args.metric_rows]
+    start = time.perf_counter()
+    expected = [bool(metric([gold], [prediction])[0]) for gold, prediction in sample]
+    metric_time = (time.perf_counter() - start) / len(sample) * len(rows)
+
+    clear_parse_caches()
+    start = time.perf_counter()
+    matches = evaluate_numeric_column(golds, predictions, GOLD_TARGET, PRED_TARGET)
+    columnar_time = time.perf_counter() - start
+
+    disagreements = sum(
+        bool(match) != exp for match, exp in zip(matches, expected, strict=False)
+    )
+    print(
+        f"{len(rows)} rows: math_metric {metric_time:8.2f} s (extrapolated), "
+        f"columnar {columnar_time:8.2f} s ({metric_time / columnar_time:.1f}x), "
+        f"accuracy {sum(map(bool, matches)) / len(rows):.4f}, "
+        f"{disagreements} disagreements on {len(sample)} rows"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Benchmark of the answer extraction on long chain-of-thought outputs.
+
+Compares `extract_target_from_pred` without the literal anchor prefilter (which skips the patterns
+whose anchor text, e.g. "final answer", "answer" or \\boxed, doesn't occur in the prediction), with
+it, and with it plus a tail search window. It also compares the anchor scanners: `scan_anchors`, which
+searches each literal separately, and a single pass with a lookahead alternation of all the literals.
+
+Usage:
+    python benchmarks/bench_extraction.py --num_samples 50 --length 30000 --search_window 4096
+"""
+
+import argparse
+import random
+import re
+import time
+from unittest.mock import patch
+
+from math_verify.parser import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    clear_parse_caches,
+    extract_target_from_pred,
+    get_extraction_regexes,
+    required_anchors,
+    scan_anchors,
+)
+
+REASONING_STEPS = [
+    "Let us consider the equation $x^2 - 5x + 6 = 0$ and factor it. ",
+    "We can rewrite the sum as \\(\\sum_{k=1}^{n} k = \\frac{n(n+1)}{2}\\). ",
+    "Substituting $n = 10$ gives 55, which we double check by direct addition. ",
+    "Hmm, wait, let me re-check the previous step, 3 * 4 = 12 and 12 + 7 = 19. ",
+    "Now, the area of the triangle is $\\frac{1}{2} b h$ with b = 6 and h = 4. ",
+    "So far we have established the key identity, now we need the boundary case. ",
+]
+
+ENDINGS = {
+    "boxed": "Therefore the result is $\\boxed{\\frac{3}{4}}$.",
+    "final answer": "The final answer is $\\frac{3}{4}$. I hope it is correct.",
+    "no anchor": "which gives $\\frac{3}{4}$.",
+}
+
+
+def make_prediction(length: int, ending: str, rng: random.Random) -> str:
+    steps = []
+    while sum(len(step) for step in steps) < length:
+        steps.append(rng.choice(REASONING_STEPS))
+    return "".join(steps) + ENDINGS[ending]
+
+
+def scan_anchors_single_pass(text: str, anchors: list[str]) -> dict[str, list[int]]:
+    """Same result as `scan_anchors`, with a single lookahead alternation over all the literals."""
+    # Longest alternatives first, so that the lookahead reports the longest anchor at each position,
+    # the anchors that are its prefix are implied by it.
+    ordered = sorted(set(anchors), key=len, reverse=True)
+    scanner = re.compile(
+        "(?=(?:" + "|".join(f"({re.escape(anchor)})" for anchor in ordered) + "))",
+        re.IGNORECASE,
+    )
+    implied = [
+        [other for other in ordered if anchor.lower().startswith(other.lower())]
+        for anchor in ordered
+    ]
+    positions: dict[str, list[int]] = {}
+    for match in scanner.finditer(text):
+        for anchor in implied[match.lastindex - 1]:
+            positions.setdefault(anchor, []).append(match.start())
+    return positions
+
+
+def run_scanner(preds: list[str], anchors: list[str], scanner) -> float:
+    start = time.perf_counter()
+    for pred in preds:
+        scanner(pred, anchors)
+    return time.perf_counter() - start
+
+
+def run(
+    preds: list[str], target_res, prefilter: bool, search_window: int | None = None
+) -> float:
+    clear_parse_caches()
+    start = time.perf_counter()
+    if prefilter:
+        for pred in preds:
+            extract_target_from_pred(
+                pred,
+                target_res,
+                extraction_mode="first_match",
+                search_window=search_window,
+            )
+    else:
+        with patch("math_verify.parser.can_match", return_value=True):
+            for pred in preds:
+                extract_target_from_pred(
+                    pred, target_res, extraction_mode="first_match"
+                )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark answer extraction on long outputs"
+    )
+    parser.add_argument(
+        "--num_samples", type=int, default=20, help="Predictions per ending"
+    )
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=30_000,
+        help="Length of the reasoning in characters",
+    )
+    parser.add_argument(
+        "--search_window",
+        type=int,
+        default=4096,
+        help="Initial tail window in characters",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    target_res = get_extraction_regexes(
+        (LatexExtractionConfig(), ExprExtractionConfig())
+    )
+    anchors = required_anchors(
+        pattern for patterns, _ in target_res for pattern, _ in patterns
+    )
+    for ending in ENDINGS:
+        preds = [
+            make_prediction(args.length, ending, rng) for _ in range(args.num_samples)
+        ]
+        full = run(preds, target_res, prefilter=False)
+        filtered = run(preds, target_res, prefilter=True)
+        windowed = run(
+            preds, target_res, prefilter=True, search_window=args.search_window
+        )
+        print(
+            f"{ending:>12}: full scan {full / len(preds) * 1000:8.2f} ms/sample, "
+            f"prefiltered {filtered / len(preds) * 1000:8.2f} ms/sample ({full / filtered:.2f}x), "
+            f"tail window {windowed / len(preds) * 1000:8.2f} ms/sample ({full / windowed:.2f}x)"
+        )
+        assert all(
+            scan_anchors(pred, anchors) == scan_anchors_single_pass(pred, anchors)
+            for pred in preds
+        )
+        per_literal = run_scanner(preds, anchors, scan_anchors)
+        single_pass = run_scanner(preds, anchors, scan_anchors_single_pass)
+        print(
+            f"{'':>12}  anchor scan: per literal {per_literal / len(preds) * 1000:8.2f} ms/sample, "
+            f"single alternation pass {single_pass / len(preds) * 1000:8.2f} ms/sample"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark of the rational function normal form tier on the `tests/test_all.py` corpus.
+
+Verifies every (gold, pred) pair of the parametrized tests of `tests/test_all.py` with and without
+`rational_function_eq`, which decides polynomials and rational functions over QQ before `simplify`,
+and reports the verification time of the whole corpus and the time spent in the symbolic comparisons.
+Most pairs of the corpus are decided before the symbolic comparison, so the same is done on generated
+polynomial and rational function answers (factored gold, expanded prediction, a third of them wrong).
+
+Usage:
+    python benchmarks/bench_symbolic.py --repeat 3 --num_generated 200
+"""
+
+import argparse
+import importlib.util
+import logging
+import random
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import patch
+
+import sympy
+from sympy.core.cache import clear_cache
+
+from math_verify import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    grader,
+    parse,
+    verify,
+)
+from math_verify.grader import clear_sympy_caches
+
+TARGETS = (LatexExtractionConfig(boxed_match_priority=0), ExprExtractionConfig())
+
+
+def load_corpus() -> list[tuple[str, str]]:
+    path = Path(__file__).parent.parent / "tests" / "test_all.py"
+    spec = importlib.util.spec_from_file_location("test_all", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    pairs = []
+    for test in vars(module).values():
+        for mark in getattr(test, "pytestmark", []):
+            if mark.name != "parametrize" or not mark.args[0].startswith("gold,pred"):
+                continue
+            for values in mark.args[1]:
+                values = getattr(values, "values", values)
+                pairs.append((values[0], values[1]))
+    return pairs
+
+
+def make_generated_pair(rng: random.Random) -> tuple[str, str]:
+    symbols = sympy.symbols("x y z")[: rng.randint(1, 3)]
+
+    def factor() -> sympy.Expr:
+        return sum(rng.randint(-5, 5) * s for s in symbols) + rng.randint(1, 5)
+
+    gold = sympy.Mul(*[factor() ** rng.randint(1, 3) for _ in range(rng.randint(2, 3))])
+    if rng.random() < 0.3:
+        gold = gold / factor()
+    pred = sympy.expand(gold) if gold.is_polynomial() else sympy.apart(gold, symbols[0])
+    if rng.random() < 1 / 3:
+        pred = pred + rng.choice(symbols)
+    return f"${sympy.latex(gold)}$", f"${sympy.latex(pred)}$"
+
+
+def run(parsed, rational_tier: bool) -> tuple[float, float, int, list[bool]]:
+    """Returns the total time, the time and number of the symbolic comparisons and the results."""
+    # Also the internal cache of sympy, which would otherwise keep the results of the previous run
+    clear_cache()
+    clear_sympy_caches()
+    symbolic_times = []
+    symbolic_eq = grader.sympy_symbolic_eq
+
+    def timed_symbolic_eq(a, b):
+        start = time.perf_counter()
+        try:
+            return symbolic_eq(a, b)
+        finally:
+            symbolic_times.append(time.perf_counter() - start)
+
+    results, times = [], []
+    with patch("math_verify.grader.sympy_symbolic_eq", side_effect=timed_symbolic_eq):
+        with (
+            nullcontext()
+            if rational_tier
+            else patch("math_verify.grader.rational_function_eq", return_value=None)
+        ):
+            for gold, pred in parsed:
+                start = time.perf_counter()
+                results.append(verify(gold, pred))
+                times.append(time.perf_counter() - start)
+    return sum(times), sum(symbolic_times), len(symbolic_times), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rational function tier")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs of each configuration"
+    )
+    parser.add_argument(
+        "--num_generated", type=int, default=200, help="Generated polynomial pairs"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    # Some of the pairs log the failures of their comparison
+    logging.disable(logging.ERROR)
+
+    rng = random.Random(args.seed)
+    corpora = {
+        "tests/test_all.py": load_corpus(),
+        "generated": [make_generated_pair(rng) for _ in range(args.num_generated)],
+    }
+    for corpus, pairs in corpora.items():
+        parsed = [(parse(gold, TARGETS), parse(pred, TARGETS)) for gold, pred in pairs]
+        # Warm up the sympy internals shared by both configurations
+        run(parsed, rational_tier=True)
+
+        print(f"{corpus}, {len(pairs)} pairs")
+        # The configurations alternate, so that both see the same drift of the machine
+        best = {False: (float("inf"), float("inf")), True: (float("inf"), float("inf"))}
+        results = {}
+        for _ in range(args.repeat):
+            for rational_tier in (False, True):
+                total, symbolic, num_symbolic, results[rational_tier] = run(
+                    parsed, rational_tier
+                )
+                best_total, best_symbolic = best[rational_tier]
+                best[rational_tier] = (
+                    min(best_total, total),
+                    min(best_symbolic, symbolic),
+                )
+        for rational_tier, (best_total, best_symbolic) in best.items():
+            name = "with normal forms" if rational_tier else "simplify only    "
+            print(
+                f"  {name}: {best_total:7.3f} s, "
+                f"{num_symbolic} symbolic comparisons in {best_symbolic:7.3f} s"
+            )
+        disagreements = sum(
+            a != b for a, b in zip(results[False], results[True], strict=True)
+        )
+        print(f"  {disagreements} disagreements")
+
+
+if __name__ == "__main__":
+    main()
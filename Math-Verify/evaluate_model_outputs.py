@@ -1,6 +1,7 @@
 import argparse
 import pandas as pd
 from typing import Any
+from math_verify.cache import ParseCache, VerifyCache
 from math_verify.metric import math_metric
 from math_verify.parser import LatexExtractionConfig, ExprExtractionConfig
 import sympy
@@ -10,6 +11,8 @@ def parse_args():
     parser.add_argument('--input_csv', type=str, required=True, help='Path to input CSV file containing model outputs')
     parser.add_argument('--output_csv', type=str, required=True, help='Path to output CSV file for extracted answers')
     parser.add_argument('--gold_is_latex', action='store_true', help='Use basic latex normalization', default=True)
+    parser.add_argument('--parse_cache', type=str, default=None, help='Path to a SQLite file used to cache parse results across runs')
+    parser.add_argument('--verify_cache', type=str, default=None, help='Path to a SQLite file used to cache verify results across runs')
     return parser.parse_args()
 
 def load_csv_data(csv_path: str) -> pd.DataFrame:
@@ -51,7 +54,7 @@ def compare_answers(extracted: Any, gold: Any) -> bool:
         # If comparison fails (e.g. different types), return False
         return False
 
-def process_answers(df: pd.DataFrame, gold_is_latex: bool) -> pd.DataFrame:
+def process_answers(df: pd.DataFrame, gold_is_latex: bool, parse_cache: ParseCache | None = None, verify_cache: VerifyCache | None = None) -> pd.DataFrame:
     """Process each answer through the sympy extraction workflow and compare with gold using math_verify."""
     results = []
     
@@ -64,7 +67,9 @@ def process_answers(df: pd.DataFrame, gold_is_latex: bool) -> pd.DataFrame:
         gold_extraction_target=(LatexExtractionConfig() if gold_is_latex else ExprExtractionConfig(),),
         pred_extraction_target=(ExprExtractionConfig(), LatexExtractionConfig()),
         aggregation_function=max,
-        precision=6
+        precision=6,
+        parse_cache=parse_cache,
+        verify_cache=verify_cache,
     )
     
     for _, row in df.iterrows():
@@ -129,7 +134,9 @@ def main():
     input_df = load_csv_data(args.input_csv)
     
     # Process answers and extract sympy objects
-    results_df = process_answers(input_df, args.gold_is_latex)
+    parse_cache = ParseCache(args.parse_cache) if args.parse_cache else None
+    verify_cache = VerifyCache(args.verify_cache) if args.verify_cache else None
+    results_df = process_answers(input_df, args.gold_is_latex, parse_cache, verify_cache)
     
     # Save results to output CSV
     results_df.to_csv(args.output_csv, index=False)
@@ -1,7 +1,6 @@
 import argparse
 import pandas as pd
-from typing import Any
-from math_verify.parser import LatexExtractionConfig, ExprExtractionConfig, parse
+from math_verify.parser import LatexExtractionConfig, ExprExtractionConfig, ParsedAnswer, parse
 
 def parse_args():
     parser = argparse.ArgumentParser(description='Extract and evaluate answers using sympy')
@@ -20,16 +19,11 @@ def load_csv_data(csv_path: str) -> pd.DataFrame:
     except Exception as e:
         raise Exception(f"Error loading CSV file: {str(e)}")
 
-def serialize_sympy_object(obj: Any) -> str:
-    """Convert sympy object to string representation."""
-    if obj is None:
+def serialize_parsed_answer(answer: ParsedAnswer | None) -> str:
+    """Convert a parsed answer to its normalized string, without converting the sympy object."""
+    if answer is None:
         return ""
-    try:
-        if isinstance(obj, (list, tuple)):
-            return ", ".join(str(x) if x is not None else "" for x in obj)
-        return str(obj)
-    except Exception as e:
-        return f"Error: {str(e)}"
+    return answer.normalized
 
 def process_answers(df: pd.DataFrame) -> pd.DataFrame:
     """Process each answer through the sympy extraction workflow."""
@@ -40,12 +34,12 @@ def process_answers(df: pd.DataFrame) -> pd.DataFrame:
     for _, row in df.iterrows():
         try:
             # Extract answer using regexes
-            extracted = parse(row['answer'], extraction_config=extraction_target)
+            extracted = parse(row['answer'], extraction_config=extraction_target, structured=True)
             feedback = None
             extracted_answer = None
             if len(extracted) == 2:
                 extracted_answer = extracted[0]
-                feedback = extracted[1]
+                feedback = extracted[1].normalized
             elif len(extracted) == 1:
                 extracted_answer = extracted[0]
             else:
@@ -56,7 +50,7 @@ def process_answers(df: pd.DataFrame) -> pd.DataFrame:
             
             result = {
                 'original_answer': row['answer'],
-                'extracted_answer': serialize_sympy_object(extracted_answer),
+                'extracted_answer': serialize_parsed_answer(extracted_answer),
                 'extracted_feedback': feedback,
                 'extraction_success': extracted_answer is not None
             }
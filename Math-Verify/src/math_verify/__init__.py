@@ -2,20 +2,51 @@ from latex2sympy2_extended.latex2sympy2 import (
     NormalizationConfig as LatexNormalizationConfig,
 )
 
-from math_verify.grader import verify
-from math_verify.metric import math_metric
+from math_verify.batch import parse_many, verify_many
+from math_verify.cache import ParseCache, VerifyCache
+from math_verify.columnar import (
+    NumericColumn,
+    evaluate_numeric_column,
+    extract_numeric_column,
+    numeric_column_match,
+)
+from math_verify.grader import ComplexityLimits, GoldChecker, compile_gold, verify
+from math_verify.metric import majority_vote, math_metric, pass_at_k
 from math_verify.parser import (
     ExprExtractionConfig,
     LatexExtractionConfig,
     StringExtractionConfig,
     MultiChoiceExtractionConfig,
+    ExtractionCandidates,
+    ParsedAnswer,
+    extract_candidates,
     parse,
+    warmup,
 )
+from math_verify.pool import WorkerPool
 
 __all__ = [
     "parse",
     "verify",
+    "compile_gold",
+    "GoldChecker",
+    "ComplexityLimits",
+    "parse_many",
+    "verify_many",
+    "warmup",
+    "extract_candidates",
+    "ExtractionCandidates",
+    "ParsedAnswer",
+    "WorkerPool",
+    "ParseCache",
+    "VerifyCache",
     "math_metric",
+    "pass_at_k",
+    "majority_vote",
+    "evaluate_numeric_column",
+    "extract_numeric_column",
+    "numeric_column_match",
+    "NumericColumn",
     "ExprExtractionConfig",
     "LatexExtractionConfig",
     "StringExtractionConfig",
@@ -0,0 +1,175 @@
+# MIT License
+
+# Copyright (c) 2024 The HuggingFace Team
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import atexit
+import logging
+from typing import Literal, Sequence
+
+from sympy import Basic, MatrixBase
+
+from math_verify.cache import VerifyCache
+from math_verify.grader import (
+    DEFAULT_COMPLEXITY_LIMITS,
+    ComplexityLimits,
+    NumericProbing,
+    verify,
+)
+from math_verify.parser import (
+    ExprExtractionConfig,
+    ExtractionTarget,
+    LatexExtractionConfig,
+    parse,
+    warmup,
+)
+from math_verify.pool import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Extra time the parent gives a worker on top of the in-worker timeout before killing it.
+# The in-worker timeout is the cheap path, killing a worker is the last resort.
+KILL_GRACE_SECONDS = 1.0
+
+_default_pool: WorkerPool | None = None
+
+
+def get_default_pool() -> WorkerPool:
+    """Returns the lazily created process wide WorkerPool used by parse_many and verify_many."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = WorkerPool()
+        atexit.register(_default_pool.close)
+    return _default_pool
+
+
+def _hard_deadline(timeout_seconds: float | None) -> float | None:
+    if timeout_seconds is None or timeout_seconds <= 0:
+        return None
+    return timeout_seconds + KILL_GRACE_SECONDS
+
+
+def parse_many(
+    preds: Sequence[str],
+    extraction_config: Sequence[ExtractionTarget] = (
+        LatexExtractionConfig(),
+        ExprExtractionConfig(),
+    ),
+    fallback_mode: Literal["no_fallback", "first_match"] = "first_match",
+    extraction_mode: Literal["first_match", "any_match"] = "any_match",
+    parsing_timeout: float | None = 5,
+    pool: WorkerPool | None = None,
+    search_window: int | None = None,
+) -> list[list[Basic | MatrixBase | str]]:
+    """Parses many predictions in parallel using a pool of worker processes.
+
+    Each prediction is parsed with `math_verify.parse` in a worker. The worker still uses its own
+    signal based timeout, on top of that the parent kills and replaces any worker that doesn't answer
+    within parsing_timeout + KILL_GRACE_SECONDS. Because the deadline is enforced by the parent,
+    this function can be called from any thread. The patterns of extraction_config are compiled before the
+    workers are started, so that fork based workers inherit them.
+
+    Args:
+        preds (Sequence[str]): Predictions to parse.
+        extraction_config (Sequence[ExtractionTarget], optional): See `math_verify.parse`.
+        fallback_mode (Literal["no_fallback", "first_match"], optional): See `math_verify.parse`.
+        extraction_mode (Literal["first_match", "any_match"], optional): See `math_verify.parse`.
+        parsing_timeout (float | None, optional): Time budget in seconds for each prediction. Defaults to 5.
+        pool (WorkerPool | None, optional): Pool to use. Defaults to a process wide pool with one worker per CPU.
+        search_window (int | None, optional): See `math_verify.parse`.
+
+    Returns:
+        list[list[Basic | MatrixBase | str]]: Parsed predictions in the same order as preds.
+            Predictions which timed out or crashed the worker are returned as empty lists.
+    """
+    warmup(extraction_config)
+    pool = pool or get_default_pool()
+    return pool.map(
+        parse,
+        [(pred,) for pred in preds],
+        timeout_seconds=_hard_deadline(parsing_timeout),
+        default=[],
+        kwargs={
+            "extraction_config": extraction_config,
+            "fallback_mode": fallback_mode,
+            "extraction_mode": extraction_mode,
+            "parsing_timeout": parsing_timeout,
+            "search_window": search_window,
+        },
+    )
+
+
+def verify_many(
+    golds: Sequence[list[Basic | MatrixBase | str] | Basic | MatrixBase | str],
+    targets: Sequence[list[Basic | MatrixBase | str] | Basic | MatrixBase | str],
+    float_rounding: int = 6,
+    numeric_precision: int = 15,
+    strict: bool = True,
+    timeout_seconds: float | None = 5,
+    pool: WorkerPool | None = None,
+    numeric_probing: NumericProbing = "reject",
+    cache: VerifyCache | None = None,
+    complexity_limits: ComplexityLimits | None = DEFAULT_COMPLEXITY_LIMITS,
+) -> list[bool]:
+    """Verifies many (gold, target) pairs in parallel using a pool of worker processes.
+
+    Each pair is verified with `math_verify.verify` in a worker. The parent kills and replaces any
+    worker that doesn't answer within timeout_seconds + KILL_GRACE_SECONDS, such pair counts as
+    not verified.
+
+    Args:
+        golds (Sequence): Gold answers, each as accepted by `math_verify.verify`.
+        targets (Sequence): Targets to verify, must have the same length as golds.
+        float_rounding (int, optional): See `math_verify.verify`.
+        numeric_precision (int, optional): See `math_verify.verify`.
+        strict (bool, optional): See `math_verify.verify`.
+        timeout_seconds (float | None, optional): Time budget in seconds for each item, shared by all gold x target
+            comparisons of the item. Defaults to 5.
+        pool (WorkerPool | None, optional): Pool to use. Defaults to a process wide pool with one worker per CPU.
+        numeric_probing (NumericProbing, optional): See `math_verify.verify`.
+        cache (VerifyCache | None, optional): Persistent cache of verify results, see `math_verify.verify`.
+            The workers open their own connections to the database. Defaults to None.
+        complexity_limits (ComplexityLimits | None, optional): See `math_verify.verify`.
+
+    Returns:
+        list[bool]: Verification results in the same order as the inputs.
+    """
+    if len(golds) != len(targets):
+        raise ValueError(
+            f"golds and targets must have the same length, got {len(golds)} and {len(targets)}"
+        )
+
+    pool = pool or get_default_pool()
+    return pool.map(
+        verify,
+        list(zip(golds, targets, strict=True)),
+        timeout_seconds=_hard_deadline(timeout_seconds),
+        default=False,
+        kwargs={
+            "float_rounding": float_rounding,
+            "numeric_precision": numeric_precision,
+            "strict": strict,
+            "timeout_seconds": timeout_seconds,
+            "total_timeout_seconds": timeout_seconds,
+            "numeric_probing": numeric_probing,
+            "cache": cache,
+            "complexity_limits": complexity_limits,
+        },
+    )
@@ -0,0 +1,246 @@
+# MIT License
+
+# Copyright (c) 2024 The HuggingFace Team
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Sequence
+
+from sympy import srepr
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def library_version() -> str:
+    """Returns the version of math-verify and latex2sympy2_extended, both influence the cached results."""
+    versions = []
+    for package in ("math-verify", "latex2sympy2_extended"):
+        try:
+            versions.append(f"{package}=={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}==unknown")
+    return ";".join(versions)
+
+
+def hash_key(*parts: Any) -> str:
+    """Creates a stable cache key from the repr of the parts and the library version."""
+    return hashlib.sha256(repr((library_version(),) + parts).encode()).hexdigest()
+
+
+class SQLiteCache:
+    """A size bounded key-value store persisted in a SQLite database.
+
+    Values are pickled. The database uses WAL journaling, so it can be shared by multiple processes
+    (e.g. WorkerPool workers), each process and thread opens its own connection. When the number of
+    entries exceeds max_entries, the least recently used entries are evicted.
+
+    Args:
+        path (str): Path of the SQLite database file, created if it doesn't exist.
+        max_entries (int): Maximum number of entries to keep. Defaults to 1_000_000.
+    """
+
+    # Fraction of max_entries to keep after eviction, so that we don't evict on every write
+    EVICTION_TARGET_RATIO = 0.9
+
+    def __init__(self, path: str, max_entries: int = 1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        # How often (in writes) to check whether eviction is needed, counting rows is not free
+        self._eviction_check_interval = max(1, min(1000, max_entries // 10))
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connection().execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Connections can't be pickled, the unpickled cache (e.g. in a WorkerPool worker) opens its own
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections can't be shared across processes (fork) and threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Any | None:
+        """Returns the value stored for key or None if there is no such entry."""
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            return pickle.loads(row[0])
+        except Exception:
+            # The cache is best effort, it must never break the caller
+            logger.warning("Could not read from the cache, ignoring it", exc_info=True)
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Stores value for key, replacing any existing entry."""
+        try:
+            data = pickle.dumps(value)
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, last_access) VALUES (?, ?, ?)",
+                (key, data, time.time()),
+            )
+            self._writes += 1
+            if self._writes % self._eviction_check_interval == 0:
+                self.evict()
+        except Exception:
+            logger.warning("Could not write to the cache, ignoring it", exc_info=True)
+
+    def evict(self) -> None:
+        """Evicts the least recently used entries if there are more than max_entries."""
+        conn = self._connection()
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count <= self.max_entries:
+            return
+        to_remove = count - int(self.max_entries * self.EVICTION_TARGET_RATIO)
+        conn.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY last_access LIMIT ?)",
+            (to_remove,),
+        )
+
+    def __len__(self) -> int:
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        self._connection().execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        """Closes the connection of the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class ParseCache(SQLiteCache):
+    """Persistent cache of `math_verify.parse` results.
+
+    Entries are keyed by a hash of the prediction, the extraction config, fallback_mode, extraction_mode
+    and the library version, so a cache can be safely reused across runs and is invalidated on upgrade.
+
+    Example:
+        >>> cache = ParseCache("parse_cache.sqlite")
+        >>> parse("$\\frac{1}{2}$", cache=cache)  # Parsed and stored
+        >>> parse("$\\frac{1}{2}$", cache=cache)  # Loaded from the cache
+    """
+
+    @staticmethod
+    def make_key(
+        pred: str,
+        extraction_config: Sequence[Any],
+        fallback_mode: str,
+        extraction_mode: str,
+        structured: bool = False,
+    ) -> str:
+        parts = (
+            "parse",
+            pred,
+            tuple(extraction_config),
+            fallback_mode,
+            extraction_mode,
+        )
+        # Keeps the keys of plain results unchanged
+        if structured:
+            parts += ("structured",)
+        return hash_key(*parts)
+
+
+def answer_fingerprint(answer: Any) -> Any:
+    """Returns a picklable fingerprint of a parsed answer, its srepr for sympy objects.
+
+    Unlike str, srepr keeps the exact structure and the assumptions of the symbols, so two answers with the same
+    fingerprint are compared the same way by `math_verify.verify`.
+    """
+    if isinstance(answer, str):
+        return ("str", answer)
+    return srepr(answer)
+
+
+class VerifyCache(SQLiteCache):
+    """Persistent cache of `math_verify.verify` results.
+
+    Entries are keyed by a hash of the fingerprints (see `answer_fingerprint`) of gold and target, float_rounding,
+    numeric_precision, strict, numeric_probing, complexity_limits and the library version. Only conclusive results are stored: when a
+    comparison timed out or failed, a False result is not cached, it might be different on the next run.
+    The cache can be passed to `verify_many`, its workers share the database.
+
+    Example:
+        >>> cache = VerifyCache("verify_cache.sqlite")
+        >>> verify(parse("$x^2 - 1$"), parse("$(x - 1)(x + 1)$"), cache=cache)  # Compared and stored
+        >>> verify(parse("$x^2 - 1$"), parse("$(x - 1)(x + 1)$"), cache=cache)  # Loaded from the cache
+    """
+
+    @staticmethod
+    def make_key(
+        gold: Sequence[Any],
+        target: Sequence[Any],
+        float_rounding: int,
+        numeric_precision: int,
+        strict: bool,
+        numeric_probing: str,
+        complexity_limits: Any = None,
+    ) -> str:
+        return hash_key(
+            "verify",
+            tuple(answer_fingerprint(g) for g in gold),
+            tuple(answer_fingerprint(t) for t in target),
+            float_rounding,
+            numeric_precision,
+            strict,
+            numeric_probing,
+            complexity_limits,
+        )
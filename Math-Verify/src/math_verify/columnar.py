@@ -0,0 +1,288 @@
+# MIT License
+
+# Copyright (c) 2024 The HuggingFace Team
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, Sequence
+
+from math_verify.cache import ParseCache
+from math_verify.grader import (
+    canonical_latex_string,
+    int_array,
+    number_value,
+    rounded_numbers_eq,
+    rounded_numbers_eq_array,
+)
+from math_verify.parser import (
+    ExprExtractionConfig,
+    ExtractionTarget,
+    LatexExtractionConfig,
+    parse,
+)
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the columns are then plain lists
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NumericColumn:
+    """Numeric answers of a column of texts, one row per text.
+
+    With numpy installed the fields are arrays, otherwise lists.
+
+    Attributes:
+        values: float64 value of each row, nan if no number was extracted
+        numerators: Numerator of the exact value of each row (the decimal value of decimals, see `exact_number`), int64 if all of them fit (object array otherwise)
+        denominators: Positive denominator of the exact value of each row, like numerators
+        is_float: Whether the number of a row is a decimal (a sympy `Float`), which is compared with rounding
+        valid: Whether a number was extracted for the row, rows without one have the value 0/1
+        strings: Canonical extracted string of each row (see `canonical_latex_string`), "" if nothing was extracted
+    """
+
+    values: Any
+    numerators: Any
+    denominators: Any
+    is_float: Any
+    valid: Any
+    strings: Any
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    @property
+    def fractions(self) -> Any:
+        """Exact value of each row as a `Fraction` (an object array with numpy), None for rows without a number."""
+        fractions = [
+            Fraction(int(numerator), int(denominator)) if valid else None
+            for numerator, denominator, valid in zip(
+                self.numerators, self.denominators, self.valid, strict=True
+            )
+        ]
+        if np is None:
+            return fractions
+        return _object_array(fractions)
+
+
+def _float_value(fraction: Fraction | None) -> float:
+    if fraction is None:
+        return float("nan")
+    try:
+        return float(fraction)
+    except OverflowError:
+        return float("inf") if fraction > 0 else float("-inf")
+
+
+def _object_array(values: list) -> Any:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _extract_row(
+    text: str,
+    extraction_config: Sequence[ExtractionTarget],
+    parsing_timeout: float | None,
+    parse_cache: ParseCache | None,
+) -> tuple[Fraction | None, bool, str]:
+    answers = parse(
+        text, extraction_config, parsing_timeout=parsing_timeout, cache=parse_cache
+    )
+    number = next(
+        (number for number in map(number_value, answers) if number is not None),
+        None,
+    )
+    string = next((answer for answer in answers if isinstance(answer, str)), "")
+    fraction, is_float = number if number is not None else (None, False)
+    return fraction, is_float, canonical_latex_string(string)
+
+
+def extract_numeric_column(
+    texts: Sequence[str],
+    extraction_config: Sequence[ExtractionTarget] = (
+        LatexExtractionConfig(),
+        ExprExtractionConfig(),
+    ),
+    parsing_timeout: float | None = 5,
+    parse_cache: ParseCache | None = None,
+) -> NumericColumn:
+    """Extracts the numeric answer of every text of a column.
+
+    The extraction is the same as `parse(text, extraction_config)`, a row holds its first numeric answer
+    (integer, fraction, decimal or percentage). Answers which are not numbers, e.g. `\\sqrt{2}` or `x + 1`,
+    leave the row without a value. Identical texts are extracted once.
+
+    Args:
+        texts (Sequence[str]): The texts, e.g. the predictions or the golds of a dataset.
+        extraction_config (Sequence[ExtractionTarget], optional): Extraction targets. Defaults to
+            (LatexExtractionConfig(), ExprExtractionConfig()).
+        parsing_timeout (float | None, optional): Timeout of the extraction of each text. Defaults to 5.
+        parse_cache (ParseCache | None, optional): Persistent cache of the parse results. Defaults to None.
+
+    Returns:
+        NumericColumn: The extracted numbers.
+    """
+    unique = {
+        text: _extract_row(text, extraction_config, parsing_timeout, parse_cache)
+        for text in dict.fromkeys(texts)
+    }
+    rows = [unique[text] for text in texts]
+    fractions = [Fraction(0) if f is None else f for f, _, _ in rows]
+    values = [_float_value(fraction) for fraction, _, _ in rows]
+    numerators = [fraction.numerator for fraction in fractions]
+    denominators = [fraction.denominator for fraction in fractions]
+    is_float = [is_float for _, is_float, _ in rows]
+    valid = [fraction is not None for fraction, _, _ in rows]
+    strings = [string for _, _, string in rows]
+    if np is None:
+        return NumericColumn(values, numerators, denominators, is_float, valid, strings)
+
+    return NumericColumn(
+        np.array(values, dtype=np.float64),
+        int_array(numerators),
+        int_array(denominators),
+        np.array(is_float, dtype=bool),
+        np.array(valid, dtype=bool),
+        _object_array(strings),
+    )
+
+
+def numeric_column_match(
+    gold: NumericColumn, pred: NumericColumn, float_rounding: int = 6
+) -> Any:
+    """Compares two numeric columns row by row.
+
+    A row matches when the extracted strings are equal (like the string tier of `verify`), or when both
+    rows have a number and the numbers are equal: exactly if both are integers or fractions, after rounding
+    to float_rounding decimal places like sympy (see `rounded_numbers_eq`) if one of them is a decimal. These
+    are the semantics of `verify` for pairs of numbers.
+
+    Args:
+        gold (NumericColumn): Gold numbers.
+        pred (NumericColumn): Predicted numbers, with as many rows as gold.
+        float_rounding (int, optional): Number of decimal places to round decimals to. Defaults to 6.
+
+    Returns:
+        A bool array (a list without numpy) with whether each row matches.
+    """
+    if len(gold) != len(pred):
+        raise ValueError(
+            f"Columns have different lengths: {len(gold)} golds, {len(pred)} predictions"
+        )
+
+    if np is None:
+        return [
+            bool(gold_string)
+            and gold_string == pred_string
+            or (
+                gold_fraction is not None
+                and pred_fraction is not None
+                and (
+                    rounded_numbers_eq(
+                        gold_fraction,
+                        gold_is_float,
+                        pred_fraction,
+                        pred_is_float,
+                        float_rounding,
+                    )
+                    if gold_is_float or pred_is_float
+                    else gold_fraction == pred_fraction
+                )
+            )
+            for gold_fraction, pred_fraction, gold_is_float, pred_is_float, gold_string, pred_string in zip(
+                gold.fractions,
+                pred.fractions,
+                gold.is_float,
+                pred.is_float,
+                gold.strings,
+                pred.strings,
+                strict=True,
+            )
+        ]
+
+    valid = gold.valid & pred.valid
+    rounded = valid & (gold.is_float | pred.is_float)
+    # Fractions are in lowest terms with positive denominators
+    matches = (
+        valid
+        & ~rounded
+        & (gold.numerators == pred.numerators)
+        & (gold.denominators == pred.denominators)
+    )
+    # Rounding the float64 values would break ties such as 0.1234565 differently than verify, the decimal values
+    # are rounded
+    matches[rounded] = rounded_numbers_eq_array(
+        gold.numerators[rounded],
+        gold.denominators[rounded],
+        gold.is_float[rounded],
+        pred.numerators[rounded],
+        pred.denominators[rounded],
+        pred.is_float[rounded],
+        float_rounding,
+    )
+    matches |= (gold.strings != "") & (gold.strings == pred.strings)
+    return matches
+
+
+def evaluate_numeric_column(
+    golds: Sequence[str],
+    predictions: Sequence[str],
+    gold_extraction_target: Sequence[ExtractionTarget] = (ExprExtractionConfig(),),
+    pred_extraction_target: Sequence[ExtractionTarget] = (
+        LatexExtractionConfig(),
+        ExprExtractionConfig(),
+    ),
+    float_rounding: int = 6,
+    parsing_timeout: float | None = 5,
+    parse_cache: ParseCache | None = None,
+) -> Any:
+    """Scores a column of predictions against a column of numeric golds, one gold per prediction.
+
+    This is a faster alternative to `math_metric` for tasks whose answers are numbers, such as GSM8K or
+    AMC23: no sympy comparison is done and the extracted numbers are compared in one step for the whole
+    column (see `numeric_column_match`). Answers which are not numbers don't match.
+
+    Args:
+        golds (Sequence[str]): Gold answers.
+        predictions (Sequence[str]): Predictions, with as many rows as golds.
+        gold_extraction_target (Sequence[ExtractionTarget], optional): Extraction targets of the golds.
+            Defaults to (ExprExtractionConfig(),).
+        pred_extraction_target (Sequence[ExtractionTarget], optional): Extraction targets of the predictions.
+            Defaults to (LatexExtractionConfig(), ExprExtractionConfig()).
+        float_rounding (int, optional): Number of decimal places to round decimals to. Defaults to 6.
+        parsing_timeout (float | None, optional): Timeout of the extraction of each text. Defaults to 5.
+        parse_cache (ParseCache | None, optional): Persistent cache of the parse results. Defaults to None.
+
+    Returns:
+        A bool array (a list without numpy) with whether each prediction matches its gold.
+    """
+    gold = extract_numeric_column(
+        golds, gold_extraction_target, parsing_timeout, parse_cache
+    )
+    pred = extract_numeric_column(
+        predictions, pred_extraction_target, parsing_timeout, parse_cache
+    )
+    return numeric_column_match(gold, pred, float_rounding)
@@ -22,24 +22,42 @@
 
 # Heavily inspired by https://github.com/QwenLM/Qwen2.5-Math and https://github.com/huggingface/lm-evaluation-harness
 import logging
+import os
+import random
 import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from decimal import Decimal, localcontext
+from fractions import Fraction
 from itertools import product
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Literal
 
+import mpmath
+import mpmath.libmp as mlib
 from latex2sympy2_extended import is_expr_of_only_symbols
 from latex2sympy2_extended.logic import And
 from latex2sympy2_extended.sets import FiniteSet
 from sympy import (
+    QQ,
+    Add,
     Basic,
     E,
     Eq,
+    Expr,
     Float,
     GreaterThan,
+    ImmutableMatrix,
+    Integer,
     Interval,
     LessThan,
     MatrixBase,
     MatrixExpr,
     Mul,
     Number,
+    Pow,
     Rational,
     Set,
     StrictGreaterThan,
@@ -47,8 +65,10 @@ from sympy import (
     Symbol,
     Tuple,
     default_sort_key,
+    lambdify,
     nan,
     ordered,
+    preorder_traversal,
     simplify,
     solve,
     zoo,
@@ -58,7 +78,18 @@ from sympy.core.function import UndefinedFunction
 from sympy.core.relational import Relational
 
 from math_verify.errors import TimeoutException
-from math_verify.utils import timeout
+from math_verify.utils import CacheStats, LRUCache, timeout
+
+try:
+    import numpy as np
+except (
+    ImportError
+):  # numpy is optional, numeric probing then evaluates the points with mpmath
+    np = None
+
+if TYPE_CHECKING:
+    from math_verify.cache import VerifyCache
+    from math_verify.pool import WorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +104,73 @@ INVERSE_RELATIONS = {
     Eq: Eq,
 }
 
+# Default number of entries of each of the sympy caches below
+DEFAULT_SYMPY_CACHE_SIZE = 4096
+
+# Process wide memos of the expensive sympy calls of the comparisons, keyed by the (structurally hashed)
+# expressions. Failures are cached too, timeouts never.
+simplify_cache = LRUCache(DEFAULT_SYMPY_CACHE_SIZE)
+solve_cache = LRUCache(DEFAULT_SYMPY_CACHE_SIZE)
+evalf_cache = LRUCache(DEFAULT_SYMPY_CACHE_SIZE)
+as_set_cache = LRUCache(DEFAULT_SYMPY_CACHE_SIZE)
+
+
+def _sympy_caches() -> dict[str, LRUCache]:
+    return {
+        "simplify": simplify_cache,
+        "solve": solve_cache,
+        "evalf": evalf_cache,
+        "as_set": as_set_cache,
+    }
+
+
+def set_sympy_cache_size(maxsize: int) -> None:
+    """Sets the maximum number of entries of each sympy cache. 0 disables the caching."""
+    for cache in _sympy_caches().values():
+        cache.resize(maxsize)
+
+
+def get_sympy_cache_stats() -> dict[str, CacheStats]:
+    """Returns the hit/miss/eviction counters of the sympy caches (simplify, solve, evalf, as_set)."""
+    return {name: cache.stats() for name, cache in _sympy_caches().items()}
+
+
+def clear_sympy_caches() -> None:
+    """Removes all entries from the sympy caches and resets their counters."""
+    for cache in _sympy_caches().values():
+        cache.clear()
+
+
+def _memoized(cache: LRUCache, key: Hashable, compute: Callable[[], Any]) -> Any:
+    try:
+        hash(key)
+    except TypeError:
+        # Mutable matrices can't be memoized
+        return compute()
+    return cache.get_or_compute(key, compute)
+
+
+def simplify_cached(expr: Basic | MatrixBase) -> Basic | MatrixBase:
+    return _memoized(simplify_cache, expr, lambda: simplify(expr))
+
+
+def solve_cached(expr: Basic, symbols: set[Symbol]) -> list:
+    """Returns the ordered solutions of expr for symbols, a new list on every call."""
+    solutions = _memoized(
+        solve_cache,
+        (expr, frozenset(symbols)),
+        lambda: tuple(ordered(solve(expr, symbols))),
+    )
+    return list(solutions)
+
+
+def evalf_cached(expr: Basic, n: int = 15, chop: bool = False) -> Basic:
+    return _memoized(evalf_cache, (expr, n, chop), lambda: expr.evalf(n=n, chop=chop))
+
+
+def as_set_cached(expr: Basic) -> Set:
+    return _memoized(as_set_cache, expr, lambda: expr.as_set())
+
 
 def safe_sympy_doit(a: Basic | MatrixBase):
     """Safely execute doit() on a sympy expression, catching exceptions.
@@ -115,6 +213,111 @@ def is_atomic_or_pct_atomic(expr: Basic | MatrixBase, atomic_type: type) -> bool
     )
 
 
+def is_number_matrix(expr: Basic | MatrixBase) -> bool:
+    """Whether expr is an explicit matrix whose entries are all numbers."""
+    return isinstance(expr, MatrixBase) and all(
+        isinstance(entry, Number) for entry in expr.flat()
+    )
+
+
+# Numeric matrices with at least this many entries are compared with numpy arrays, below that a loop is faster
+MATRIX_VECTORIZE_MIN_ENTRIES = 64
+
+
+def _numbers_eq(
+    a_numbers: list[tuple[Fraction, bool]],
+    b_numbers: list[tuple[Fraction, bool]],
+    float_rounding: int,
+) -> bool:
+    # Exact for rationals, rounded to float_rounding places if a Float is involved, see rounded_numbers_eq
+    if np is None or len(a_numbers) < MATRIX_VECTORIZE_MIN_ENTRIES:
+        return all(
+            rounded_numbers_eq(a, a_is_float, b, b_is_float, float_rounding)
+            if a_is_float or b_is_float
+            else a == b
+            for (a, a_is_float), (b, b_is_float) in zip(
+                a_numbers, b_numbers, strict=True
+            )
+        )
+
+    a_numerators = int_array([a.numerator for a, _ in a_numbers])
+    a_denominators = int_array([a.denominator for a, _ in a_numbers])
+    b_numerators = int_array([b.numerator for b, _ in b_numbers])
+    b_denominators = int_array([b.denominator for b, _ in b_numbers])
+    a_is_float = np.array([a_is_float for _, a_is_float in a_numbers])
+    b_is_float = np.array([b_is_float for _, b_is_float in b_numbers])
+    rounded = a_is_float | b_is_float
+    exact = ~rounded
+    # Fractions are in lowest terms
+    if not (
+        (a_numerators[exact] == b_numerators[exact])
+        & (a_denominators[exact] == b_denominators[exact])
+    ).all():
+        return False
+    return bool(
+        rounded_numbers_eq_array(
+            a_numerators[rounded],
+            a_denominators[rounded],
+            a_is_float[rounded],
+            b_numerators[rounded],
+            b_denominators[rounded],
+            b_is_float[rounded],
+            float_rounding,
+        ).all()
+    )
+
+
+def sympy_numeric_matrix_eq(
+    a: MatrixBase, b: MatrixBase, float_rounding: int, numeric_precision: int
+) -> bool | None:
+    """Compares two matrices of the same shape without free symbols in one step instead of entry by entry.
+
+    The result is the same as comparing the entries with `sympy_numeric_eq`: pairs of numbers (or percentages)
+    are compared exactly, or after rounding to float_rounding decimal places if a Float is involved, which is
+    vectorized with numpy for large matrices. If no entry of a pair is a number, e.g. sqrt(2) and 2**(1/2),
+    the differences of all such pairs are evaluated at numeric_precision by a single evalf.
+
+    Args:
+        a: First matrix
+        b: Second matrix
+        float_rounding: Number of decimal places to round floats to
+        numeric_precision: Number of decimal places to evaluate the other entries with
+
+    Returns:
+        Whether the matrices are equal, None if they have free symbols or an entry pair mixes a number with
+        another expression, such matrices are compared entry by entry.
+    """
+    a_numbers, b_numbers, differences = [], [], []
+    for a_elem, b_elem in zip(a.flat(), b.flat(), strict=True):
+        a_number, b_number = number_value(a_elem), number_value(b_elem)
+        if a_number is not None and b_number is not None:
+            a_numbers.append(a_number)
+            b_numbers.append(b_number)
+        elif (
+            is_atomic_or_pct_atomic(a_elem, Number)
+            or is_atomic_or_pct_atomic(b_elem, Number)
+            or not isinstance(a_elem, Expr)
+            or not isinstance(b_elem, Expr)
+            or a_elem.free_symbols
+            or b_elem.free_symbols
+        ):
+            return None
+        else:
+            differences.append(a_elem - b_elem)
+
+    if not _numbers_eq(a_numbers, b_numbers, float_rounding):
+        return False
+    if not differences:
+        return True
+    try:
+        evaluated = evalf_cached(
+            ImmutableMatrix(differences), n=numeric_precision, chop=True
+        )
+    except Exception:
+        return False
+    return all(entry == 0 for entry in evaluated)
+
+
 def sympy_numeric_eq(
     a: Basic | MatrixBase,
     b: Basic | MatrixBase,
@@ -136,8 +339,10 @@ def sympy_numeric_eq(
     if isinstance(a, (MatrixBase, MatrixExpr)) and isinstance(
         b, (MatrixBase, MatrixExpr)
     ):
-        a = safe_sympy_doit(a)
-        b = safe_sympy_doit(b)
+        # doit does nothing on matrices of numbers and costs as much as their comparison
+        if not (is_number_matrix(a) and is_number_matrix(b)):
+            a = safe_sympy_doit(a)
+            b = safe_sympy_doit(b)
 
         # If we have matrices and one of them is only made of floats, we can use the same logic as above
         if (
@@ -145,6 +350,11 @@ def sympy_numeric_eq(
             and isinstance(b, (MatrixBase))
             and a.shape == b.shape
         ):
+            matrices_equal = sympy_numeric_matrix_eq(
+                a, b, float_rounding, numeric_precision
+            )
+            if matrices_equal is not None:
+                return matrices_equal
             return all(
                 sympy_numeric_eq(a_elem, b_elem, float_rounding, numeric_precision)
                 for a_elem, b_elem in zip(a.flat(), b.flat(), strict=False)
@@ -164,16 +374,439 @@ def sympy_numeric_eq(
 
     else:
         try:
-            return (a - b).evalf(chop=True, n=numeric_precision) == 0  # type: ignore
+            return evalf_cached(a - b, n=numeric_precision, chop=True) == 0  # type: ignore
         except Exception:
             pass
 
     return False
 
 
+NumericProbing = Literal["off", "reject", "probabilistic"]
+
+
+class GoldAnalysis:
+    """Memo of the work `sympy_expr_eq` does on the gold side of a comparison.
+
+    When a gold is compared with many predictions, its analysis (assignment truncation, `as_set`, `solve`,
+    sorted set elements, free symbols, values at the probing points, ...) is the same every time. Entries are
+    keyed by the kind of work and the gold-derived expression it's done on, so one analysis also serves the
+    nested comparisons of set elements, relation sides, etc. Failures are memoized too.
+
+    Args:
+        maxsize (int, optional): Maximum number of memoized results. Defaults to 1024.
+    """
+
+    __slots__ = ("_memo",)
+
+    def __init__(self, maxsize: int = 1024):
+        self._memo = LRUCache(maxsize)
+
+    def get(self, kind: Hashable, expr: Any, compute: Callable[[], Any]) -> Any:
+        """Returns the result of compute, the work of the given kind on expr, computing it only once."""
+        try:
+            key = (kind, expr)
+            hash(key)
+        except TypeError:
+            # Mutable matrices and lists can't be memoized
+            return compute()
+        return self._memo.get_or_compute(key, compute)
+
+    def stats(self) -> CacheStats:
+        return self._memo.stats()
+
+
+def _gold_memo(
+    gold_analysis: GoldAnalysis | None,
+    kind: Hashable,
+    expr: Any,
+    compute: Callable[[], Any],
+) -> Any:
+    if gold_analysis is None:
+        return compute()
+    return gold_analysis.get(kind, expr, compute)
+
+
+# Number of random points expressions are evaluated at, and the seed they are drawn with
+PROBE_POINTS = 8
+PROBE_SEED = 0
+# Values are drawn with a random sign and a magnitude in this range, avoiding 0 where many expressions are undefined
+PROBE_MAGNITUDE_RANGE = (0.25, 2.5)
+# Relative difference above which two values disagree and below which they agree, in between is undecided
+PROBE_REJECT_TOLERANCE = 1e-6
+PROBE_ACCEPT_TOLERANCE = 1e-10
+# Precision used to evaluate (or with numpy, to confirm disagreement) with mpmath, so that cancellation doesn't fake a disagreement
+PROBE_DPS = 50
+
+
+def _probe_points(n_symbols: int) -> list[list[float]]:
+    rng = random.Random(PROBE_SEED)
+    low, high = PROBE_MAGNITUDE_RANGE
+    return [
+        [rng.choice((-1, 1)) * rng.uniform(low, high) for _ in range(n_symbols)]
+        for _ in range(PROBE_POINTS)
+    ]
+
+
+def _mpmath_values(
+    expr: Expr, symbols: list[Symbol], points: list[list[float]]
+) -> list:
+    with mpmath.workdps(PROBE_DPS):
+        func = lambdify(symbols, expr, modules="mpmath")
+        values = []
+        for point in points:
+            try:
+                values.append(mpmath.mpmathify(func(*[mpmath.mpf(v) for v in point])))
+            except (ArithmeticError, ValueError, TypeError):
+                values.append(mpmath.nan)
+        return values
+
+
+def _numpy_values(expr: Expr, symbols: list[Symbol], points: list[list[float]]):
+    columns = np.array(points, dtype=complex).T.reshape(len(symbols), len(points))
+    with np.errstate(all="ignore"):
+        return np.broadcast_to(
+            np.asarray(
+                lambdify(symbols, expr, modules="numpy")(*columns), dtype=complex
+            ),
+            (len(points),),
+        )
+
+
+def _values_agreement(a, b, tolerance: float) -> bool:
+    return abs(a - b) <= tolerance * max(1, abs(a), abs(b))
+
+
+def _probe_with_mpmath(
+    a: Expr,
+    b: Expr,
+    symbols: list[Symbol],
+    points: list[list[float]],
+    gold_analysis: "GoldAnalysis | None" = None,
+) -> bool | None:
+    values_a = _gold_memo(
+        gold_analysis,
+        ("probe_mpmath", tuple(symbols)),
+        a,
+        lambda: _mpmath_values(a, symbols, points),
+    )
+    values = [
+        (value_a, value_b)
+        for value_a, value_b in zip(
+            values_a, _mpmath_values(b, symbols, points), strict=True
+        )
+        if mpmath.isfinite(value_a) and mpmath.isfinite(value_b)
+    ]
+    if len(values) < PROBE_POINTS // 2:
+        return None
+    with mpmath.workdps(PROBE_DPS):
+        if any(
+            not _values_agreement(va, vb, PROBE_REJECT_TOLERANCE) for va, vb in values
+        ):
+            return False
+        if all(_values_agreement(va, vb, PROBE_ACCEPT_TOLERANCE) for va, vb in values):
+            return True
+    return None
+
+
+def _probe_with_numpy(
+    a: Expr,
+    b: Expr,
+    symbols: list[Symbol],
+    points: list[list[float]],
+    gold_analysis: "GoldAnalysis | None" = None,
+) -> bool | None:
+    values_a = _gold_memo(
+        gold_analysis,
+        ("probe_numpy", tuple(symbols)),
+        a,
+        lambda: _numpy_values(a, symbols, points),
+    )
+    values_b = _numpy_values(b, symbols, points)
+    with np.errstate(all="ignore"):
+        valid = np.isfinite(values_a) & np.isfinite(values_b)
+        if valid.sum() < PROBE_POINTS // 2:
+            return None
+        diff = np.abs(values_a - values_b)
+        scale = np.maximum(1, np.maximum(np.abs(values_a), np.abs(values_b)))
+
+    disagree = valid & (diff > PROBE_REJECT_TOLERANCE * scale)
+    if disagree.any():
+        # Double precision can lose everything to cancellation, only reject if high precision confirms
+        confirm = [points[i] for i in np.flatnonzero(disagree)]
+        return _probe_with_mpmath(a, b, symbols, confirm + points)
+    if (diff[valid] <= PROBE_ACCEPT_TOLERANCE * scale[valid]).all():
+        return True
+    return None
+
+
+def sympy_numeric_probe(
+    a: Basic | MatrixBase,
+    b: Basic | MatrixBase,
+    gold_analysis: "GoldAnalysis | None" = None,
+) -> bool | None:
+    """Compare two sympy expressions by evaluating them at random points of their free symbols.
+
+    Both expressions are lambdified with the same symbols and evaluated at PROBE_POINTS points (a single
+    batch with numpy if it's installed, otherwise with mpmath). Evaluation is done in complex arithmetic,
+    points where either expression isn't finite are ignored.
+
+    Args:
+        a: First sympy expression
+        b: Second sympy expression
+        gold_analysis: If given, the values of a are memoized in it, see `GoldAnalysis`
+
+    Returns:
+        False if the values clearly differ at some point, True if they agree at all points and None if
+        the probe can't decide (e.g. the expressions can't be evaluated numerically).
+    """
+    if not isinstance(a, Expr) or not isinstance(b, Expr):
+        return None
+    try:
+        symbols = sorted(
+            _gold_memo(gold_analysis, "free_symbols", a, lambda: a.free_symbols)
+            | b.free_symbols,
+            key=default_sort_key,
+        )
+        points = _probe_points(len(symbols))
+        if np is not None:
+            try:
+                return _probe_with_numpy(a, b, symbols, points, gold_analysis)
+            except TypeError:
+                # Some functions, e.g. floor, have no complex numpy implementation
+                pass
+        return _probe_with_mpmath(a, b, symbols, points, gold_analysis)
+    except Exception:
+        return None
+
+
+# The comparison of two expressions is a ladder of strategies ordered by cost (see `sympy_expr_eq`). The cheap
+# ones always run, the expensive tiers below are skipped when too little time is left until the deadline of the
+# comparison. When the comparison shares the time budget of `verify` with other pairs, each expensive tier only
+# gets its share of the time left, so that a slow tier can't starve the tiers and comparisons after it, otherwise
+# it can use all of it. solve is the last tier of relational comparisons, it always gets all the time left.
+LADDER_TIER_BUDGETS = {"as_set": 0.25, "solve": 1.0, "simplify": 0.5}
+# Expensive tiers are skipped when less than this many seconds are left before the deadline
+LADDER_MIN_SECONDS = 0.05
+
+# Whether a tier was skipped or ran out of budget during the current comparison, and whether the tiers only get
+# their share of the time left
+_ladder_state = threading.local()
+
+
+def _ladder_tier(
+    name: str,
+    deadline: float | None,
+    compute: Callable[[], Any],
+    default: Any = False,
+) -> Any:
+    """Runs an expensive tier of the comparison ladder within its budget.
+
+    Args:
+        name: Name of the tier, see LADDER_TIER_BUDGETS, which only apply within `_compare_in_ladder(split_tiers=True)`
+        deadline: time.monotonic() deadline of the comparison, None runs the tier without a budget
+        compute: The tier
+        default: Value returned when the tier is skipped or runs out of budget
+
+    Returns:
+        The result of compute, or default
+    """
+    if deadline is None:
+        return compute()
+    remaining = deadline - time.monotonic()
+    if remaining < LADDER_MIN_SECONDS:
+        logger.debug(f"Skipping {name}, {remaining:.3f}s left before the deadline")
+        _ladder_state.degraded = True
+        return default
+    # Only the signal based timeouts can be nested
+    if os.name != "posix":
+        return compute()
+    if getattr(_ladder_state, "split_tiers", False):
+        remaining *= LADDER_TIER_BUDGETS[name]
+    try:
+        return timeout(remaining)(compute)()
+    except TimeoutException:
+        # The deadline of the whole comparison is not ours to handle
+        if time.monotonic() >= deadline:
+            raise
+        logger.debug(f"{name} exceeded its budget, skipping it")
+        _ladder_state.degraded = True
+        return default
+
+
+# Why an expression is too complex for the expensive comparisons, see `expression_complexity`
+ComplexityReason = Literal["ops", "depth", "integer_bits", "exponent"]
+COMPLEXITY_REASONS = ("ops", "depth", "integer_bits", "exponent")
+
+
+@dataclass(frozen=True)
+class ComplexityLimits:
+    """Limits above which an expression is too complex for the expensive comparisons.
+
+    Degenerate outputs (hundreds of terms, deep nesting, huge integers or exponents) make `simplify`, `solve` and
+    `evalf` burn the whole timeout. Pairs with an expression above the limits skip them, see `expression_complexity`.
+
+    Attributes:
+        max_ops (int): Maximum number of operations, i.e. non-atomic nodes of the expression tree
+        max_depth (int): Maximum depth of the expression tree
+        max_integer_bits (int): Maximum bit length of integers, numerators and denominators
+        max_exponent (int): Maximum absolute value of numeric exponents
+        oversized (Literal["cheap", "reject"]): What to do with a pair with an expression above the limits
+            - "cheap": It matches if the expressions are structurally equal or, with numeric_probing="probabilistic",
+              agree at all the numeric probing points
+            - "reject": It doesn't match
+    """
+
+    max_ops: int = 1000
+    max_depth: int = 100
+    max_integer_bits: int = 10_000
+    max_exponent: int = 10_000
+    oversized: Literal["cheap", "reject"] = "cheap"
+
+
+DEFAULT_COMPLEXITY_LIMITS = ComplexityLimits()
+
+_oversized_stats: Counter[str] = Counter()
+_oversized_stats_lock = threading.Lock()
+
+
+def get_oversized_stats() -> dict[str, int]:
+    """Returns how many comparisons of this process were routed away from the expensive tiers, by reason."""
+    with _oversized_stats_lock:
+        return {reason: _oversized_stats[reason] for reason in COMPLEXITY_REASONS}
+
+
+def reset_oversized_stats() -> None:
+    """Resets the counters of `get_oversized_stats`."""
+    with _oversized_stats_lock:
+        _oversized_stats.clear()
+
+
+def expression_complexity(
+    expr: Basic | MatrixBase, limits: ComplexityLimits = DEFAULT_COMPLEXITY_LIMITS
+) -> ComplexityReason | None:
+    """Checks whether an expression is within the complexity limits.
+
+    The expression tree is walked once and the walk stops at the first exceeded limit, so unlike `count_ops`,
+    an enormous expression costs at most max_ops nodes.
+
+    Args:
+        expr: The expression
+        limits: The limits
+
+    Returns:
+        The first exceeded limit, None if the expression is within all of them
+    """
+    if isinstance(expr, MatrixBase) and not isinstance(expr, Basic):
+        # Mutable matrices aren't expression trees, their elements are
+        stack = [(element, 2) for element in expr]
+    else:
+        stack = [(expr, 1)]
+    ops = 0
+    while stack:
+        node, depth = stack.pop()
+        if not isinstance(node, Basic):
+            continue
+        if depth > limits.max_depth:
+            return "depth"
+        if node.is_Rational and (
+            int(node.p).bit_length() > limits.max_integer_bits
+            or int(node.q).bit_length() > limits.max_integer_bits
+        ):
+            return "integer_bits"
+        if (
+            node.is_Pow and node.exp.is_Number and abs(node.exp) > limits.max_exponent  # type: ignore
+        ):
+            return "exponent"
+        if node.args:
+            ops += 1
+            if ops > limits.max_ops:
+                return "ops"
+            stack.extend((arg, depth + 1) for arg in node.args)
+    return None
+
+
+def _compare_oversized(
+    gold: Basic | MatrixBase,
+    pred: Basic | MatrixBase,
+    reason: ComplexityReason,
+    limits: ComplexityLimits,
+    numeric_probing: NumericProbing,
+    gold_analysis: "GoldAnalysis | None",
+) -> bool:
+    """Compares a pair with an expression above the complexity limits without the expensive tiers.
+
+    Agreement at the numeric probing points is only enough with numeric_probing="probabilistic", like in
+    `sympy_expr_eq`, otherwise the expressions must be structurally equal.
+    """
+    logger.debug(f"Expression above the complexity limits ({reason})")
+    with _oversized_stats_lock:
+        _oversized_stats[reason] += 1
+    if limits.oversized == "reject":
+        return False
+    try:
+        if gold == pred:
+            return True
+    except Exception:
+        pass
+    if numeric_probing != "probabilistic":
+        return False
+    return sympy_numeric_probe(gold, pred, gold_analysis) is True
+
+
+def is_rational_function_over_qq(expr: Basic) -> bool:
+    """Check if expr is a rational function of its symbols with rational coefficients.
+
+    Floats, constants like pi or I, functions and non-integer powers make the expression transcendental (or
+    algebraic) for our purposes, those are left to simplify.
+    """
+    for node in preorder_traversal(expr):
+        if isinstance(node, Symbol):
+            continue
+        if isinstance(node, Rational):
+            continue
+        if isinstance(node, (Add, Mul)):
+            continue
+        if isinstance(node, Pow) and isinstance(node.exp, Integer):
+            continue
+        return False
+    return True
+
+
+def rational_function_eq(a: Basic | MatrixBase, b: Basic | MatrixBase) -> bool | None:
+    """Compare two polynomials or rational functions through their normal form over QQ.
+
+    Both expressions are converted to elements of the field of rational functions QQ(symbols), whose
+    arithmetic keeps fractions reduced over a common denominator, so equal rational functions have the same
+    numerator and denominator. This decides the pair exactly and is much cheaper than `simplify`, which
+    frequently times out on larger polynomials.
+
+    Args:
+        a: First sympy expression
+        b: Second sympy expression
+
+    Returns:
+        Whether the expressions are equal, None if either of them isn't a rational function over QQ
+    """
+    if not isinstance(a, Expr) or not isinstance(b, Expr):
+        return None
+    if not is_rational_function_over_qq(a) or not is_rational_function_over_qq(b):
+        return None
+    try:
+        symbols = sorted(a.free_symbols | b.free_symbols, key=default_sort_key)
+        if not symbols:
+            return QQ.from_sympy(a) == QQ.from_sympy(b)
+        field = QQ.frac_field(*symbols)
+        return field.from_sympy(a) == field.from_sympy(b)
+    except Exception:
+        return None
+
+
 def sympy_symbolic_eq(a: Basic | MatrixBase, b: Basic | MatrixBase) -> bool:
     """Compare two sympy expressions symbolically.
 
+    Polynomials and rational functions are decided by their normal form over QQ (see `rational_function_eq`),
+    the rest by simplifying their difference.
+
     Args:
         a: First sympy expression
         b: Second sympy expression
@@ -181,8 +814,11 @@ def sympy_symbolic_eq(a: Basic | MatrixBase, b: Basic | MatrixBase) -> bool:
     Returns:
         True if expressions are symbolically equal, False otherwise
     """
+    rational_eq = rational_function_eq(a, b)
+    if rational_eq is not None:
+        return rational_eq
     try:
-        a_b_diff = simplify((a - b))  # type: ignore
+        a_b_diff = simplify_cached(a - b)  # type: ignore
         if isinstance(a_b_diff, MatrixBase) and a_b_diff.is_zero_matrix:
             return True
         elif isinstance(a_b_diff, Basic) and a_b_diff.is_zero:
@@ -193,14 +829,112 @@ def sympy_symbolic_eq(a: Basic | MatrixBase, b: Basic | MatrixBase) -> bool:
     return False
 
 
+# Set elements whose numeric values differ by less than 10**-float_rounding plus this fraction of their magnitude are
+# candidates for a match, the relative part absorbs the evalf noise of large values
+SET_MATCH_RELATIVE_TOLERANCE = 1e-9
+
+
+def _unwrap_assignment(expr: Basic) -> Basic:
+    if is_assignment_relation(expr):
+        return take_last_relation(expr).rhs
+    return expr
+
+
+def set_element_key(expr: Basic) -> complex | None:
+    """Returns the numeric value of a set element (the right hand side for assignments), None if it has none."""
+    try:
+        value = evalf_cached(_unwrap_assignment(expr))
+        if not value.is_number or not value.is_finite:
+            return None
+        return complex(value)
+    except Exception:
+        return None
+
+
+def _set_match_candidates(
+    gold_keys: list[complex | None],
+    pred_keys: list[complex | None],
+    float_rounding: int,
+) -> list[list[int]]:
+    """For each gold element, the pred elements it can be equal to, the numerically closest first.
+
+    Elements without a numeric key are candidates for all elements of the other side.
+    """
+    numeric_preds = sorted(
+        (key.real, j) for j, key in enumerate(pred_keys) if key is not None
+    )
+    reals = [real for real, _ in numeric_preds]
+    other_preds = [j for j, key in enumerate(pred_keys) if key is None]
+    candidates = []
+    for key in gold_keys:
+        if key is None:
+            candidates.append(list(range(len(pred_keys))))
+            continue
+        tolerance = 10**-float_rounding + SET_MATCH_RELATIVE_TOLERANCE * abs(key)
+        window = numeric_preds[
+            bisect_left(reals, key.real - tolerance) : bisect_right(
+                reals, key.real + tolerance
+            )
+        ]
+        near = sorted(
+            (
+                j
+                for _, j in window
+                if abs(pred_keys[j].imag - key.imag) <= tolerance  # type: ignore[union-attr]
+            ),
+            key=lambda j: abs(pred_keys[j] - key),  # type: ignore[operator]
+        )
+        candidates.append(near + other_preds)
+    return candidates
+
+
+def _match_sets(
+    candidates: list[list[int]], n_preds: int, equal: Callable[[int, int], bool]
+) -> bool:
+    """Whether every gold element can be matched with a distinct equal pred element (bipartite matching).
+
+    equal(i, j) is only called for candidate pairs, at most once each. Matches are extended by augmenting
+    paths, which only reach beyond the first candidate when several elements are tied.
+    """
+    if any(not gold_candidates for gold_candidates in candidates):
+        return False
+    results: dict[tuple[int, int], bool] = {}
+    matched_gold = [-1] * n_preds
+
+    def is_equal(i: int, j: int) -> bool:
+        if (i, j) not in results:
+            results[(i, j)] = equal(i, j)
+        return results[(i, j)]
+
+    def augment(i: int, visited: set[int]) -> bool:
+        for j in candidates[i]:
+            if j in visited or not is_equal(i, j):
+                continue
+            visited.add(j)
+            if matched_gold[j] == -1 or augment(matched_gold[j], visited):
+                matched_gold[j] = i
+                return True
+        return False
+
+    return all(augment(i, set()) for i in range(len(candidates)))
+
+
 def sympy_deep_compare_set_and_tuple(
     gold: SympyFiniteSet | Tuple,
     pred: SympyFiniteSet | Tuple,
     float_rounding: int,
     numeric_precision: int,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Compare two finite sets by comparing each element with given precision.
 
+    Tuples are compared element by element. When either side is a set, the elements are matched regardless
+    of their order: the numeric value of every element is computed once (`set_element_key`), each gold element
+    is compared only with the pred elements of close value (and those without a numeric value), and ties are
+    resolved by bipartite matching. Pairs of numbers are compared with `numeric_literal_eq` before `sympy_expr_eq`.
+
     Args:
         a: First finite set
         b: Second finite set
@@ -208,50 +942,60 @@ def sympy_deep_compare_set_and_tuple(
 
     Returns:
         True if sets contain equal elements within precision, False otherwise
-
-    Note: in order to fully support finite sets, we should ideally do kartesian product comparison
-    but this is not implemented yet. We kinda hope sympy will order the elements.
     """
 
-    def unwrap_eq(s):
-        if is_assignment_relation(s):
-            return take_last_relation(s).rhs
-        return s
+    def elements_eq(a: Basic, b: Basic) -> bool:
+        numbers_equal = numeric_literal_eq(a, b, float_rounding)
+        if numbers_equal is not None:
+            return numbers_equal
+        return sympy_expr_eq(
+            a,
+            b,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
 
-    def sort_key(x):
-        try:
-            return default_sort_key(unwrap_eq(x).evalf())
-        except Exception:
-            return default_sort_key(unwrap_eq(x))
-
-    # This ensures it works for {1/3} and {0.333333}
-    if len(gold) == len(pred):
-        if isinstance(gold, SympyFiniteSet):
-            gold_args = list(ordered(gold.args, keys=sort_key, default=False))
-            pred_args = list(ordered(pred.args, keys=sort_key, default=False))
-
-        elif isinstance(gold, Tuple) and isinstance(pred, FiniteSet):
-            # We treat the pred as tuple too
-            pred_args = pred._unsorted_args
-            gold_args = gold.args
-
-        elif isinstance(pred, SympyFiniteSet):
-            pred_args = list(ordered(pred.args, keys=sort_key, default=False))
-            gold_args = gold.args
-        else:
-            gold_args = gold.args
-            pred_args = pred.args
+    if len(gold) != len(pred):
+        return False
 
-        return all(
-            sympy_expr_eq(a, b, float_rounding, numeric_precision)
-            for a, b in zip(gold_args, pred_args, strict=False)
+    if isinstance(gold, Tuple) and isinstance(pred, FiniteSet):
+        # We treat the pred as tuple too
+        pred_args = pred._unsorted_args
+        gold_args = gold.args
+    elif isinstance(gold, SympyFiniteSet) or isinstance(pred, SympyFiniteSet):
+        # This ensures it works for {1/3} and {0.333333}
+        gold_args = gold.args
+        pred_args = pred.args
+        gold_keys = _gold_memo(
+            gold_analysis,
+            "set_element_keys",
+            gold,
+            lambda: [set_element_key(arg) for arg in gold_args],
+        )
+        pred_keys = [set_element_key(arg) for arg in pred_args]
+        return _match_sets(
+            _set_match_candidates(gold_keys, pred_keys, float_rounding),
+            len(pred_args),
+            lambda i, j: elements_eq(gold_args[i], pred_args[j]),
         )
+    else:
+        gold_args = gold.args
+        pred_args = pred.args
 
-    return False
+    return all(elements_eq(a, b) for a, b in zip(gold_args, pred_args, strict=False))
 
 
 def sympy_compare_interval(
-    a: Interval, b: Interval, float_rounding: int, numeric_precision: int
+    a: Interval,
+    b: Interval,
+    float_rounding: int,
+    numeric_precision: int,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Compare two intervals.
 
@@ -266,22 +1010,57 @@ def sympy_compare_interval(
     return (
         a.left_open == b.left_open
         and a.right_open == b.right_open
-        and sympy_expr_eq(a.start, b.start, float_rounding, numeric_precision)
-        and sympy_expr_eq(a.end, b.end, float_rounding, numeric_precision)
+        and sympy_expr_eq(
+            a.start,
+            b.start,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
+        and sympy_expr_eq(
+            a.end,
+            b.end,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
     )
 
 
 def sympy_solve_and_compare(
-    gold: Relational, pred: Relational, float_rounding: int, numeric_precision: int
+    gold: Relational,
+    pred: Relational,
+    float_rounding: int,
+    numeric_precision: int,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
 ) -> bool:
-    solved_gold = list(ordered(solve(gold, gold.free_symbols)))
-    solved_pred = list(ordered(solve(pred, pred.free_symbols)))
+    solved_gold = _gold_memo(
+        gold_analysis,
+        "solve",
+        gold,
+        lambda: solve_cached(gold, gold.free_symbols),
+    )
+    solved_pred = solve_cached(pred, pred.free_symbols)
     # Equalities should return list of dicts of solutions
     if isinstance(gold, Eq) and isinstance(pred, Eq):
         return all(
             all(
                 g_k == p_k
-                and sympy_expr_eq(g_v, p_v, float_rounding, numeric_precision)
+                and sympy_expr_eq(
+                    g_v,
+                    p_v,
+                    float_rounding,
+                    numeric_precision,
+                    numeric_probing=numeric_probing,
+                    gold_analysis=gold_analysis,
+                    deadline=deadline,
+                )
                 for (g_k, g_v), (p_k, p_v) in zip(
                     sorted(g.items()), sorted(p.items()), strict=False
                 )
@@ -290,7 +1069,13 @@ def sympy_solve_and_compare(
         )
     else:
         return sympy_expr_eq(
-            solved_gold, solved_pred, float_rounding, numeric_precision
+            solved_gold,
+            solved_pred,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
         )
 
 
@@ -299,6 +1084,9 @@ def sympy_compare_relational(
     pred: Relational | And,
     float_rounding: int,
     numeric_precision: int,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Compare two relational expressions.
 
@@ -313,7 +1101,15 @@ def sympy_compare_relational(
 
     if isinstance(gold, And) and isinstance(pred, And):
         return all(
-            sympy_compare_relational(g, p, float_rounding, numeric_precision)
+            sympy_compare_relational(
+                g,
+                p,
+                float_rounding,
+                numeric_precision,
+                numeric_probing=numeric_probing,
+                gold_analysis=gold_analysis,
+                deadline=deadline,
+            )
             for g, p in zip(gold._unsorted_args, pred._unsorted_args, strict=False)
         )
 
@@ -324,7 +1120,13 @@ def sympy_compare_relational(
     def are_flipped_inequalities_equal(a: Relational, b: Relational) -> bool:
         try:
             return sympy_expr_eq(
-                a.lhs - a.rhs, b.rhs - b.lhs, float_rounding, numeric_precision
+                a.lhs - a.rhs,
+                b.rhs - b.lhs,
+                float_rounding,
+                numeric_precision,
+                numeric_probing=numeric_probing,
+                gold_analysis=gold_analysis,
+                deadline=deadline,
             )  # type: ignore
         except Exception:
             pass
@@ -334,7 +1136,13 @@ def sympy_compare_relational(
 
     try:
         if type(gold) is type(pred) and sympy_expr_eq(
-            gold.lhs - gold.rhs, pred.lhs - pred.rhs, float_rounding, numeric_precision
+            gold.lhs - gold.rhs,
+            pred.lhs - pred.rhs,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
         ):  # type: ignore
             return True
     except Exception:
@@ -346,7 +1154,19 @@ def sympy_compare_relational(
     ):
         return True
 
-    if sympy_solve_and_compare(gold, pred, float_rounding, numeric_precision):
+    if _ladder_tier(
+        "solve",
+        deadline,
+        lambda: sympy_solve_and_compare(
+            gold,
+            pred,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        ),
+    ):
         return True
 
     return False
@@ -377,6 +1197,9 @@ def sympy_compare_sets(
     pred: Set | Basic | MatrixBase | Tuple,
     float_rounding: int,
     numeric_precision: int,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Compare two sympy sets for equality using multiple methods.
 
@@ -394,7 +1217,15 @@ def sympy_compare_sets(
 
     # If both are intervals, use interval comparison
     if isinstance(a_set, Interval) and isinstance(b_set, Interval):
-        return sympy_compare_interval(a_set, b_set, float_rounding, numeric_precision)
+        return sympy_compare_interval(
+            a_set,
+            b_set,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
 
     # Try direct set equality
     if a_set == b_set:
@@ -416,7 +1247,13 @@ def sympy_compare_sets(
         b_set, (SympyFiniteSet, Tuple)
     ):
         return sympy_deep_compare_set_and_tuple(
-            a_set, b_set, float_rounding, numeric_precision
+            a_set,
+            b_set,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
         )
 
     # Because (1,2) is parsed as Interval(1,2,left_open=True,right_open=True), it could have that the
@@ -424,13 +1261,25 @@ def sympy_compare_sets(
     if isinstance(a_set, Interval) and isinstance(b_set, (SympyFiniteSet, Tuple)):
         if a_set.is_open and len(b_set) == 2:
             return sympy_deep_compare_set_and_tuple(
-                Tuple(a_set.start, a_set.end), b_set, float_rounding, numeric_precision
+                Tuple(a_set.start, a_set.end),
+                b_set,
+                float_rounding,
+                numeric_precision,
+                numeric_probing=numeric_probing,
+                gold_analysis=gold_analysis,
+                deadline=deadline,
             )
 
     if isinstance(b_set, Interval) and isinstance(a_set, (SympyFiniteSet, Tuple)):
         if b_set.is_open and len(a_set) == 2:
             return sympy_deep_compare_set_and_tuple(
-                a_set, Tuple(b_set.start, b_set.end), float_rounding, numeric_precision
+                a_set,
+                Tuple(b_set.start, b_set.end),
+                float_rounding,
+                numeric_precision,
+                numeric_probing=numeric_probing,
+                gold_analysis=gold_analysis,
+                deadline=deadline,
             )
 
     return False
@@ -600,6 +1449,9 @@ def sympy_expr_eq(
     float_rounding: int,
     numeric_precision: int,
     strict: bool = True,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
 ) -> bool:
     """Compare two sympy expressions for equality using multiple methods.
 
@@ -608,15 +1460,26 @@ def sympy_expr_eq(
         pred: Second sympy expression (predicted)
         precision: Number of decimal places to compare
         strict: If true, variables do matter otherwise they don't
+        numeric_probing: How to use `sympy_numeric_probe` before simplification, see `verify`
+        gold_analysis: Memo of the gold side work, reused across predictions, see `GoldAnalysis`
+        deadline: time.monotonic() deadline of the comparison. The expensive tiers (`as_set`, `solve`, `simplify`)
+            are skipped close to the deadline, and get a share of the time left if the comparison shares its budget
+            with others (see LADDER_TIER_BUDGETS). Defaults to None, which runs all the tiers.
 
     Returns:
         True if expressions are equal by any comparison method, False otherwise
+
+    The strategies are tried from the cheapest: structural equality, then by type relational comparison
+    (same and flipped sides, then `solve`), set comparison (element-wise) or numeric evaluation, numeric probing
+    and finally `simplify`.
     """
 
     # This ensures that f(x) == f(y) is true
     if not strict:
         try:
-            gold_variables = gold.free_symbols
+            gold_variables = _gold_memo(
+                gold_analysis, "free_symbols", gold, lambda: gold.free_symbols
+            )
             pred_variables = pred.free_symbols
             if len(gold_variables) == len(pred_variables):
                 pred = pred.subs(
@@ -630,16 +1493,27 @@ def sympy_expr_eq(
 
     # We always want to truncate if it's assignment, assignment
 
-    is_gold_assignment = is_assignment_relation(gold)
+    is_gold_assignment = _gold_memo(
+        gold_analysis, "is_assignment", gold, lambda: is_assignment_relation(gold)
+    )
     is_pred_assignment = is_assignment_relation(pred)
-    is_gold_equation = is_equation(gold)
+    is_gold_equation = _gold_memo(
+        gold_analysis, "is_equation", gold, lambda: is_equation(gold)
+    )
     is_pred_equation = is_equation(pred)
 
     # Truncate equations chains in case of assignment, this doesn't change any of the above values,
     # so no need to recompute them
     if is_gold_assignment:
-        gold = Eq(
-            take_first_relation(gold).lhs, take_last_relation(gold).rhs, evaluate=False
+        gold = _gold_memo(
+            gold_analysis,
+            "truncate_assignment",
+            gold,
+            lambda: Eq(
+                take_first_relation(gold).lhs,
+                take_last_relation(gold).rhs,
+                evaluate=False,
+            ),
         )
     if is_pred_assignment:
         pred = Eq(
@@ -654,13 +1528,25 @@ def sympy_expr_eq(
 
     # We respect what the pred format is only if the gold is assignment so that x=1 and 1 -> 1,1, but not 2x + z = 1 and 1 -> 1,1
     elif is_gold_assignment and not is_pred_equation:
-        gold = take_last_relation(gold).rhs
+        gold = _gold_memo(
+            gold_analysis, "last_rhs", gold, lambda: take_last_relation(gold).rhs
+        )
 
     if is_relation(gold) and isinstance(pred, Set):
         # This is to ensure that 1 < x < 2 equals (-oo, 1) U (2, oo)
         # We also unwrap the functions because othewise it creates some conditional set based on the function name
         try:
-            gold = unwrap_fcs(gold).as_set()
+            gold = _ladder_tier(
+                "as_set",
+                deadline,
+                lambda: _gold_memo(
+                    gold_analysis,
+                    "as_set",
+                    gold,
+                    lambda: as_set_cached(unwrap_fcs(gold)),
+                ),
+                default=gold,
+            )
         except Exception:
             pass
 
@@ -671,10 +1557,26 @@ def sympy_expr_eq(
 
     # Support for equations
     if is_relation(gold) and is_relation(pred):
-        return sympy_compare_relational(gold, pred, float_rounding, numeric_precision)
+        return sympy_compare_relational(
+            gold,
+            pred,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
 
     elif isinstance(gold, (Set, Tuple)) or isinstance(pred, (Set, Tuple)):
-        return sympy_compare_sets(gold, pred, float_rounding, numeric_precision)
+        return sympy_compare_sets(
+            gold,
+            pred,
+            float_rounding,
+            numeric_precision,
+            numeric_probing=numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
 
     # Handles $\text{answer}$ == $answer$, one is symbol, is multiplication of symbols (a*n*s*w*e*r)
     elif isinstance(gold, Symbol) or isinstance(pred, Symbol):
@@ -686,8 +1588,15 @@ def sympy_expr_eq(
         # Mostly so that 0.333333 = 1/3
         if sympy_numeric_eq(gold, pred, float_rounding, numeric_precision):
             return True
+        # Evaluating at random points is much faster than simplify and decides most of the comparisons
+        if numeric_probing != "off":
+            probed = sympy_numeric_probe(gold, pred, gold_analysis)
+            if probed is False:
+                return False
+            if probed is True and numeric_probing == "probabilistic":
+                return True
         # Then try symbolic equality
-        if sympy_symbolic_eq(gold, pred):
+        if _ladder_tier("simplify", deadline, lambda: sympy_symbolic_eq(gold, pred)):
             return True
 
     return False
@@ -728,13 +1637,372 @@ def should_treat_as_complex(latex_str: str) -> bool:
     return bool(complex_number_pattern.search(latex_str))
 
 
+# Rewrites which don't change how the latex renders, applied in order by canonical_latex_string
+_canonical_latex_rewrites = [
+    # Spacing commands
+    (re.compile(r"(?<!\\)\\[,;:! ]|\\q?quad(?![a-zA-Z])"), ""),
+    (re.compile(r"\\(?:displaystyle|textstyle)(?![a-zA-Z])"), ""),
+    # Sizing of delimiters, \left. and \right. are invisible
+    (re.compile(r"\\(?:left|right)(?:\.|(?![a-zA-Z]))"), ""),
+    (re.compile(r"\\[dt]frac(?![a-zA-Z])"), r"\\frac"),
+    (re.compile(r"\\geq(?![a-zA-Z])"), r"\\ge"),
+    (re.compile(r"\\leq(?![a-zA-Z])"), r"\\le"),
+    (re.compile(r"\\neq(?![a-zA-Z])"), r"\\ne"),
+    # Whitespace last, the rewrites above rely on it to end the command names. A space ending a command
+    # name before a letter is kept, as `\\ge x` and `\\gex` differ
+    (
+        re.compile(r"(\\[a-zA-Z]+)?\s+(?=([a-zA-Z])?)"),
+        lambda m: (m.group(1) or "") + (" " if m.group(1) and m.group(2) else ""),
+    ),
+]
+
+
+def canonical_latex_string(latex: str) -> str:
+    """Rewrites latex to a canonical form, so that strings which only differ in presentation compare equal.
+
+    Whitespace and spacing commands are removed, `\\left`/`\\right` are dropped, `\\dfrac`/`\\tfrac` become `\\frac`
+    and `\\geq`/`\\leq`/`\\neq` become `\\ge`/`\\le`/`\\ne`.
+
+    Args:
+        latex (str): The latex string, usually as normalized by `math_verify.parse`.
+
+    Returns:
+        str: The canonical form of latex.
+    """
+    for regex, replacement in _canonical_latex_rewrites:
+        latex = regex.sub(replacement, latex)
+    return latex
+
+
+# Tiers of verify which can decide a result, see get_verify_stats
+VERIFY_TIERS = ("string", "numeric", "sympy", "rejected")
+
+_verify_stats: Counter[str] = Counter()
+_verify_stats_lock = threading.Lock()
+
+
+def _record_verify_tier(tier: str) -> None:
+    with _verify_stats_lock:
+        _verify_stats[tier] += 1
+
+
+def get_verify_stats() -> dict[str, int]:
+    """Returns how many `verify` calls of this process were decided by each tier.
+
+    - "string": accepted because a gold and a target string are equal after `canonical_latex_string`, no sympy work was done
+    - "numeric": accepted by the exact comparison of two numbers, see `numeric_literal_eq`
+    - "sympy": accepted by the comparison of the parsed expressions
+    - "rejected": no comparison matched
+
+    Calls made in worker processes (e.g. by `verify_many`) are counted by the workers.
+    """
+    with _verify_stats_lock:
+        return {tier: _verify_stats[tier] for tier in VERIFY_TIERS}
+
+
+def reset_verify_stats() -> None:
+    """Resets the counters of `get_verify_stats`."""
+    with _verify_stats_lock:
+        _verify_stats.clear()
+
+
+def exact_number(expr: Any) -> Fraction | None:
+    """Returns the value of an Integer, Rational or finite Float as a Fraction, None for anything else.
+
+    Floats are taken at their decimal value, the digits of their precision that `str` shows and sympy's `round`
+    works from, not at their binary value: 0.0679215 is 679215/10**7 and not 0.06792149999..., so it rounds
+    half to even like in sympy.
+    """
+    if isinstance(expr, Rational):
+        return Fraction(int(expr.p), int(expr.q))
+    if isinstance(expr, Float):
+        if not expr._mpf_[1]:
+            # Zero, infinities and nan
+            return Fraction(0) if expr.is_zero else None
+        return Fraction(mlib.to_str(expr._mpf_, mlib.prec_to_dps(expr._prec)))
+    return None
+
+
+def _scaled_half_even_int(value: Fraction, scale: int) -> int:
+    # round(value * scale) without the Fraction arithmetic
+    quotient, remainder = divmod(value.numerator * scale, value.denominator)
+    twice = remainder * 2
+    if twice > value.denominator or (twice == value.denominator and quotient % 2):
+        return quotient + 1
+    return quotient
+
+
+def _sympy_number(value: Fraction, is_float: bool) -> Number:
+    if not is_float:
+        return Rational(value.numerator, value.denominator)
+    # The value of a Float is a terminating decimal (see exact_number), Float picks the precision of its digits
+    with localcontext() as context:
+        context.prec = len(str(abs(value.numerator))) + 4 * len(str(value.denominator))
+        return Float(str(Decimal(value.numerator) / Decimal(value.denominator)))
+
+
+def _rounding_needs_sympy(magnitude: int, scale: int) -> bool:
+    # sympy gives the rounded Float a precision which depends on the magnitude of the number it rounded, the
+    # results for 0.0999999996 and 0.1000000004 are two different Floats for 0.1 (see `rounded_numbers_eq`)
+    return magnitude % scale != 0 and (
+        (magnitude < scale and str(magnitude).rstrip("0") == "1") or magnitude >= 10**15
+    )
+
+
+def rounded_numbers_eq(
+    a: Fraction, a_is_float: bool, b: Fraction, b_is_float: bool, float_rounding: int
+) -> bool:
+    """Whether two numbers, one of them a Float, are equal after rounding to float_rounding decimal places.
+
+    The result is the one of `sympy_numeric_eq`, which compares the numbers rounded by sympy's `round`: the
+    values (see `exact_number`) are rounded half to even. sympy keeps a rounded integer an Integer, which is
+    never equal to a rounded Float, so such a pair is only equal if the values are (as the later tiers
+    decide). The rare pairs whose rounded value is a power of ten below 1 (or has more than 15 digits) are
+    rounded by sympy itself, the precision of its result depends on the magnitude of the number.
+
+    Args:
+        a: Value of the first number
+        a_is_float: Whether the first number is a Float
+        b: Value of the second number
+        b_is_float: Whether the second number is a Float
+        float_rounding: Number of decimal places to round to
+
+    Returns:
+        Whether the numbers are equal after rounding
+    """
+    if (not a_is_float and a.denominator == 1) or (
+        not b_is_float and b.denominator == 1
+    ):
+        return a == b
+    scale = 10**float_rounding
+    rounded = _scaled_half_even_int(a, scale)
+    if rounded != _scaled_half_even_int(b, scale):
+        return False
+    if _rounding_needs_sympy(abs(rounded), scale):
+        return _sympy_number(a, a_is_float).round(float_rounding) == _sympy_number(
+            b, b_is_float
+        ).round(float_rounding)
+    return True
+
+
+def number_value(expr: Basic | MatrixBase) -> tuple[Fraction, bool] | None:
+    """Returns the exact value of a number or a percentage of a number and whether it's a Float.
+
+    Returns None for anything else, including the infinities and nan.
+    """
+    if not is_atomic_or_pct_atomic(expr, Number):
+        return None
+    value = exact_number(expr)
+    if value is None:
+        # Percentage, i.e. an unevaluated product with 1/100
+        value = exact_number(safe_sympy_doit(expr))
+        if value is None:
+            return None
+    return value, is_atomic_or_pct_atomic(expr, Float)
+
+
+def int_array(values: list[int]) -> Any:
+    """numpy array of Python integers, int64 if all of them fit and an object array otherwise."""
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+
+
+def scaled_half_even(numerators: Any, denominators: Any, float_rounding: int) -> Any:
+    """Rounds numpy arrays of fractions to integers after scaling them by 10**float_rounding, half to even.
+
+    This is `round(Fraction(numerator, denominator) * 10**float_rounding)` for whole arrays (the denominators
+    must be positive), so two values agree after rounding to float_rounding decimal places iff their results
+    are equal. int64 arrays are converted to Python integers if the computation could overflow.
+    """
+    scale = 10**float_rounding
+    if (
+        numerators.dtype == object
+        or denominators.dtype == object
+        or max(int(numerators.max(initial=0)), -int(numerators.min(initial=0))) * scale
+        >= 2**62
+        or int(denominators.max(initial=1)) >= 2**61
+    ):
+        numerators = numerators.astype(object)
+        denominators = denominators.astype(object)
+    # np.divmod has no object loop
+    scaled = numerators * scale
+    quotients = scaled // denominators
+    remainders = scaled - quotients * denominators
+    twice = remainders * 2
+    return quotients + (
+        (twice > denominators) | ((twice == denominators) & (quotients % 2 == 1))
+    )
+
+
+def rounded_numbers_eq_array(
+    a_numerators: Any,
+    a_denominators: Any,
+    a_is_float: Any,
+    b_numerators: Any,
+    b_denominators: Any,
+    b_is_float: Any,
+    float_rounding: int,
+) -> Any:
+    """`rounded_numbers_eq` for numpy arrays of fractions (in lowest terms with positive denominators).
+
+    Returns:
+        A bool array with whether the numbers of each row are equal after rounding
+    """
+    a_rounded = scaled_half_even(a_numerators, a_denominators, float_rounding)
+    b_rounded = scaled_half_even(b_numerators, b_denominators, float_rounding)
+    equal = a_rounded == b_rounded
+    integer = (~a_is_float & (a_denominators == 1)) | (
+        ~b_is_float & (b_denominators == 1)
+    )
+    equal[integer] = (a_numerators[integer] == b_numerators[integer]) & (
+        a_denominators[integer] == b_denominators[integer]
+    )
+    scale = 10**float_rounding
+    for index in np.flatnonzero(equal & ~integer):
+        if _rounding_needs_sympy(abs(int(a_rounded[index])), scale):
+            equal[index] = rounded_numbers_eq(
+                Fraction(int(a_numerators[index]), int(a_denominators[index])),
+                bool(a_is_float[index]),
+                Fraction(int(b_numerators[index]), int(b_denominators[index])),
+                bool(b_is_float[index]),
+                float_rounding,
+            )
+    return equal
+
+
+def numeric_literal_eq(gold: Any, target: Any, float_rounding: int = 6) -> bool | None:
+    """Compares two numbers (Integer, Rational or Float) with exact `Fraction` arithmetic instead of sympy.
+
+    Rationals are equal iff their values are, which is also what all the sympy comparisons would decide. If
+    a Float is involved, the numbers are equal when they agree after rounding to float_rounding decimal places
+    like in sympy (see `rounded_numbers_eq`), other cases are left to `sympy_numeric_eq` and the rest of the
+    comparison.
+
+    Args:
+        gold: The gold extraction
+        target: The target extraction
+        float_rounding: Number of decimal places to round floats to
+
+    Returns:
+        Whether the numbers are equal, None if they are not both numbers or the comparison is left to sympy
+    """
+    a, b = exact_number(gold), exact_number(target)
+    if a is None or b is None:
+        return None
+    gold_is_float, target_is_float = isinstance(gold, Float), isinstance(target, Float)
+    if not gold_is_float and not target_is_float:
+        return a == b
+    if rounded_numbers_eq(a, gold_is_float, b, target_is_float, float_rounding):
+        return True
+    return None
+
+
+def strings_match(gold: str, target: str) -> bool:
+    """Whether the gold and target strings are non-empty and equal after `canonical_latex_string`."""
+    gold = canonical_latex_string(gold)
+    target = canonical_latex_string(target)
+    return len(gold) > 0 and len(target) > 0 and gold == target
+
+
+def compare_single_extraction(
+    gold: Basic | MatrixBase | str,
+    target: Basic | MatrixBase | str,
+    float_rounding: int,
+    numeric_precision: int,
+    strict: bool = True,
+    numeric_probing: NumericProbing = "reject",
+    gold_analysis: GoldAnalysis | None = None,
+    deadline: float | None = None,
+    complexity_limits: ComplexityLimits | None = DEFAULT_COMPLEXITY_LIMITS,
+) -> bool:
+    """Compares a single gold extraction with a single target extraction.
+
+    Args:
+        gold: The gold extraction
+        target: The target extraction
+        float_rounding: Number of decimal places to round floats to
+        numeric_precision: Number of decimal places to consider for numeric comparisons
+        strict: If true, variables do matter otherwise they don't
+        numeric_probing: How to use numeric probing, see `verify`
+        gold_analysis: Memo of the gold side work, see `GoldAnalysis`
+        deadline: time.monotonic() deadline of the comparison, see `sympy_expr_eq`
+        complexity_limits: Pairs with an expression above these limits skip the expensive comparisons, see
+            `ComplexityLimits`. None disables the check.
+
+    Returns:
+        True if the extractions are equal, False otherwise
+    """
+    # If both are sympy expressions, we can use sympy to compare them
+    if isinstance(gold, (Basic, MatrixBase)) and isinstance(
+        target, (Basic, MatrixBase)
+    ):
+        if complexity_limits is not None:
+            reason = _gold_memo(
+                gold_analysis,
+                ("complexity", complexity_limits),
+                gold,
+                lambda: expression_complexity(gold, complexity_limits),
+            ) or expression_complexity(target, complexity_limits)
+            if reason is not None:
+                return _compare_oversized(
+                    gold,
+                    target,
+                    reason,
+                    complexity_limits,
+                    numeric_probing,
+                    gold_analysis,
+                )
+        return sympy_expr_eq(
+            gold,
+            target,
+            float_rounding,
+            numeric_precision,
+            strict,
+            numeric_probing,
+            gold_analysis=gold_analysis,
+            deadline=deadline,
+        )
+
+    # We don't support str / sympy.Expr comparison. Imo there is no point in doing this, as chances
+    # of this happening are very low.  The only why one of them is not converted to sympy expression
+    # is usually because the parsing logic failed in this case we should improve the parsing logic
+    # instead of somehow fixing adhoc.
+    elif isinstance(gold, str) and isinstance(target, str):
+        # We just do string comparison for everything else
+        return strings_match(gold, target)
+
+    return False
+
+
+def _compare_in_ladder(*args, split_tiers: bool = False, **kwargs) -> tuple[bool, bool]:
+    """Runs `compare_single_extraction`, also returning whether a tier of the ladder was skipped or ran out of
+    its budget (see `sympy_expr_eq`). With split_tiers, the expensive tiers only get their share of the time left
+    (see LADDER_TIER_BUDGETS)."""
+    _ladder_state.degraded = False
+    _ladder_state.split_tiers = split_tiers
+    try:
+        result = compare_single_extraction(*args, **kwargs)
+    finally:
+        _ladder_state.split_tiers = False
+    return result, _ladder_state.degraded
+
+
 def verify(
     gold: list[Basic | MatrixBase | str] | Basic | MatrixBase | str,
     target: list[Basic | MatrixBase | str] | Basic | MatrixBase | str,
     float_rounding: int = 6,
     numeric_precision: int = 15,
     strict: bool = True,
-    timeout_seconds: int | None = 5,
+    timeout_seconds: float | None = 5,
+    sandbox: "WorkerPool | None" = None,
+    total_timeout_seconds: float | None = None,
+    numeric_probing: NumericProbing = "reject",
+    cache: "VerifyCache | None" = None,
+    complexity_limits: ComplexityLimits | None = DEFAULT_COMPLEXITY_LIMITS,
 ) -> bool:
     """Verifies if the target expression matches the gold expression using multiple comparison strategies.
 
@@ -758,17 +2026,34 @@ def verify(
         strict: Whether to enforce strict comparison mode. Defaults to True.
             - In strict mode: Variables matter and sets are not comparable with tuples
             - In non-strict mode: Variables are matched by position and sets can be compared with tuples
-        timeout_seconds: Maximum time in seconds to spend on any single comparison operation.
+        timeout_seconds: Maximum time in seconds to spend on any single comparison operation, fractions of a second are supported.
             Defaults to 5 seconds. Any timeout seconds > 0 or not None will result in the function to raise a ValueError if it's called in a threaded environment.
+        sandbox: Optional WorkerPool to run each comparison in. The comparison runs in a worker process which is
+            SIGKILLed and replaced when it exceeds timeout_seconds. Unlike the default signal based timeout, this
+            interrupts long C-level computations and works in threaded environments. Defaults to None.
+        total_timeout_seconds: Time budget in seconds for the whole call, shared by all gold x target comparisons.
+            Each comparison gets min(timeout_seconds, remaining budget) and once the budget is exhausted the remaining
+            comparisons are skipped. Defaults to None, meaning each comparison gets the full timeout_seconds.
+        numeric_probing: Whether to evaluate expressions at random points before the (slow) simplification, see `sympy_numeric_probe`.
+            - "off": Always use simplification
+            - "reject": Expressions which clearly differ at some point are not equal, otherwise use simplification. Defaults to "reject".
+            - "probabilistic": Additionally, expressions which agree at all points are equal without simplification.
+              Much faster, but can accept expressions which differ only outside of the probed points.
+        cache: Persistent cache of verify results. If the same gold and target were already verified with the same settings
+            (and library version), the stored result is returned without any comparison. Defaults to None.
+        complexity_limits: Pairs with an expression above these limits (e.g. degenerate outputs with hundreds of terms)
+            are only compared structurally and by numeric probing, or rejected, see `ComplexityLimits`.
+            Defaults to ComplexityLimits(), None disables the check.
 
     Returns:
         bool: True if target matches gold according to any of the comparison strategies,
               False otherwise.
 
     Comparison Strategy:
-        1. String to String comparison
+        1. String to String comparison, done for all the string pairs before any sympy work.
+           Strings are compared in canonical form, see `canonical_latex_string`
         2. Numeric expressions: Comparison within specified precision
-        3. Symbolic equality through simplification
+        3. Numeric probing at random points (see numeric_probing), then symbolic equality through simplification
         4. Special handling for:
             - Relational expressions (equations/inequalities)
             - Sets and intervals
@@ -793,58 +2078,319 @@ def verify(
         )
         TIMEOUT_WARNING_SHOWN = True
 
-    @timeout(timeout_seconds=timeout_seconds)
-    def compare_single_extraction(
-        gold: Basic | MatrixBase | str, target: Basic | MatrixBase | str
-    ) -> bool:
-        # If both are sympy expressions, we can use sympy to compare them
-        if isinstance(gold, (Basic, MatrixBase)) and isinstance(
-            target, (Basic, MatrixBase)
-        ):
-            return sympy_expr_eq(
-                gold, target, float_rounding, numeric_precision, strict
-            )
+    if not isinstance(gold, list):
+        gold = [gold]
+    if not isinstance(target, list):
+        target = [target]
+
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(
+            gold,
+            target,
+            float_rounding,
+            numeric_precision,
+            strict,
+            numeric_probing,
+            complexity_limits,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    result, conclusive = _verify(
+        gold,
+        target,
+        float_rounding,
+        numeric_precision,
+        strict,
+        timeout_seconds,
+        sandbox,
+        total_timeout_seconds,
+        numeric_probing,
+        [None] * len(gold),
+        complexity_limits,
+    )
+    # Timeouts and errors are not cached, they might not happen on the next run
+    if cache_key is not None and conclusive:
+        cache.set(cache_key, result)
+    return result
 
-        # We don't support str / sympy.Expr comparison. Imo there is no point in doing this, as chances
-        # of this happening are very low.  The only why one of them is not converted to sympy expression
-        # is usually because the parsing logic failed in this case we should improve the parsing logic
-        # instead of somehow fixing adhoc.
-        elif isinstance(gold, str) and isinstance(target, str):
-            # We just do string comparison for everything else
-            gold = gold.strip()
-            target = target.strip()
 
-            # Ensure it's both not empty and equal
-            return len(gold) > 0 and len(target) > 0 and gold == target
+def _verify(
+    gold: list[Basic | MatrixBase | str],
+    target: list[Basic | MatrixBase | str],
+    float_rounding: int,
+    numeric_precision: int,
+    strict: bool,
+    timeout_seconds: float | None,
+    sandbox: "WorkerPool | None",
+    total_timeout_seconds: float | None,
+    numeric_probing: NumericProbing,
+    gold_analyses: list[GoldAnalysis | None],
+    complexity_limits: ComplexityLimits | None = DEFAULT_COMPLEXITY_LIMITS,
+) -> tuple[bool, bool]:
+    """Returns whether target matches gold and whether the result is conclusive, i.e. no comparison was skipped,
+    timed out or failed."""
+    budget_deadline = (
+        time.monotonic() + total_timeout_seconds
+        if total_timeout_seconds is not None
+        else None
+    )
 
-        return False
+    def compare_single_extraction_wrapper(
+        g, t, gold_analysis, cheap_only: bool = False, split_tiers: bool = False
+    ) -> tuple[bool, bool]:
+        """Returns whether g matches t and whether the result is conclusive."""
+        pair_timeout = timeout_seconds
+        if budget_deadline is not None:
+            remaining = budget_deadline - time.monotonic()
+            if remaining <= 0:
+                logger.error("Timeout budget exhausted, skipping comparison")
+                return False, False
+            if pair_timeout is None or pair_timeout <= 0 or remaining < pair_timeout:
+                pair_timeout = remaining
+
+        if cheap_only:
+            # An expired deadline skips all the expensive tiers of the ladder
+            pair_deadline = 0.0
+        elif pair_timeout is not None and pair_timeout > 0:
+            pair_deadline = time.monotonic() + pair_timeout
+        else:
+            pair_deadline = None
 
-    def compare_single_extraction_wrapper(g, t):
         try:
-            return compare_single_extraction(g, t)
+            if sandbox is not None:
+                result, degraded = sandbox.run(
+                    _compare_in_ladder,
+                    g,
+                    t,
+                    float_rounding,
+                    numeric_precision,
+                    strict,
+                    numeric_probing,
+                    deadline=pair_deadline,
+                    complexity_limits=complexity_limits,
+                    split_tiers=split_tiers,
+                    timeout_seconds=pair_timeout,
+                )
+            else:
+                result, degraded = timeout(timeout_seconds=pair_timeout)(
+                    _compare_in_ladder
+                )(
+                    g,
+                    t,
+                    float_rounding,
+                    numeric_precision,
+                    strict,
+                    numeric_probing,
+                    gold_analysis=gold_analysis,
+                    deadline=pair_deadline,
+                    complexity_limits=complexity_limits,
+                    split_tiers=split_tiers,
+                )
+            return result, result or not degraded
 
         except ValueError as e:
             if str(e) == "signal only works in main thread of the main interpreter":
                 raise ValueError(
-                    "Math-Verify doesn't support threaded environment due to usage of signal.alarm() in timeout mechanism. If you need to run in multithreaded environment it's recommended to set the parsing_timeout=None, which will run without timeout (and signal handling). In this case you need to handle the timeouting yourself."
+                    "Math-Verify doesn't support threaded environment due to usage of signal.setitimer() in timeout mechanism. If you need to run in multithreaded environment it's recommended to set the parsing_timeout=None, which will run without timeout (and signal handling). In this case you need to handle the timeouting yourself."
                 ) from e
             else:
                 logger.exception("Error during comparison")
-                return False
+                return False, False
         except Exception:
             #! Do not attempt to print out the g and t during handling of exception
             # Because a) it can throw an exception itself and b) it can cause it to be stuck forever during str conversion
             logger.exception("Error during comparison")
-            return False
+            return False, False
         except TimeoutException:
             logger.error("Timeout during comparison")
-            return False
+            return False, False
 
-    if not isinstance(gold, list):
-        gold = [gold]
-    if not isinstance(target, list):
-        target = [target]
+    # Parsed answers usually come with their normalized string, equal strings need no sympy comparison
+    if any(
+        strings_match(g, t)
+        for g, t in product(gold, target)
+        if isinstance(g, str) and isinstance(t, str)
+    ):
+        _record_verify_tier("string")
+        return True, True
+
+    # Numbers are compared exactly, without sympy and without a timeout
+    pairs = []
+    for (g, gold_analysis), t in product(zip(gold, gold_analyses, strict=True), target):
+        if isinstance(g, str) and isinstance(t, str):
+            continue
+        numbers_equal = numeric_literal_eq(g, t, float_rounding)
+        if numbers_equal:
+            _record_verify_tier("numeric")
+            return True, True
+        if numbers_equal is None:
+            pairs.append((g, gold_analysis, t))
+
+    # With several pairs, the cheap tiers of all of them run first, so that a pair spending the time in the
+    # expensive tiers can't hide a cheap match of a later one. Only the pairs whose ladder skipped an expensive
+    # tier in this pass are compared again.
+    if len(pairs) > 1:
+        undecided_pairs = []
+        for g, gold_analysis, t in pairs:
+            result, decided = compare_single_extraction_wrapper(
+                g, t, gold_analysis, cheap_only=True
+            )
+            if result:
+                _record_verify_tier("sympy")
+                return True, True
+            if not decided:
+                undecided_pairs.append((g, gold_analysis, t))
+        pairs = undecided_pairs
+
+    # Pairs sharing the total budget split the time of their comparison among the tiers of the ladder
+    split_tiers = budget_deadline is not None and len(pairs) > 1
+    conclusive = True
+    for g, gold_analysis, t in pairs:
+        result, pair_conclusive = compare_single_extraction_wrapper(
+            g, t, gold_analysis, split_tiers=split_tiers
+        )
+        if result:
+            _record_verify_tier("sympy")
+            return True, True
+        conclusive = conclusive and pair_conclusive
+
+    _record_verify_tier("rejected")
+    return False, conclusive
+
+
+class GoldChecker:
+    """A gold answer prepared to be verified against many predictions, see `compile_gold`.
 
-    return any(
-        compare_single_extraction_wrapper(g, t) for g, t in product(gold, target)
+    `check(pred)` returns the same result as `verify(gold, pred, ...)` with the settings given here, but the
+    gold side of the comparisons is analysed only once (see `GoldAnalysis`) and reused by every check.
+
+    Args:
+        gold: The gold answer(s), as accepted by `verify`.
+        float_rounding (int, optional): See `verify`. Defaults to 6.
+        numeric_precision (int, optional): See `verify`. Defaults to 15.
+        strict (bool, optional): See `verify`. Defaults to True.
+        timeout_seconds (float | None, optional): See `verify`. Defaults to 5.
+        numeric_probing (NumericProbing, optional): See `verify`. Defaults to "reject".
+        cache (VerifyCache | None, optional): See `verify`. Defaults to None.
+        complexity_limits (ComplexityLimits | None, optional): See `verify`. Defaults to ComplexityLimits().
+    """
+
+    def __init__(
+        self,
+        gold: list[Basic | MatrixBase | str] | Basic | MatrixBase | str,
+        float_rounding: int = 6,
+        numeric_precision: int = 15,
+        strict: bool = True,
+        timeout_seconds: float | None = 5,
+        numeric_probing: NumericProbing = "reject",
+        cache: "VerifyCache | None" = None,
+        complexity_limits: ComplexityLimits | None = DEFAULT_COMPLEXITY_LIMITS,
+    ):
+        self.gold = gold if isinstance(gold, list) else [gold]
+        self.float_rounding = float_rounding
+        self.numeric_precision = numeric_precision
+        self.strict = strict
+        self.timeout_seconds = timeout_seconds
+        self.numeric_probing = numeric_probing
+        self.cache = cache
+        self.complexity_limits = complexity_limits
+        self.gold_analyses = [
+            GoldAnalysis() if isinstance(g, (Basic, MatrixBase)) else None
+            for g in self.gold
+        ]
+
+    def check(
+        self,
+        pred: list[Basic | MatrixBase | str] | Basic | MatrixBase | str,
+        total_timeout_seconds: float | None = None,
+    ) -> bool:
+        """Verifies pred against the gold.
+
+        Args:
+            pred: The prediction(s), as accepted by `verify`.
+            total_timeout_seconds (float | None, optional): See `verify`. Defaults to None.
+
+        Returns:
+            bool: Whether pred matches the gold.
+        """
+        pred = pred if isinstance(pred, list) else [pred]
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                self.gold,
+                pred,
+                self.float_rounding,
+                self.numeric_precision,
+                self.strict,
+                self.numeric_probing,
+                self.complexity_limits,
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result, conclusive = _verify(
+            self.gold,
+            pred,
+            self.float_rounding,
+            self.numeric_precision,
+            self.strict,
+            self.timeout_seconds,
+            None,
+            total_timeout_seconds,
+            self.numeric_probing,
+            self.gold_analyses,
+            self.complexity_limits,
+        )
+        if cache_key is not None and conclusive:
+            self.cache.set(cache_key, result)
+        return result
+
+
+def compile_gold(
+    gold: list[Basic | MatrixBase | str] | Basic | MatrixBase | str,
+    float_rounding: int = 6,
+    numeric_precision: int = 15,
+    strict: bool = True,
+    timeout_seconds: float | None = 5,
+    numeric_probing: NumericProbing = "reject",
+    cache: "VerifyCache | None" = None,
+    complexity_limits: ComplexityLimits | None = DEFAULT_COMPLEXITY_LIMITS,
+) -> GoldChecker:
+    """Prepares a parsed gold to be verified against many predictions.
+
+    In pass@k grading or with many samples per problem, `verify` would redo the gold side work (assignment
+    truncation, `as_set`, `solve` of relations, sorting of set elements, numeric probing values, ...) for every
+    prediction. The returned checker does it once per gold, the first time a check needs it.
+
+    Args:
+        gold: The parsed gold answer(s), as accepted by `verify`.
+        float_rounding (int, optional): See `verify`. Defaults to 6.
+        numeric_precision (int, optional): See `verify`. Defaults to 15.
+        strict (bool, optional): See `verify`. Defaults to True.
+        timeout_seconds (float | None, optional): See `verify`. Defaults to 5.
+        numeric_probing (NumericProbing, optional): See `verify`. Defaults to "reject".
+        cache (VerifyCache | None, optional): See `verify`. Defaults to None.
+        complexity_limits (ComplexityLimits | None, optional): See `verify`. Defaults to ComplexityLimits().
+
+    Returns:
+        GoldChecker: Checker whose `check(pred)` is equivalent to `verify(gold, pred, ...)`.
+
+    Example:
+        >>> checker = compile_gold(parse("$\\{1, 2, 3\\}$"))
+        >>> [checker.check(parse(pred)) for pred in ["$\\{3, 2, 1\\}$", "$\\{1, 2\\}$"]]
+        [True, False]
+    """
+    return GoldChecker(
+        gold,
+        float_rounding,
+        numeric_precision,
+        strict,
+        timeout_seconds,
+        numeric_probing,
+        cache,
+        complexity_limits,
     )
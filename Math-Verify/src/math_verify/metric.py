@@ -1,18 +1,147 @@
 ## Parser definition
 import logging
-from typing import Callable, Optional, Sequence
+from collections import Counter
+from math import comb
+from typing import Callable, Hashable, Optional, Sequence
 
-from math_verify.grader import verify
+from sympy import Basic, MatrixBase, srepr
+
+from math_verify.cache import ParseCache, VerifyCache
+from math_verify.grader import GoldChecker, canonical_latex_string, compile_gold
 from math_verify.parser import ExprExtractionConfig, ExtractionTarget, parse
-from math_verify.utils import timeout
 
 logger = logging.getLogger(__name__)
 
+
+def _ordered_form(expr: Basic) -> Hashable:
+    # Sets and systems of equations keep the order in which they were written in _unsorted_args, which their
+    # canonical args and == ignore, but which `verify` uses against ordered golds, e.g. a tuple
+    args = getattr(expr, "_unsorted_args", None)
+    if args is None:
+        if not expr.args:
+            return srepr(expr)
+        args = expr.args
+    return (type(expr), tuple(_ordered_form(arg) for arg in args))
+
+
+def answer_key(answers: list[Basic | MatrixBase | str]) -> Hashable:
+    """Returns a key which is equal for two parsed predictions that `verify` can't tell apart.
+
+    Sympy values are compared structurally, keeping the order of the elements of sets and systems of equations,
+    strings by their canonical form (see `canonical_latex_string`).
+    """
+    key = []
+    for answer in answers:
+        if isinstance(answer, str):
+            key.append(("str", canonical_latex_string(answer)))
+        elif isinstance(answer, Basic):
+            key.append(_ordered_form(answer))
+        else:
+            # Mutable matrices aren't sympy Basic objects
+            key.append(("srepr", srepr(answer)))
+    return tuple(key)
+
+
+class _DisjointSets:
+    """Union-find over 0..n-1, the root of a set is its smallest element."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+def pass_at_k(k: int) -> Callable[[list[float]], float]:
+    """Creates an aggregation function computing the unbiased pass@k estimate from n >= k prediction scores.
+
+    pass@k = 1 - C(n - c, k) / C(n, k), where c is the number of correct predictions.
+
+    Args:
+        k (int): Number of attempts.
+
+    Returns:
+        Callable[[list[float]], float]: Aggregation function for `math_metric`.
+    """
+
+    def aggregate(scores: list[float]) -> float:
+        n = len(scores)
+        if n < k:
+            raise ValueError(f"pass@{k} needs at least {k} predictions, got {n}")
+        correct = sum(1 for score in scores if score > 0)
+        return 1.0 - comb(n - correct, k) / comb(n, k)
+
+    return aggregate
+
+
+def majority_vote(
+    answers: list[list[Basic | MatrixBase | str]],
+    gold_checkers: list[GoldChecker],
+    precision: int = 6,
+) -> float:
+    """Scores the most frequent answer among predictions, equivalent answers counting as the same.
+
+    Predictions are first grouped by `answer_key`, then the groups are clustered with union-find, comparing
+    each group with the representative of every cluster found so far, so the number of comparisons depends
+    on the number of unique answers and not on the number of predictions. Predictions without an answer
+    don't vote. Ties go to the answer which appeared first.
+
+    Args:
+        answers (list[list[Basic | MatrixBase | str]]): Parsed predictions.
+        gold_checkers (list[GoldChecker]): Checkers of the golds, see `compile_gold`.
+        precision (int, optional): Number of decimal places used to compare the answers. Defaults to 6.
+
+    Returns:
+        float: 1.0 if the majority answer matches any gold, 0.0 otherwise.
+    """
+    counts = Counter(answer_key(answer) for answer in answers if answer)
+    if not counts:
+        return 0.0
+
+    # First prediction of each group, in order of appearance
+    first = {}
+    for answer in answers:
+        if answer:
+            first.setdefault(answer_key(answer), answer)
+    groups = list(first.values())
+    group_counts = [counts[key] for key in first]
+
+    clusters = _DisjointSets(len(groups))
+    representatives: list[tuple[int, GoldChecker]] = []
+    for i, group in enumerate(groups):
+        for root, checker in representatives:
+            if checker.check(group):
+                clusters.union(root, i)
+                break
+        else:
+            representatives.append((i, compile_gold(group, precision)))
+
+    votes = Counter()
+    for i, count in enumerate(group_counts):
+        votes[clusters.find(i)] += count
+    # Counter.most_common keeps insertion order on ties, roots are inserted in order of appearance
+    winner = votes.most_common(1)[0][0]
+    return (
+        1.0 if any(checker.check(groups[winner]) for checker in gold_checkers) else 0.0
+    )
+
+
 def math_metric(
     gold_extraction_target: Sequence[ExtractionTarget] = (ExprExtractionConfig(),),
     pred_extraction_target: Sequence[ExtractionTarget] = (ExprExtractionConfig(),),
     aggregation_function: Callable[[list[float]], float] = max,
     precision: int = 6,
+    parse_cache: ParseCache | None = None,
+    maj_at_k: int | None = None,
+    verify_cache: VerifyCache | None = None,
 ) -> Callable[
     [list[str], list[str]], tuple[float, Optional[tuple[list[str], list[str]]]]
 ]:
@@ -32,33 +161,50 @@ def math_metric(
             Extraction targets to use for predictions. Defaults to extracting simple math expressions.
         aggregation_function: Callable[[list[float]], float]
             Function to aggregate scores when multiple golds/predictions are present. Defaults to max.
+            Use `pass_at_k(k)` for the pass@k estimate over the predictions.
         fallback_mode: Literal["no_fallback", "first_match"]
             How to perform extraction. Defaults to "first_match".
             - "no_fallback": Only use first successfully parsed matches
             - "first_match": Use the first successfully parsed match + first match irregardless the parsing success
         precision: int
             Number of decimal places to use when comparing numerical values. Defaults to 6.
+        parse_cache: ParseCache | None
+            Persistent cache of parse results, so that re-scoring the same outputs skips the extraction. Defaults to None.
+        maj_at_k: int | None
+            If set, the score is the majority vote of the first maj_at_k predictions (see `majority_vote`) instead of
+            aggregation_function of the prediction scores. Defaults to None.
+        verify_cache: VerifyCache | None
+            Persistent cache of the gold/prediction comparisons, so that re-scoring the same answers skips the
+            verification. Defaults to None.
+
+    Predictions are deduplicated by `answer_key` before verification, so each unique answer is verified once.
 
     Returns:
         A sample level metric that extracts and compares mathematical expressions.
 
     """
 
-    @timeout(2)
-    def get_str_preds_with_timeout(
-        extracted_predictions: list[list[str]], extracted_golds: list[list[str]]
-    ) -> tuple[list[str], list[str]]:
-        golds = [str(gold) for golds in extracted_golds for gold in golds]
-        predictions = [str(pred) for preds in extracted_predictions for pred in preds]
-        return (golds, predictions)
-
     def sample_level_fn(
         golds: list[str], predictions: list[str]
     ) -> tuple[float, Optional[tuple[list[str], list[str]]]]:
+        # Sampled predictions are often identical
+        parsed_unique = {
+            pred: parse(
+                pred, pred_extraction_target, cache=parse_cache, structured=True
+            )
+            for pred in dict.fromkeys(predictions)
+        }
+        parsed_predictions = [parsed_unique[pred] for pred in predictions]
+        parsed_golds = [
+            parse(gold, gold_extraction_target, cache=parse_cache, structured=True)
+            for gold in golds
+        ]
         extracted_predictions = [
-            parse(pred, pred_extraction_target) for pred in predictions
+            [answer.value for answer in answers] for answers in parsed_predictions
+        ]
+        extracted_golds = [
+            [answer.value for answer in answers] for answers in parsed_golds
         ]
-        extracted_golds = [parse(gold, gold_extraction_target) for gold in golds]
 
         # Assert on empty gold and warn on empty pred
         if any(len(g) == 0 for g in extracted_golds):
@@ -71,31 +217,38 @@ def math_metric(
                 f"We did not manage to extract a prediction in the correct format. Gold: {golds}, Pred: {predictions}"
             )
 
-        # We have to use timeout because the sypmy to str conversion can be very slow
-        str_preds = None
-        try:
-            str_preds = get_str_preds_with_timeout(
-                extracted_predictions, extracted_golds
-            )
-        except Exception:
-            logger.warning(
-                "Timeout when adding extracted predictions and golds to specific"
+        # The normalized strings avoid the sympy to str conversion, which can be very slow
+        str_preds = (
+            [answer.normalized for answers in parsed_golds for answer in answers],
+            [answer.normalized for answers in parsed_predictions for answer in answers],
+        )
+
+        # Each gold is analysed once and compared with all the predictions
+        gold_checkers = [
+            compile_gold(gold, precision, cache=verify_cache)
+            for gold in extracted_golds
+        ]
+
+        if maj_at_k is not None:
+            return (
+                majority_vote(
+                    extracted_predictions[:maj_at_k], gold_checkers, precision
+                ),
+                str_preds,
             )
 
-        return (
-            aggregation_function(
-                [
-                    (
-                        1.0
-                        if any(
-                            verify(gold, pred, precision) for gold in extracted_golds
-                        )
-                        else 0.0
-                    )
-                    for pred in extracted_predictions
-                ]
-            ),
-            str_preds,
-        )
+        # Equivalent predictions get the same score, each unique answer is verified once
+        unique_scores: dict[Hashable, float] = {}
+        scores = []
+        for pred in extracted_predictions:
+            key = answer_key(pred)
+            if key not in unique_scores:
+                unique_scores[key] = (
+                    1.0
+                    if any(checker.check(pred) for checker in gold_checkers)
+                    else 0.0
+                )
+            scores.append(unique_scores[key])
+        return aggregation_function(scores), str_preds
 
     return sample_level_fn
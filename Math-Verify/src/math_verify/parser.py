@@ -22,10 +22,12 @@
 
 import logging
 import re
+import threading
+from bisect import bisect_right
 from dataclasses import dataclass, field, replace
 from functools import lru_cache
 from itertools import groupby
-from typing import Literal, Sequence
+from typing import TYPE_CHECKING, Container, Iterable, Iterator, Literal, Sequence
 
 import sympy
 from latex2sympy2_extended.latex2sympy2 import (
@@ -39,12 +41,18 @@ from sympy.parsing import parse_expr
 
 from math_verify.errors import TimeoutException
 from math_verify.grader import should_treat_as_complex
-from math_verify.utils import timeout
+from math_verify.utils import CacheStats, LRUCache, timeout
+
+if TYPE_CHECKING:
+    from math_verify.cache import ParseCache
+    from math_verify.pool import WorkerPool
 
 logger = logging.getLogger(__name__)
 
 TIMEOUT_WARNING_SHOWN = False
 
+THREADED_TIMEOUT_ERROR = "Math-Verify 'parse' function doesn't support threaded environment due to usage of signal.setitimer() in timeout mechanism. If you need to run in multithreaded environment it's recommended to set the parsing_timeout=None, which will run without timeout (and signal handling). In this case you need to handle the timeouting yourself."
+
 
 @dataclass(frozen=True)
 class LatexExtractionConfig:
@@ -134,10 +142,237 @@ class MultiChoiceExtractionConfig:
 ExtractionTarget = LatexExtractionConfig | ExprExtractionConfig | StringExtractionConfig | MultiChoiceExtractionConfig
 
 
-@lru_cache(maxsize=10)
+# Boxes are delimited by brace balancing rather than a regex, as regexes can't balance nested braces
+_boxed_token_re = re.compile(r"\\(?:boxed|fbox)\s*\{|[{}]")
+
+
+def find_boxed_spans(text: str, pos: int = 0) -> list[tuple[int, int, int]]:
+    """Finds all \\boxed{...} and \\fbox{...} in text in a single pass, without copying it.
+
+    Braces are balanced the same way as in the latex normalization. A box without a closing brace is
+    skipped, a box nested in another box is part of the outer box's content.
+
+    Args:
+        text (str): The text to scan.
+        pos (int, optional): Position to start the search at. Defaults to 0.
+
+    Returns:
+        list[tuple[int, int, int]]: (start, content_start, content_end) of each box in order of position.
+            The box is text[start:content_end + 1] and its content text[content_start:content_end].
+    """
+    spans = []
+    # Opening braces which are not closed yet, with the start of their box or -1 for plain braces
+    open_braces: list[tuple[int, int]] = []
+    for token in _boxed_token_re.finditer(text, pos):
+        if token.group() == "}":
+            if not open_braces:
+                continue
+            box_start, content_start = open_braces.pop()
+            if box_start >= 0:
+                spans.append((box_start, content_start, token.start()))
+        elif token.group() == "{":
+            open_braces.append((-1, token.end()))
+        else:
+            open_braces.append((token.start(), token.end()))
+
+    # Boxes are closed inner first, keep the outermost ones
+    spans.sort()
+    top_level = []
+    for span in spans:
+        if not top_level or span[0] > top_level[-1][2]:
+            top_level.append(span)
+    return top_level
+
+
+def _pad_boxed(text: str) -> tuple[str, list[tuple[int, int, int]]]:
+    # Returns the padded text and its segments (padded_start, original_start, original_length), in order
+    parts = []
+    segments = [(0, 0, len(text))]
+    padded_len = 0
+    last = 0
+    for _, content_start, content_end in find_boxed_spans(text):
+        raw = text[content_start:content_end]
+        content = raw.strip()
+        if not content:
+            continue
+        content_offset = content_start + len(raw) - len(raw.lstrip())
+        padded_len += content_start - last
+        segments += [
+            (padded_len, content_start, content_offset - content_start),
+            (padded_len + 1, content_offset, len(content)),
+            (padded_len + 1 + len(content), content_offset + len(content), 0),
+            (padded_len + 2 + len(content), content_end, len(text) - content_end),
+        ]
+        parts.extend((text[last:content_start], " ", content, " "))
+        padded_len += len(content) + 2
+        last = content_end
+    if not parts:
+        return text, segments
+    parts.append(text[last:])
+    return "".join(parts), segments
+
+
+def pad_boxed_content(text: str) -> str:
+    """Surrounds the stripped content of each box with single spaces, e.g. \\boxed{5} -> \\boxed{ 5 }.
+
+    This delimits the boxed content like running text, so that plain expression patterns find it.
+    """
+    return _pad_boxed(text)[0]
+
+
+def _unpad_position(segments: list[tuple[int, int, int]], pos: int) -> int:
+    # Maps a position of the padded text to the original text, inserted padding maps to its boundary
+    padded_start, original_start, original_length = segments[
+        bisect_right(segments, (pos, float("inf"))) - 1
+    ]
+    return original_start + min(pos - padded_start, original_length)
+
+
+class BoxedMatch:
+    """Match of a `BoxedPattern`, implements the part of the re.Match API used by the extraction."""
+
+    __slots__ = ("_start", "_end", "_groups")
+
+    def __init__(self, start: int, end: int, groups: dict[str, str]):
+        self._start = start
+        self._end = end
+        self._groups = groups
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def span(self) -> tuple[int, int]:
+        return self._start, self._end
+
+    def group(self, name: str) -> str:
+        return self._groups[name]
+
+    def groupdict(self) -> dict[str, str]:
+        return dict(self._groups)
+
+
+@dataclass(frozen=True)
+class BoxedPattern:
+    """Pattern-like matcher of boxes built on `find_boxed_spans`, used in place of a regex for boxed priorities.
+
+    Attributes:
+        group (str): Name of the group holding the extracted text.
+        mode (Literal["span", "each"]): "span" produces a single match from the first to the last box, the latex
+            normalization then extracts the last box(es) from it. "each" produces a match for each box, with its
+            stripped content.
+        choices (tuple[str, ...] | None): In "each" mode, only boxes whose content is one of the choices match.
+        in_dollars (bool): In "each" mode, only boxes directly enclosed in $...$ match.
+    """
+
+    group: str
+    mode: Literal["span", "each"] = "each"
+    choices: tuple[str, ...] | None = None
+    in_dollars: bool = False
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[BoxedMatch]:
+        spans = find_boxed_spans(text, pos)
+        if self.mode == "span":
+            if spans:
+                start, end = spans[0][0], spans[-1][2] + 1
+                yield BoxedMatch(start, end, {self.group: text[start:end]})
+            return
+
+        for start, content_start, content_end in spans:
+            end = content_end + 1
+            content = text[content_start:content_end].strip()
+            if self.choices is not None and content not in self.choices:
+                continue
+            if self.in_dollars:
+                if text[start - 1 : start] != "$" or text[end : end + 1] != "$":
+                    continue
+                start, end = start - 1, end + 1
+            yield BoxedMatch(start, end, {self.group: content})
+
+
+ExtractionPattern = re.Pattern[str] | BoxedPattern
+
+# Literals a pattern can't match without. Each inner tuple lists alternatives, the pattern can only
+# match if at least one literal of every inner tuple occurs in the text (compared case-insensitively).
+PatternAnchors = tuple[tuple[str, ...], ...]
+
+# Anchors of the compiled extraction patterns. Patterns without an entry are always run.
+pattern_anchors: dict[ExtractionPattern, PatternAnchors] = {}
+
+# Literals at which every match of a pattern is found (compared case-insensitively). A search for the
+# pattern from a position before which none of them occurs finds the same matches as a search of the
+# whole text, see `starts_absent_before`. Patterns without an entry can have a match starting anywhere.
+PatternStarts = tuple[str, ...]
+pattern_starts: dict[ExtractionPattern, PatternStarts] = {}
+
+
+def compile_anchored(
+    pattern: str | BoxedPattern,
+    anchors: PatternAnchors,
+    flags: int = 0,
+    starts: PatternStarts = (),
+) -> ExtractionPattern:
+    """Compiles pattern and registers the literals it requires (see `scan_anchors`) and those its matches start at."""
+    compiled = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+    pattern_anchors[compiled] = anchors
+    if starts:
+        pattern_starts[compiled] = starts
+    return compiled
+
+
+@lru_cache(maxsize=100)
+def _anchor_regex(anchor: str) -> re.Pattern[str]:
+    return re.compile(re.escape(anchor), re.IGNORECASE)
+
+
+def scan_anchors(text: str, anchors: Sequence[str]) -> dict[str, list[int]]:
+    """Finds the occurrences of the anchor literals in text.
+
+    The matching is case-insensitive, which is never stricter than the patterns themselves. Each literal
+    is searched separately, as the regex engine's literal search is much faster than a single pass with
+    an alternation of all the literals.
+
+    Args:
+        text (str): The text to scan.
+        anchors (Sequence[str]): The literals to look for.
+
+    Returns:
+        dict[str, list[int]]: Start positions of each anchor found in text, anchors not found are missing.
+    """
+    positions: dict[str, list[int]] = {}
+    for anchor in dict.fromkeys(anchors):
+        found = [match.start() for match in _anchor_regex(anchor).finditer(text)]
+        if found:
+            positions[anchor] = found
+    return positions
+
+
+def required_anchors(patterns: Iterable[ExtractionPattern]) -> list[str]:
+    """Returns all the anchor and start literals registered for patterns."""
+    return [
+        anchor
+        for pattern in patterns
+        for alternatives in (
+            *pattern_anchors.get(pattern, ()),
+            pattern_starts.get(pattern, ()),
+        )
+        for anchor in alternatives
+    ]
+
+
+def can_match(pattern: ExtractionPattern, found_anchors: Container[str]) -> bool:
+    """Whether the anchors required by pattern are all present, see `scan_anchors`."""
+    return all(
+        any(anchor in found_anchors for anchor in alternatives)
+        for alternatives in pattern_anchors.get(pattern, ())
+    )
+
+
 def lazy_string_regex(
     string_extraction_config: StringExtractionConfig,
-) -> list[tuple[re.Pattern[str], int]]:
+) -> list[tuple[ExtractionPattern, int]]:
     # First get indices to predict
     string_keys = f"(?P<string_keys>{'|'.join([re.escape(i) for i in string_extraction_config.strings])})"
 
@@ -156,7 +391,7 @@ def lazy_string_regex(
 
     answer_word = "(?i:answer)"
 
-    regexes = []
+    regexes: list[tuple[str, int, PatternAnchors, PatternStarts]] = []
 
     final_answer_prefixed_re = rf"(?i:final answer is)\:?\s*{string_keys}\.?\s?I hope"
 
@@ -166,33 +401,45 @@ def lazy_string_regex(
     )
     regexes.extend(
         [
-            (final_answer_prefixed_re, 0),
-            (final_answer_prefixed_just_is, 50),
+            (
+                final_answer_prefixed_re,
+                0,
+                (("final answer is",), ("i hope",)),
+                ("final answer is",),
+            ),
+            (final_answer_prefixed_just_is, 50, (("final answer",),), ("final answer",)),
         ]
     )
 
     regexes.extend(
         [
             # Most specific patterns first
-            (f"{answer_word}{colon_re}.{{0,50}}?{answer_re}", 100),
+            (
+                f"{answer_word}{colon_re}.{{0,50}}?{answer_re}",
+                100,
+                (("answer:",),),
+                ("answer:",),
+            ),
             # Answer word patterns
-            (f"{answer_word}.{{0,50}}?{answer_re}", 200),
+            (f"{answer_word}.{{0,50}}?{answer_re}", 200, (("answer",),), ("answer",)),
         ]
     )
 
     if string_extraction_config.try_extract_without_anchor:
         # Start of line patterns
-        regexes.append((answer_re_start, 250))
+        regexes.append((answer_re_start, 250, (), ()))
         # Plain string patterns
-        regexes.append((answer_re, 300))
+        regexes.append((answer_re, 300, (), ()))
 
-    return [(re.compile(pattern), priority) for pattern, priority in regexes]
+    return [
+        (compile_anchored(pattern, anchors, starts=starts), priority)
+        for pattern, priority, anchors, starts in regexes
+    ]
 
 
-@lru_cache(maxsize=10)
 def lazy_multichoice_regex(
     multichoice_config: MultiChoiceExtractionConfig,
-) -> list[tuple[re.Pattern[str], int]]:
+) -> list[tuple[ExtractionPattern, int]]:
     """Creates regex patterns for extracting multiple choice answers.
     
     This creates patterns specifically designed for multiple choice questions,
@@ -202,55 +449,91 @@ def lazy_multichoice_regex(
     choice_group = f"(?P<choice_key>(?:{choices}))"
     
     # Common patterns for multiple choice answers
-    regexes = []
+    regexes: list[tuple[str | BoxedPattern, int, PatternAnchors, PatternStarts]] = []
+    answer_words = ("answer", "option", "choice")
+    box_commands = ("\\boxed", "\\fbox")
     
     # High priority patterns (explicit mentions of answer)
     final_answer_pattern = rf"(?i:(?:final|my|the)\s+answer\s+(?:is|:|\s+)\s*{choice_group}(?:\.|\s|$))"
-    regexes.append((final_answer_pattern, 0))
+    regexes.append((final_answer_pattern, 0, (("answer",),), ("final", "my", "the")))
     
     answer_pattern = rf"(?i:(?:answer|option|choice)\s*(?:is|:|=|\s+)\s*{choice_group}(?:\.|\s|$))"
-    regexes.append((answer_pattern, 50))
+    regexes.append((answer_pattern, 50, (answer_words,), answer_words))
     
     # Medium priority patterns
     correct_pattern = rf"(?i:{choice_group}\s+is\s+(?:the\s+)?(?:correct|right)\s+(?:answer|option|choice))"
-    regexes.append((correct_pattern, 100))
+    regexes.append(
+        (
+            correct_pattern,
+            100,
+            (("correct", "right"), answer_words),
+            tuple(multichoice_config.choices),
+        )
+    )
     
     # Add patterns for boxed choices
     if multichoice_config.boxed_match_priority >= 0:
         # High priority boxed pattern with answer context
-        boxed_answer_pattern = rf"(?i:(?:final|my|the)?\s*answer\s+(?:is|:|\s+)?\s*\\boxed{{{choice_group}}})(?:\.|\s|$)"
-        regexes.append((boxed_answer_pattern, multichoice_config.boxed_match_priority))
+        boxed_answer_pattern = rf"(?i:(?:final|my|the)?\s*answer\s+(?:is|:|\s+)?\s*\\boxed{{\s*{choice_group}\s*}})(?:\.|\s|$)"
+        regexes.append(
+            (
+                boxed_answer_pattern,
+                multichoice_config.boxed_match_priority,
+                (("answer",), ("\\boxed",)),
+                (),
+            )
+        )
         
         # Plain boxed choice pattern
-        boxed_choice_pattern = rf"\\boxed{{{choice_group}}}"
-        regexes.append((boxed_choice_pattern, multichoice_config.boxed_match_priority + 10))
+        boxed_choice_pattern = BoxedPattern(
+            group="choice_key", choices=multichoice_config.choices
+        )
+        regexes.append(
+            (
+                boxed_choice_pattern,
+                multichoice_config.boxed_match_priority + 10,
+                (box_commands,),
+                box_commands,
+            )
+        )
         
         # LaTeX environment with boxed choice
-        latex_boxed_pattern = rf"\$\\boxed{{{choice_group}}}\$"
-        regexes.append((latex_boxed_pattern, multichoice_config.boxed_match_priority + 20))
+        latex_boxed_pattern = BoxedPattern(
+            group="choice_key", choices=multichoice_config.choices, in_dollars=True
+        )
+        regexes.append(
+            (
+                latex_boxed_pattern,
+                multichoice_config.boxed_match_priority + 20,
+                (("$",), box_commands),
+                box_commands,
+            )
+        )
     
     # Lower priority patterns with more context
     if multichoice_config.strict_formatting:
         # Only match when letter is clearly marked as a choice
         clear_choice_pattern = rf"(?i:(?:^|\n|\s)(?:option\s+)?{choice_group}(?:\.|\)|\s+is|\s*:))"
-        regexes.append((clear_choice_pattern, 200))
+        regexes.append((clear_choice_pattern, 200, (), ()))
     else:
         # Match standalone letter (but still require some formatting to avoid random letters)
         standalone_pattern = rf"(?<!\w)(?:option\s+)?{choice_group}(?:\.|\)|\s|\n|$)(?!\w)"
-        regexes.append((standalone_pattern, 300))
+        regexes.append((standalone_pattern, 300, (), ()))
     
     # Lowest priority pattern if extraction without anchor is allowed
     if multichoice_config.try_extract_without_anchor and not multichoice_config.strict_formatting:
         simple_pattern = rf"(?<!\w){choice_group}(?!\w)"
-        regexes.append((simple_pattern, 400))
+        regexes.append((simple_pattern, 400, (), ()))
     
-    return [(re.compile(pattern, re.DOTALL), priority) for pattern, priority in regexes]
+    return [
+        (compile_anchored(pattern, anchors, re.DOTALL, starts), priority)
+        for pattern, priority, anchors, starts in regexes
+    ]
 
 
-@lru_cache(maxsize=1)
 def lazy_expr_regex(
     expr_config: ExprExtractionConfig,
-) -> list[tuple[re.Pattern[str], int]]:
+) -> list[tuple[ExtractionPattern, int]]:
     # Basic number patterns (no LaTeX)
     number_re = (
         # Format 1: Numbers with thousand separators (e.g., "1,234.56" or "1 234.56")
@@ -290,7 +573,7 @@ def lazy_expr_regex(
     expr_with_anchors = rf"(?:{expr_prefix_re}{expr_re}{expr_suffix_re})"
     number_with_anchors = rf"(?:{expr_prefix_re}[{currency_units}]?{number_re})"
     expr_or_number = rf"(?:{expr_with_anchors}|{number_with_anchors})"
-    regexes: list[tuple[str, int]] = []
+    regexes: list[tuple[str, int, PatternAnchors, PatternStarts]] = []
 
     final_answer_prefixed_re = (
         rf"(?i:final answer is|Đáp án đúng là)\:?\s*{expr_or_number}\.?\s?I hope"
@@ -298,8 +581,22 @@ def lazy_expr_regex(
     final_answer_prefixed_just_is = (
         rf"(?i:final answer.{{0,100}}?|Đáp án đúng là)\s+is\:?{expr_or_number}"
     )
-    regexes.append((final_answer_prefixed_re, 0))
-    regexes.append((final_answer_prefixed_just_is, 50))
+    regexes.append(
+        (
+            final_answer_prefixed_re,
+            0,
+            (("final answer is", "Đáp án đúng là"), ("i hope",)),
+            ("final answer is", "Đáp án đúng là"),
+        )
+    )
+    regexes.append(
+        (
+            final_answer_prefixed_just_is,
+            50,
+            (("final answer", "Đáp án đúng là"),),
+            ("final answer", "Đáp án đúng là"),
+        )
+    )
 
     answer_prefix_re = r"(?i:answer)"
 
@@ -308,14 +605,22 @@ def lazy_expr_regex(
     equals_re = (
         rf"{answer_prefix_re}(?:.{{0,100}}=\s*|.{{0,50}}?){expr_or_number}(?!\s*=)"
     )
-    regexes.extend([(equals_re_colon, 100), (equals_re, 200)])
+    regexes.extend(
+        [
+            (equals_re_colon, 100, (("answer:",),), ("answer:",)),
+            (equals_re, 200, (("answer",),), ("answer",)),
+        ]
+    )
 
     if expr_config.try_extract_without_anchor:
         # If everything fails, try to match plain expr/number
-        regexes.append((expr_with_anchors, 300))
-        regexes.append((number_with_anchors, 300))
+        regexes.append((expr_with_anchors, 300, (), ()))
+        regexes.append((number_with_anchors, 300, (), ()))
 
-    return [(re.compile(pattern), priority) for pattern, priority in regexes]
+    return [
+        (compile_anchored(pattern, anchors, starts=starts), priority)
+        for pattern, priority, anchors, starts in regexes
+    ]
 
 
 def make_latex_env_pattern(
@@ -379,10 +684,9 @@ def make_latex_env_pattern(
     return latex_env_re
 
 
-@lru_cache(maxsize=1)
 def lazy_latex_regex(
     latex_config: LatexExtractionConfig,
-) -> list[tuple[re.Pattern[str], int]]:
+) -> list[tuple[ExtractionPattern, int]]:
     # Pattern for multiple latex environments connected by and/or (also considering oxford comma)
     # Create patterns for up to 5 connected expressions
     first_latex_group = make_latex_env_pattern("first_")
@@ -397,26 +701,49 @@ def lazy_latex_regex(
     colon_re = r":"
     answer_prefix_re = r"(?i:answer)"
 
+    # Every latex environment starts with one of these, the fraction pattern with \\frac
+    latex_env_anchors = ("$", "[", "\\(", "\\frac")
+    boxed_env_anchors = ("$", "[", "\\(")
+
     # We first match boxed env, for some reason that's the most common case of output
     # Then we match the latex with environments, then we try to match the fraction
-    regexes: list[tuple[str, int]] = []
+    regexes: list[tuple[str | BoxedPattern, int, PatternAnchors, PatternStarts]] = []
     for latex_re in [latex_envs_re]:
         final_answer_prefixed_re = rf"(?i:final answer is)\:?\s*{latex_re}\.?\s?I hope"
         final_answer_prefixed_just_is = (
             rf"(?i:final answer.{{0,100}}?)\s+is\:?\s*{latex_re}"
         )
-        regexes.append((final_answer_prefixed_re, 0))
-        regexes.append((final_answer_prefixed_just_is, 50))
+        regexes.append(
+            (
+                final_answer_prefixed_re,
+                0,
+                (("final answer is",), ("i hope",), latex_env_anchors),
+                ("final answer is",),
+            )
+        )
+        regexes.append(
+            (
+                final_answer_prefixed_just_is,
+                50,
+                (("final answer",), latex_env_anchors),
+                ("final answer",),
+            )
+        )
 
         # Match with answer word - higher priority than plain latex
         answer_re_colon = f"{answer_prefix_re}{colon_re}.{{0,50}}?{latex_re}"
         answer_re = f"{answer_prefix_re}.{{0,50}}?{latex_re}"
 
-        regexes.extend([(answer_re_colon, 100), (answer_re, 200)])
+        regexes.extend(
+            [
+                (answer_re_colon, 100, (("answer:",), latex_env_anchors), ("answer:",)),
+                (answer_re, 200, (("answer",), latex_env_anchors), ("answer",)),
+            ]
+        )
 
         # Match plain LaTeX - lowest priority
         if latex_config.try_extract_without_anchor:
-            regexes.append((latex_re, 300))
+            regexes.append((latex_re, 300, (latex_env_anchors,), ()))
 
     # This ensures that boxed is matched right after the final answer xxxx
     if latex_config.boxed_match_priority >= 0:
@@ -428,43 +755,180 @@ def lazy_latex_regex(
             ]
         )
         latex_re_boxed = rf"{latex_re_boxed}{next_groups}"
-        regexes.append((latex_re_boxed, latex_config.boxed_match_priority))
-        # Match plain boxed, the issue with plain boxed is that it's impossible to know where it stops, so if there are
-        # till last }. We do the actuall extraction in the normalization step.
         regexes.append(
-            (r"(?P<first_latexBoxed>\\boxed{.+})", latex_config.boxed_match_priority)
+            (
+                latex_re_boxed,
+                latex_config.boxed_match_priority,
+                (("\\boxed",), boxed_env_anchors),
+                (),
+            )
+        )
+        # Match plain boxed, from the first to the last box. Which boxes form the answer is decided
+        # in the normalization step.
+        regexes.append(
+            (
+                BoxedPattern(group="first_latexBoxed", mode="span"),
+                latex_config.boxed_match_priority,
+                (("\\boxed", "\\fbox"),),
+                ("\\boxed", "\\fbox"),
+            )
         )
 
-    return [(re.compile(pattern, re.DOTALL), priority) for pattern, priority in regexes]
+    return [
+        (compile_anchored(pattern, anchors, re.DOTALL, starts), priority)
+        for pattern, priority, anchors, starts in regexes
+    ]
+
+
+# Compiled patterns of every extraction config seen so far, configs are frozen dataclasses so they can
+# be used as keys. Patterns compiled before a fork (see `warmup`) are inherited by the child processes.
+_pattern_registry: dict[ExtractionTarget, list[tuple[ExtractionPattern, int]]] = {}
+_pattern_registry_lock = threading.Lock()
+
+
+def _build_patterns(
+    target_type: ExtractionTarget,
+) -> list[tuple[ExtractionPattern, int]]:
+    if isinstance(target_type, LatexExtractionConfig):
+        return lazy_latex_regex(target_type)
+    elif isinstance(target_type, ExprExtractionConfig):
+        return lazy_expr_regex(target_type)
+    elif isinstance(target_type, MultiChoiceExtractionConfig):
+        return lazy_multichoice_regex(target_type)
+    return lazy_string_regex(target_type)
+
+
+def get_target_patterns(
+    target_type: ExtractionTarget,
+) -> list[tuple[ExtractionPattern, int]]:
+    """Returns the compiled patterns with their priorities for target_type, compiling them on first use."""
+    patterns = _pattern_registry.get(target_type)
+    if patterns is None:
+        with _pattern_registry_lock:
+            patterns = _pattern_registry.get(target_type)
+            if patterns is None:
+                patterns = _build_patterns(target_type)
+                _pattern_registry[target_type] = patterns
+    return patterns
+
+
+def warmup(target_types: Iterable[ExtractionTarget]) -> None:
+    """Compiles the extraction patterns of the given configs ahead of time.
+
+    The compiled patterns are kept for the lifetime of the process, so alternating between configs
+    (e.g. different configs for golds and predictions) never recompiles them. Calling it before creating
+    a fork based `WorkerPool` (or before its first use, when the workers are started) lets all the workers
+    inherit the compiled patterns.
+
+    Args:
+        target_types (Iterable[ExtractionTarget]): The extraction configs to compile the patterns for.
+
+    Example:
+        >>> warmup([LatexExtractionConfig(boxed_match_priority=0), LatexExtractionConfig(), ExprExtractionConfig()])
+    """
+    for target_type in target_types:
+        get_target_patterns(target_type)
 
 
 def get_extraction_regexes(
     target_types: Sequence[ExtractionTarget],
-) -> list[tuple[list[tuple[re.Pattern[str], int]], ExtractionTarget]]:
-    extraction_regexes: list[
-        tuple[list[tuple[re.Pattern[str], int]], ExtractionTarget]
-    ] = [
-        (
-            (lazy_latex_regex(target_type), target_type)
-            if isinstance(target_type, LatexExtractionConfig)
-            else (
-                (lazy_expr_regex(target_type), target_type)
-                if isinstance(target_type, ExprExtractionConfig)
-                else (
-                    (lazy_multichoice_regex(target_type), target_type)
-                    if isinstance(target_type, MultiChoiceExtractionConfig)
-                    else (lazy_string_regex(target_type), target_type)
-                )
-            )
-        )
-        for target_type in target_types
+) -> list[tuple[list[tuple[ExtractionPattern, int]], ExtractionTarget]]:
+    return [
+        (get_target_patterns(target_type), target_type) for target_type in target_types
     ]
-    return extraction_regexes
 
 
-# Small cache, to catche repeated calls invalid parsing
-@lru_cache(maxsize=20)
-def parse_latex_cached(latex: str):
+# Default number of entries of each of the parsing caches below
+DEFAULT_PARSE_CACHE_SIZE = 10_000
+
+# Caches of the individual parsing steps. Failures are cached too, so that an answer that can't be
+# parsed and is repeated across samples fails fast instead of running latex2sympy (twice) again.
+normalize_latex_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+latex_group_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+latex_parse_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+expr_parse_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+
+
+def _parse_caches() -> tuple[LRUCache, ...]:
+    return (normalize_latex_cache, latex_group_cache, latex_parse_cache, expr_parse_cache)
+
+
+def set_parse_cache_size(maxsize: int) -> None:
+    """Sets the maximum number of entries of each parsing cache. 0 disables the caching."""
+    for cache in _parse_caches():
+        cache.resize(maxsize)
+
+
+def get_parse_cache_stats() -> dict[str, CacheStats]:
+    """Returns the hit/miss/eviction counters of the parsing caches."""
+    return {
+        "normalize_latex": normalize_latex_cache.stats(),
+        "latex_group": latex_group_cache.stats(),
+        "parse_latex": latex_parse_cache.stats(),
+        "parse_expr": expr_parse_cache.stats(),
+    }
+
+
+def clear_parse_caches() -> None:
+    """Removes all entries from the parsing caches and resets their counters."""
+    for cache in _parse_caches():
+        cache.clear()
+
+
+def normalize_latex_cached(latex: str, config: NormalizationConfig) -> str:
+    return normalize_latex_cache.get_or_compute(
+        (latex, config), lambda: normalize_latex(latex, config=config)
+    )
+
+
+# Plain numeric literals of normalized latex, see parse_numeric_literal
+_integer_literal = re.compile(r"-?\d+")
+_decimal_literal = re.compile(r"-?\d*\.\d+")
+_fraction_literal = re.compile(r"(-?)\\frac\{(-?\d+)\}\{(-?\d+)\}")
+_percent_literal = re.compile(r"(-?)(\d+|\d*\.\d+)\\%")
+
+
+def parse_numeric_literal(latex: str) -> sympy.Expr | None:
+    """Builds the value of a plain numeric literal without the latex parser.
+
+    Integers, decimals, `\\frac{a}{b}` with integer a and b, and percentages of integers or decimals are
+    recognized, the values are the same latex2sympy builds for them (e.g. `Float` for decimals, unevaluated
+    `Mul` for percentages). Decimal commas don't reach it in latex, where `3,14` is the set {3, 14}.
+
+    Args:
+        latex (str): Normalized latex.
+
+    Returns:
+        sympy.Expr | None: The value, None if latex is not a plain numeric literal.
+    """
+    if _integer_literal.fullmatch(latex):
+        return sympy.Integer(latex)
+    if _decimal_literal.fullmatch(latex):
+        return sympy.Float(latex)
+    if match := _fraction_literal.fullmatch(latex):
+        sign, numerator, denominator = match.groups()
+        if int(denominator) == 0:
+            # Left to latex2sympy, which gives zoo or nan
+            return None
+        value = sympy.Rational(int(numerator), int(denominator))
+        return -value if sign else value
+    if match := _percent_literal.fullmatch(latex):
+        sign, number = match.groups()
+        value = sympy.Float(number) if "." in number else sympy.Integer(number)
+        if sign:
+            return sympy.Mul(
+                sympy.Integer(-1), sympy.Rational(1, 100), value, evaluate=False
+            )
+        return sympy.Mul(sympy.Rational(1, 100), value, evaluate=False)
+    return None
+
+
+def _parse_latex(latex: str):
+    # Plain numbers are most of the answers, they don't need the latex parser
+    value = parse_numeric_literal(latex)
+    if value is not None:
+        return value
+
     # First try to parse the latex as is
     try:
         return latex2sympy(
@@ -487,9 +951,14 @@ def parse_latex_cached(latex: str):
             raise e
 
 
-@lru_cache(maxsize=20)
+def parse_latex_cached(latex: str):
+    return latex_parse_cache.get_or_compute(latex, lambda: _parse_latex(latex))
+
+
 def parse_expr_cached(expr: str):
-    return parse_expr(expr, evaluate=False)
+    return expr_parse_cache.get_or_compute(
+        expr, lambda: parse_expr(expr, evaluate=False)
+    )
 
 
 def extract_expr(match: re.Match) -> tuple[str | sympy.Expr | None, str]:
@@ -514,7 +983,8 @@ def extract_expr(match: re.Match) -> tuple[str | sympy.Expr | None, str]:
 
         decimal = decimal.replace(",", ".")
         number_str = f"{integer}{decimal}"
-        number = Number(number_str)
+        # Number(number_str) would go through sympify and parse_expr, the constructors give the same values
+        number = sympy.Float(number_str) if decimal else sympy.Integer(number_str)
 
         if is_percentage:
             number = convert_to_pct(number)
@@ -550,18 +1020,58 @@ def get_last_eq(latex: str):
     return latex
 
 
-@lru_cache(maxsize=20)
+def _extract_latex_group(
+    latex: str, is_boxed: bool, is_percentage: bool, config: NormalizationConfig
+) -> tuple[sympy.Expr | None, str]:
+    # Use modified config for boxed groups
+    if is_boxed:
+        config = replace(config, boxed="last")  # Use replace to modify single field
+
+    normalized_latex = normalize_latex_cached(latex, config)
+    try:
+        parsed_latex = parse_latex_cached(normalized_latex)
+        if is_percentage:
+            parsed_latex = convert_to_pct(parsed_latex)
+    except Exception:
+        parsed_latex = None
+    return parsed_latex, normalized_latex
+
+
+def extract_latex_group(
+    latex: str, is_boxed: bool, is_percentage: bool, config: NormalizationConfig
+) -> tuple[sympy.Expr | None, str]:
+    """Normalizes and parses a single latex group of a match.
+
+    The result is cached by the content of the group, so the same answer repeated across samples is
+    only normalized and parsed once.
+
+    Args:
+        latex (str): The latex captured by the group.
+        is_boxed (bool): Whether the group was captured by the boxed pattern.
+        is_percentage (bool): Whether the group is followed by a percentage sign.
+        config (NormalizationConfig): Normalization config of the extraction.
+
+    Returns:
+        tuple[sympy.Expr | None, str]: The parsed expression (None if parsing failed) and the normalized latex.
+    """
+    return latex_group_cache.get_or_compute(
+        (latex, is_boxed, is_percentage, config),
+        lambda: _extract_latex_group(latex, is_boxed, is_percentage, config),
+    )
+
+
 def extract_latex(
     match: re.Match, latex_config: LatexExtractionConfig
 ) -> tuple[sympy.Expr | str | None, str]:
     latex_exprs = []
     latex_strs = []
+    groups = match.groupdict()
 
     # Get all latex groups (both first_ and nextN_ prefixes)
     first_latex_group = next(
         (
             (val, name)
-            for name, val in match.groupdict().items()
+            for name, val in groups.items()
             if name.startswith("first_latex") and val
         ),
         None,
@@ -572,7 +1082,7 @@ def extract_latex(
         next(
             (
                 (val, name)
-                for name, val in match.groupdict().items()
+                for name, val in groups.items()
                 if name.startswith(f"next{i}_latex") and val
             ),
             None,
@@ -587,29 +1097,16 @@ def extract_latex(
     for latex, name in all_latex:
         name_without_prefix = name.split("_")[0]
         group_name = name.split("_")[1] if len(name.split("_")) > 1 else None
-        is_percentage = (
-            True if match.groupdict().get(f"{name_without_prefix}_percent") else False
-        )
-
-        # Use modified config if group name is 'boxed'
-        config = latex_config.normalization_config
-        if group_name == "latexBoxed":
-            config = replace(config, boxed="last")  # Use replace to modify single field
+        is_percentage = True if groups.get(f"{name_without_prefix}_percent") else False
 
-        normalized_latex = normalize_latex(
+        parsed_latex, normalized_latex = extract_latex_group(
             latex,
-            config=config,
+            group_name == "latexBoxed",
+            is_percentage,
+            latex_config.normalization_config,
         )
         latex_strs.append(normalized_latex)
-
-        try:
-            parsed_latex = parse_latex_cached(normalized_latex)
-            if is_percentage:
-                parsed_latex = convert_to_pct(parsed_latex)
-            latex_exprs.append(parsed_latex)
-        except Exception:
-            latex_exprs.append(None)
-            pass
+        latex_exprs.append(parsed_latex)
 
     if not latex_exprs:
         return None, ""
@@ -670,51 +1167,151 @@ def extract_match(
         return extract_multichoice(match, target_type)
 
 
-def extract_target_from_pred(
-    pred: str,
-    target_res: list[tuple[list[tuple[re.Pattern[str], int]], ExtractionTarget]],
-    fallback_mode: Literal["no_fallback", "first_match"] = "no_fallback",
-    extraction_mode: Literal["first_match", "any_match"] = "any_match",
-):
-    """Extracts targets from a prediction string using regex patterns.
-    Returns first sucesffuly extracted match.
+class ParsedAnswer:
+    """An answer extracted by `parse(..., structured=True)`, with where and how it was found.
 
-    Args:
-        pred (str): The prediction string to extract from
-        target_res (list[tuple[list[tuple[re.Pattern[str], int]], ExtractionTarget]]): List of regex patterns and their priorities for each target type
-        fallback_mode (Literal["no_fallback", "first_match"], optional): How to handle extraction failures. Defaults to "no_fallback".
-            - "no_fallback": Return only successfully parsed match
-            - "first_match": Additionaly Include the first string match no matter how parsing finished
-        extraction_mode (Literal["first_match", "any_match"], optional): How to handle extraction failures. Defaults to "any_match".
-            - "first_match": Only tries to extract the first match
-            - "any_match": Tries to extract any match
+    The sympy value isn't pickled, it's rebuilt from the matched groups (through the parsing caches) the first
+    time it's accessed after unpickling. Records are therefore cheap to store in a `ParseCache` or send from
+    `WorkerPool` workers, and callers that only need the text can use `normalized` without calling `str()` on
+    large sympy trees.
 
-    Returns:
-        list: List of extracted predictions, with first fallbac string appended if fallback_mode is "first_match"
+    Attributes:
+        normalized (str): The extracted string, normalized for latex (the string `parse` returns as fallback).
+        span (tuple[int, int]): Start and end of the match in the parsed text.
+        priority (int): Priority of the pattern which matched, lower is tried first.
+        config (ExtractionTarget): The extraction target the pattern belongs to.
+        is_fallback (bool): Whether this is the fallback string added by fallback_mode="first_match",
+            its value is then the string itself.
+    """
+
+    __slots__ = ("normalized", "span", "priority", "config", "is_fallback", "_groups", "_value")
+
+    _UNSET = object()
+
+    def __init__(
+        self,
+        normalized: str,
+        span: tuple[int, int],
+        priority: int,
+        config: ExtractionTarget,
+        groups: dict[str, str],
+        value: Basic | MatrixBase | str | None = _UNSET,
+        is_fallback: bool = False,
+    ):
+        self.normalized = normalized
+        self.span = span
+        self.priority = priority
+        self.config = config
+        self.is_fallback = is_fallback
+        self._groups = groups
+        self._value = value
+
+    @classmethod
+    def from_match(
+        cls,
+        match,
+        target_type: ExtractionTarget,
+        priority: int,
+        normalized: str,
+        value: Basic | MatrixBase | str | None = _UNSET,
+        is_fallback: bool = False,
+    ) -> "ParsedAnswer":
+        groups = {name: val for name, val in match.groupdict().items() if val is not None}
+        return cls(normalized, match.span(), priority, target_type, groups, value, is_fallback)
+
+    @property
+    def value(self) -> Basic | MatrixBase | str | None:
+        """The parsed value, the same object the plain `parse` output holds at this position."""
+        if self._value is ParsedAnswer._UNSET:
+            if self.is_fallback:
+                self._value = self.normalized
+            else:
+                self._value = extract_match(
+                    BoxedMatch(*self.span, self._groups), self.config
+                )[0]
+        return self._value
+
+    def __getstate__(self):
+        return {
+            name: getattr(self, name) for name in self.__slots__ if name != "_value"
+        }
+
+    def __setstate__(self, state):
+        for name, val in state.items():
+            setattr(self, name, val)
+        self._value = ParsedAnswer._UNSET
+
+    def __repr__(self) -> str:
+        return (
+            f"ParsedAnswer(normalized={self.normalized!r}, span={self.span}, priority={self.priority}, "
+            f"config={type(self.config).__name__}, is_fallback={self.is_fallback})"
+        )
+
+
+def starts_absent_before(
+    pattern: ExtractionPattern, found_anchors: dict[str, list[int]], pos: int
+) -> bool:
+    """Whether a search for pattern from pos finds the same matches as a search of the whole text.
+
+    This is the case if pattern has registered start literals and none of them occurs before pos, see
+    `pattern_starts`. A match starting before pos could otherwise overlap pos and hide the matches after it.
+    """
+    starts = pattern_starts.get(pattern)
+    return bool(starts) and all(
+        not found_anchors.get(start) or found_anchors[start][0] >= pos
+        for start in starts
+    )
+
+
+def _extract_from_groups(
+    pred: str,
+    grouped_patterns: list[tuple[int, list[tuple[ExtractionPattern, ExtractionTarget]]]],
+    found_anchors: dict[str, list[int]],
+    fallback_mode: Literal["no_fallback", "first_match"],
+    extraction_mode: Literal["first_match", "any_match"],
+    window_start: int = 0,
+    extractor: "ExtractionCandidates | None" = None,
+    structured: bool = False,
+) -> list | None:
+    """Runs the extraction on pred[window_start:], returns None if the window isn't enough to decide.
+
+    The patterns of a priority group are only run on the window if none of them can have a match starting
+    before it (see `starts_absent_before`), so that they find exactly the matches of a full scan and the
+    outcome is the same as for the full text. Otherwise None is returned.
+
+    If an extractor is given, the matches and their extractions are obtained from it, so that they are
+    shared with other extractions of the same text. If structured is True, `ParsedAnswer` records are
+    returned instead of the values.
     """
     extracted_predictions = []
     fallbacks = []
 
-    # Get all patterns and sort by priority
-    all_patterns = [
-        (pattern, target_type, priority)
-        for target_patterns, target_type in target_res
-        for pattern, priority in target_patterns
-    ]
-
-    # Group patterns by priority using itertools.groupby
     match_found = False
-    sorted_patterns = sorted(all_patterns, key=lambda x: x[2])
-    grouped_patterns = list(
-        (gr, list(val)) for gr, val in groupby(sorted_patterns, key=lambda x: x[2])
-    )
-    for _, patterns_group in grouped_patterns:
+    for priority, patterns_group in grouped_patterns:
+        patterns_group = [
+            (pattern, target_type)
+            for pattern, target_type in patterns_group
+            if can_match(pattern, found_anchors)
+        ]
+        # A match before the window could win or hide the matches in the window
+        if window_start > 0 and not all(
+            starts_absent_before(pattern, found_anchors, window_start)
+            for pattern, _ in patterns_group
+        ):
+            return None
+
         # Find all matches for each pattern in this priority group
-        matches_with_pos = (
-            (match, match.start(), match.end(), target_type)
-            for pattern, target_type, _ in patterns_group
-            for match in pattern.finditer(pred)
-        )
+        matches_with_pos = []
+        for pattern, target_type in patterns_group:
+            matches = (
+                pattern.finditer(pred, window_start)
+                if extractor is None
+                else extractor.find_matches(pattern, window_start)
+            )
+            for match in matches:
+                matches_with_pos.append(
+                    (match, match.start(), match.end(), target_type, pattern)
+                )
 
         # Sort matches by end position (rightmost first) and then by start position (leftmost first)
         matches_with_pos = sorted(
@@ -722,15 +1319,31 @@ def extract_target_from_pred(
         )
 
         # Try to extract from each match, starting from rightmost
-        for match, _, _, target_type in matches_with_pos:
-            extracted_match, str_fallback = extract_match(match, target_type)
+        for match, _, _, target_type, pattern in matches_with_pos:
+            extracted_match, str_fallback = (
+                extract_match(match, target_type)
+                if extractor is None
+                else extractor.extract_match(pattern, match, target_type)
+            )
 
             match_found = True
             if str_fallback:
-                fallbacks.append(str_fallback)
+                fallbacks.append(
+                    ParsedAnswer.from_match(
+                        match, target_type, priority, str_fallback, is_fallback=True
+                    )
+                    if structured
+                    else str_fallback
+                )
 
             if extracted_match is not None:
-                extracted_predictions.append(extracted_match)
+                extracted_predictions.append(
+                    ParsedAnswer.from_match(
+                        match, target_type, priority, str_fallback, extracted_match
+                    )
+                    if structured
+                    else extracted_match
+                )
                 break
 
             if extraction_mode == "first_match":
@@ -746,6 +1359,99 @@ def extract_target_from_pred(
     return extracted_predictions
 
 
+def extract_target_from_pred(
+    pred: str,
+    target_res: list[tuple[list[tuple[ExtractionPattern, int]], ExtractionTarget]],
+    fallback_mode: Literal["no_fallback", "first_match"] = "no_fallback",
+    extraction_mode: Literal["first_match", "any_match"] = "any_match",
+    search_window: int | None = None,
+    structured: bool = False,
+):
+    """Extracts targets from a prediction string using regex patterns.
+    Returns first sucesffuly extracted match.
+
+    Args:
+        pred (str): The prediction string to extract from
+        target_res (list[tuple[list[tuple[ExtractionPattern, int]], ExtractionTarget]]): List of regex patterns and their priorities for each target type
+        fallback_mode (Literal["no_fallback", "first_match"], optional): How to handle extraction failures. Defaults to "no_fallback".
+            - "no_fallback": Return only successfully parsed match
+            - "first_match": Additionaly Include the first string match no matter how parsing finished
+        extraction_mode (Literal["first_match", "any_match"], optional): How to handle extraction failures. Defaults to "any_match".
+            - "first_match": Only tries to extract the first match
+            - "any_match": Tries to extract any match
+        search_window (int | None, optional): Size in characters of the window at the end of pred which is searched
+            first, the whole text is scanned if the window doesn't decide the extraction. None scans the whole text
+            right away. Defaults to None.
+        structured (bool, optional): Return `ParsedAnswer` records instead of the values. Defaults to False.
+
+    Returns:
+        list: List of extracted predictions, with first fallbac string appended if fallback_mode is "first_match"
+    """
+    return _extract_target_from_pred(
+        pred,
+        target_res,
+        fallback_mode,
+        extraction_mode,
+        search_window,
+        structured=structured,
+    )
+
+
+def _extract_target_from_pred(
+    pred: str,
+    target_res: list[tuple[list[tuple[ExtractionPattern, int]], ExtractionTarget]],
+    fallback_mode: Literal["no_fallback", "first_match"],
+    extraction_mode: Literal["first_match", "any_match"],
+    search_window: int | None,
+    found_anchors: dict[str, list[int]] | None = None,
+    extractor: "ExtractionCandidates | None" = None,
+    structured: bool = False,
+):
+    # Get all patterns and sort by priority
+    all_patterns = [
+        (pattern, target_type, priority)
+        for target_patterns, target_type in target_res
+        for pattern, priority in target_patterns
+    ]
+
+    # Find the literals the patterns require, so that patterns which can't match are skipped
+    if found_anchors is None:
+        found_anchors = scan_anchors(
+            pred, required_anchors(pattern for pattern, _, _ in all_patterns)
+        )
+
+    # Group patterns by priority using itertools.groupby
+    sorted_patterns = sorted(all_patterns, key=lambda x: x[2])
+    grouped_patterns = [
+        (priority, [(pattern, target_type) for pattern, target_type, _ in val])
+        for priority, val in groupby(sorted_patterns, key=lambda x: x[2])
+    ]
+
+    if search_window is not None and 0 < search_window < len(pred):
+        extracted = _extract_from_groups(
+            pred,
+            grouped_patterns,
+            found_anchors,
+            fallback_mode,
+            extraction_mode,
+            window_start=len(pred) - search_window,
+            extractor=extractor,
+            structured=structured,
+        )
+        if extracted is not None:
+            return extracted
+
+    return _extract_from_groups(
+        pred,
+        grouped_patterns,
+        found_anchors,
+        fallback_mode,
+        extraction_mode,
+        extractor=extractor,
+        structured=structured,
+    )
+
+
 def parse(
     pred: str,
     extraction_config: Sequence[ExtractionTarget] = [
@@ -754,7 +1460,11 @@ def parse(
     ],
     fallback_mode: Literal["no_fallback", "first_match"] = "first_match",
     extraction_mode: Literal["first_match", "any_match"] = "any_match",
-    parsing_timeout: int = 5,
+    parsing_timeout: float | None = 5,
+    sandbox: "WorkerPool | None" = None,
+    cache: "ParseCache | None" = None,
+    search_window: int | None = None,
+    structured: bool = False,
 ):
     """Extracts and parses mathematical expressions from a prediction string.
 
@@ -771,7 +1481,18 @@ def parse(
         extraction_mode (Literal["first_match", "any_match"], optional): Strategy for extracting matches. Defaults to "any_match".
             - "first_match": Stop after finding the first match
             - "any_match": Try to extract all possible matches, stops after first sucesful parsing attempt
-        parsing_timeout (int, optional): Maximum time in seconds to spend parsing each expression. Defaults to 3. Any timeout seconds > 0 or not None will result in the function to raise a ValueError if it's called in a threaded environment.
+        parsing_timeout (float | None, optional): Maximum time in seconds to spend parsing each expression, fractions of a second are supported. Defaults to 5. Any timeout seconds > 0 or not None will result in the function to raise a ValueError if it's called in a threaded environment.
+        sandbox (WorkerPool | None, optional): WorkerPool to run the extraction in. The extraction runs in a worker process which
+            is SIGKILLed and replaced when it exceeds parsing_timeout. Unlike the default signal based timeout, this interrupts
+            long C-level computations and works in threaded environments. Defaults to None.
+        cache (ParseCache | None, optional): Persistent cache of parse results. If the prediction was already parsed with the
+            same configuration (and library version), the stored result is returned without any extraction. Defaults to None.
+        search_window (int | None, optional): If set, the extraction first searches the last search_window characters of pred
+            (e.g. 4096) and scans the whole text only if the window doesn't decide the answer. A pattern is only searched in the
+            window if its matches start at a phrase such as "final answer" or at a \\boxed which doesn't occur before the window,
+            so the result is always the same as for a full scan. Defaults to None, which scans the whole text.
+        structured (bool, optional): Return a `ParsedAnswer` record for each prediction instead of the bare value, holding
+            the normalized string, the span of the match in pred, the priority and the config which matched. Defaults to False.
 
     Returns:
         list: List of extracted predictions. Each prediction can be:
@@ -779,10 +1500,13 @@ def parse(
             - String (for fallback matches when fallback_mode="first_match")
             - String (for multiple choice extraction with MultiChoiceExtractionConfig)
             Empty list if no matches are found.
+            With structured=True, a `ParsedAnswer` for each of them, whose `value` is the prediction.
 
     Examples:
         >>> parse("The answer is $\\frac{1}{2}$")
         [Rational(1, 2)]
+        >>> parse("The answer is $\\frac{1}{2}$", structured=True)[0].normalized
+        '\\frac{1}{2}'
         >>> parse("The answer is 1/2")
         [Rational(1, 2)]
         >>> parse("The answer is A", extraction_config=[StringExtractionConfig()])
@@ -798,26 +1522,53 @@ def parse(
         )
         TIMEOUT_WARNING_SHOWN = True
 
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.make_key(
+            pred, extraction_config, fallback_mode, extraction_mode, structured
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     try:
         target_res = get_extraction_regexes(extraction_config)
-        if "boxed" in pred:
-            pred = re.sub(
-                r"\\boxed\{\s*([^}]+?)\s*\}",  # find \\boxed{…}
-                r"\\boxed{ \1 }",               
-                pred
+        padded_pred, segments = _pad_boxed(pred)
+        if sandbox is not None:
+            extracted = sandbox.run(
+                extract_target_from_pred,
+                padded_pred,
+                target_res,
+                fallback_mode=fallback_mode,
+                extraction_mode=extraction_mode,
+                search_window=search_window,
+                structured=structured,
+                timeout_seconds=parsing_timeout,
             )
-        return timeout(timeout_seconds=parsing_timeout)(extract_target_from_pred)(
-            pred,
-            target_res,
-            fallback_mode=fallback_mode,
-            extraction_mode=extraction_mode,
-        )
+        else:
+            extracted = timeout(timeout_seconds=parsing_timeout)(extract_target_from_pred)(
+                padded_pred,
+                target_res,
+                fallback_mode=fallback_mode,
+                extraction_mode=extraction_mode,
+                search_window=search_window,
+                structured=structured,
+            )
+        if structured:
+            # Spans refer to pred, not to the text with padded boxes
+            for answer in extracted:
+                answer.span = (
+                    _unpad_position(segments, answer.span[0]),
+                    _unpad_position(segments, answer.span[1]),
+                )
+        # Timeouts and errors are not cached, they might not happen on the next run
+        if cache_key is not None:
+            cache.set(cache_key, extracted)
+        return extracted
     except ValueError as e:
         # Check if it's the signal error
         if str(e) == "signal only works in main thread of the main interpreter":
-            raise ValueError(
-                "Math-Verify 'parse' function doesn't support threaded environment due to usage of signal.alarm() in timeout mechanism. If you need to run in multithreaded environment it's recommended to set the parsing_timeout=None, which will run without timeout (and signal handling). In this case you need to handle the timeouting yourself."
-            ) from e
+            raise ValueError(THREADED_TIMEOUT_ERROR) from e
         logger.exception(f"Error parsing: {pred}")
         return []
     except Exception:
@@ -825,4 +1576,197 @@ def parse(
         return []
     except TimeoutException:
         logger.error(f"Timeout during parsing: {pred}")
-        return []
\ No newline at end of file
+        return []
+
+
+class ExtractionCandidates:
+    """Extractions of a single text, shared by all combinations of a set of extraction targets.
+
+    Each pattern is run over the text at most once, and each match is normalized and parsed at most once,
+    by whichever config needs it first. `parse` then returns the same result as `math_verify.parse` for any
+    combination of the requested targets, so trying several configs costs little more than trying one.
+    Use `extract_candidates` to create it.
+
+    Args:
+        pred (str): The text to extract from.
+        extraction_targets (Sequence[ExtractionTarget]): All the targets the text may be parsed with.
+        parsing_timeout (float | None, optional): Maximum time in seconds for each `parse`/`candidates` call. Defaults to 5.
+    """
+
+    def __init__(
+        self,
+        pred: str,
+        extraction_targets: Sequence[ExtractionTarget],
+        parsing_timeout: float | None = 5,
+    ):
+        self.pred, self._segments = _pad_boxed(pred)
+        self.extraction_targets = tuple(extraction_targets)
+        self.parsing_timeout = parsing_timeout
+        self._found_anchors: dict[str, list[int]] | None = None
+        self._matches: dict[tuple[ExtractionPattern, int], list] = {}
+        self._extractions: dict[
+            tuple[ExtractionTarget, ExtractionPattern, int, int],
+            tuple[Basic | MatrixBase | str | None, str],
+        ] = {}
+
+    def find_matches(self, pattern: ExtractionPattern, pos: int) -> list:
+        key = (pattern, pos)
+        matches = self._matches.get(key)
+        if matches is None:
+            matches = list(pattern.finditer(self.pred, pos))
+            self._matches[key] = matches
+        return matches
+
+    def extract_match(
+        self, pattern: ExtractionPattern, match, target_type: ExtractionTarget
+    ) -> tuple[Basic | MatrixBase | str | None, str]:
+        key = (target_type, pattern, match.start(), match.end())
+        extracted = self._extractions.get(key)
+        if extracted is None:
+            extracted = extract_match(match, target_type)
+            self._extractions[key] = extracted
+        return extracted
+
+    def _get_found_anchors(self) -> dict[str, list[int]]:
+        # Scanned once for the anchors of all the targets
+        if self._found_anchors is None:
+            patterns = [
+                pattern
+                for target_patterns, _ in get_extraction_regexes(self.extraction_targets)
+                for pattern, _ in target_patterns
+            ]
+            self._found_anchors = scan_anchors(self.pred, required_anchors(patterns))
+        return self._found_anchors
+
+    def _check_targets(self, target_types: Sequence[ExtractionTarget]) -> None:
+        unknown = [t for t in target_types if t not in self.extraction_targets]
+        if unknown:
+            raise ValueError(
+                f"Extraction targets {unknown} were not requested when creating the candidates"
+            )
+
+    def _run(self, func, *args):
+        try:
+            return timeout(timeout_seconds=self.parsing_timeout)(func)(*args)
+        except ValueError as e:
+            if str(e) == "signal only works in main thread of the main interpreter":
+                raise ValueError(THREADED_TIMEOUT_ERROR) from e
+            logger.exception(f"Error parsing: {self.pred}")
+            return []
+        except Exception:
+            logger.exception(f"Error parsing: {self.pred}")
+            return []
+        except TimeoutException:
+            logger.error(f"Timeout during parsing: {self.pred}")
+            return []
+
+    def parse(
+        self,
+        extraction_config: Sequence[ExtractionTarget],
+        fallback_mode: Literal["no_fallback", "first_match"] = "first_match",
+        extraction_mode: Literal["first_match", "any_match"] = "any_match",
+        structured: bool = False,
+    ) -> list:
+        """Parses the text with extraction_config, reusing the work of the previous calls.
+
+        Args:
+            extraction_config (Sequence[ExtractionTarget]): Targets to extract, all of them must have been requested.
+            fallback_mode (Literal["no_fallback", "first_match"], optional): See `math_verify.parse`. Defaults to "first_match".
+            extraction_mode (Literal["first_match", "any_match"], optional): See `math_verify.parse`. Defaults to "any_match".
+            structured (bool, optional): See `math_verify.parse`. Defaults to False.
+
+        Returns:
+            list: The same as `math_verify.parse(pred, extraction_config, fallback_mode, extraction_mode, structured=structured)`.
+        """
+        self._check_targets(extraction_config)
+        extracted = self._run(
+            lambda: _extract_target_from_pred(
+                self.pred,
+                get_extraction_regexes(extraction_config),
+                fallback_mode,
+                extraction_mode,
+                None,
+                self._get_found_anchors(),
+                self,
+                structured,
+            )
+        )
+        if structured:
+            for answer in extracted:
+                answer.span = (
+                    _unpad_position(self._segments, answer.span[0]),
+                    _unpad_position(self._segments, answer.span[1]),
+                )
+        return extracted
+
+    def candidates(
+        self, target_type: ExtractionTarget
+    ) -> list[tuple[int, Basic | MatrixBase | str | None, str]]:
+        """Returns every candidate of target_type in the order they would be tried.
+
+        Args:
+            target_type (ExtractionTarget): A requested target.
+
+        Returns:
+            list[tuple[int, Basic | MatrixBase | str | None, str]]: (priority, parsed value or None, extracted string)
+                of every match, by priority and rightmost first.
+        """
+        self._check_targets([target_type])
+
+        def collect():
+            found_anchors = self._get_found_anchors()
+            candidates = []
+            for priority, group in groupby(
+                sorted(get_target_patterns(target_type), key=lambda x: x[1]),
+                key=lambda x: x[1],
+            ):
+                matches = sorted(
+                    (
+                        (match, pattern)
+                        for pattern, _ in group
+                        if can_match(pattern, found_anchors)
+                        for match in self.find_matches(pattern, 0)
+                    ),
+                    key=lambda x: (x[0].end(), -x[0].start()),
+                    reverse=True,
+                )
+                for match, pattern in matches:
+                    candidates.append(
+                        (priority, *self.extract_match(pattern, match, target_type))
+                    )
+            return candidates
+
+        return self._run(collect)
+
+
+def extract_candidates(
+    pred: str,
+    extraction_targets: Sequence[ExtractionTarget] = (
+        LatexExtractionConfig(),
+        ExprExtractionConfig(),
+    ),
+    parsing_timeout: float | None = 5,
+) -> ExtractionCandidates:
+    """Prepares a text to be parsed with several combinations of extraction targets.
+
+    Instead of calling `parse` once per config, which re-scans the text and re-parses the same spans every
+    time, the returned object scans and parses each span once and answers every config from that.
+
+    Args:
+        pred (str): The text to extract from.
+        extraction_targets (Sequence[ExtractionTarget], optional): All the targets the text may be parsed with.
+            Defaults to (LatexExtractionConfig(), ExprExtractionConfig()).
+        parsing_timeout (float | None, optional): Maximum time in seconds for each parse of the text. Defaults to 5.
+
+    Returns:
+        ExtractionCandidates: The shared extractions of pred.
+
+    Example:
+        >>> targets = [LatexExtractionConfig(), ExprExtractionConfig(), MultiChoiceExtractionConfig()]
+        >>> candidates = extract_candidates("The answer is $\\frac{1}{2}$", targets)
+        >>> candidates.parse([LatexExtractionConfig(), ExprExtractionConfig()])
+        [Rational(1, 2), '\\frac{1}{2}']
+        >>> candidates.parse([ExprExtractionConfig()])  # No re-scan of the patterns shared with the first call
+        [...]
+    """
+    return ExtractionCandidates(pred, extraction_targets, parsing_timeout)
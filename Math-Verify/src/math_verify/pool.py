@@ -0,0 +1,315 @@
+# MIT License
+
+# Copyright (c) 2024 The HuggingFace Team
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Literal, Sequence
+
+from math_verify.errors import TimeoutException
+
+logger = logging.getLogger(__name__)
+
+
+def _worker_main(conn: Connection, memory_limit_mb: int | None) -> None:
+    """Main loop of a pool worker.
+
+    Receives (func, args, kwargs) tasks from the parent, runs them and sends back
+    (success, value) tuples. A None message shuts the worker down.
+    """
+    # The parent owns the interrupt handling, workers are killed by it if needed
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if memory_limit_mb is not None:
+        import resource
+
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+
+        func, args, kwargs = task
+        try:
+            result = (True, func(*args, **kwargs))
+        except (Exception, TimeoutException) as e:
+            result = (False, e)
+
+        try:
+            conn.send(result)
+        except Exception as e:
+            # Most likely the result couldn't be pickled
+            conn.send((False, RuntimeError(f"Could not send result: {e}")))
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb: int | None):
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks_done = 0
+
+    def kill(self) -> None:
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+
+class WorkerPool:
+    """A persistent pool of worker processes with per-task deadlines enforced by the parent.
+
+    Unlike the signal based `math_verify.utils.timeout`, the deadline is enforced from the
+    parent process, so the pool can be used from any thread. A worker that doesn't finish
+    its task in time is killed with SIGKILL and replaced by a fresh one, the rest of the pool
+    keeps running. This also interrupts C-level work (e.g. gmpy/mpmath big integer arithmetic
+    inside simplify) that a SIGALRM based timeout can't interrupt.
+
+    The pool can additionally be used as a sandbox for single calls (see `run`), which is how
+    `parse(..., sandbox=pool)` and `verify(..., sandbox=pool)` use it.
+
+    Args:
+        num_workers (int | None): Number of worker processes. Defaults to the number of CPUs.
+        start_method (str | None): Multiprocessing start method. Defaults to "fork" where available,
+            so that workers inherit the already imported modules and compiled regexes.
+        max_tasks_per_worker (int | None): Recycle a worker after it has processed this many tasks,
+            to bound memory growth of long running workers. None means workers are never recycled.
+        memory_limit_mb (int | None): RLIMIT_AS address space limit for each worker in MB. A task
+            exceeding it fails with MemoryError in the worker. None means no limit.
+
+    Example:
+        >>> with WorkerPool(num_workers=4) as pool:
+        ...     results = pool.map(parse, [("$1$",), ("$2$",)], timeout_seconds=5, default=[])
+    """
+
+    def __init__(
+        self,
+        num_workers: int | None = None,
+        start_method: str | None = None,
+        max_tasks_per_worker: int | None = None,
+        memory_limit_mb: int | None = None,
+    ):
+        if start_method is None:
+            start_method = (
+                "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+            )
+        self._ctx = multiprocessing.get_context(start_method)
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.memory_limit_mb = memory_limit_mb
+        self._workers: list[_Worker] = []
+        self._closed = False
+        # A pool serves one caller at a time, the workers are shared state
+        self._lock = threading.Lock()
+
+    def _ensure_workers(self) -> None:
+        if self._closed:
+            raise RuntimeError("WorkerPool is closed")
+        while len(self._workers) < self.num_workers:
+            self._workers.append(_Worker(self._ctx, self.memory_limit_mb))
+
+    def _replace(self, worker: _Worker, graceful: bool = False) -> _Worker:
+        if graceful:
+            worker.stop()
+        else:
+            worker.kill()
+        new_worker = _Worker(self._ctx, self.memory_limit_mb)
+        self._workers[self._workers.index(worker)] = new_worker
+        return new_worker
+
+    def _run_tasks(
+        self,
+        func: Callable[..., Any],
+        args_list: Sequence[tuple],
+        kwargs: dict[str, Any],
+        timeout_seconds: float | None,
+    ) -> list[tuple[Literal["ok", "error", "timeout"], Any]]:
+        """Runs all tasks and returns (status, value) for each of them in input order."""
+        self._ensure_workers()
+        outcomes: list[tuple[Literal["ok", "error", "timeout"], Any]] = [
+            ("error", None)
+        ] * len(args_list)
+        pending = deque(enumerate(args_list))
+        idle = deque(self._workers)
+        # conn -> (worker, task index, deadline)
+        busy: dict[Connection, tuple[_Worker, int, float | None]] = {}
+
+        while pending or busy:
+            while pending and idle:
+                worker = idle.popleft()
+                index, args = pending.popleft()
+                deadline = (
+                    time.monotonic() + timeout_seconds
+                    if timeout_seconds is not None and timeout_seconds > 0
+                    else None
+                )
+                try:
+                    worker.conn.send((func, args, kwargs))
+                except OSError:
+                    # Worker died while idle, replace it and retry the task
+                    idle.append(self._replace(worker))
+                    pending.appendleft((index, args))
+                    continue
+                except Exception as e:
+                    # Arguments couldn't be pickled, the worker is still fine
+                    outcomes[index] = ("error", e)
+                    idle.append(worker)
+                    continue
+                busy[worker.conn] = (worker, index, deadline)
+
+            if not busy:
+                # The last tasks couldn't be sent, there is nothing to wait for
+                continue
+            deadlines = [d for _, _, d in busy.values() if d is not None]
+            wait_timeout = (
+                max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            )
+            for conn in wait(list(busy.keys()), timeout=wait_timeout):
+                worker, index, _ = busy.pop(conn)
+                try:
+                    success, value = conn.recv()
+                except (EOFError, OSError):
+                    # The worker died, e.g. it was killed by the OOM killer
+                    outcomes[index] = (
+                        "error",
+                        RuntimeError("Worker crashed while processing the task"),
+                    )
+                    idle.append(self._replace(worker))
+                    continue
+                outcomes[index] = ("ok", value) if success else ("error", value)
+                worker.tasks_done += 1
+                if (
+                    self.max_tasks_per_worker is not None
+                    and worker.tasks_done >= self.max_tasks_per_worker
+                ):
+                    worker = self._replace(worker, graceful=True)
+                idle.append(worker)
+
+            now = time.monotonic()
+            for conn, (worker, index, deadline) in list(busy.items()):
+                if deadline is not None and now >= deadline:
+                    del busy[conn]
+                    outcomes[index] = ("timeout", None)
+                    idle.append(self._replace(worker))
+
+        return outcomes
+
+    def map(
+        self,
+        func: Callable[..., Any],
+        args_list: Sequence[tuple],
+        timeout_seconds: float | None = None,
+        default: Any = None,
+        kwargs: dict[str, Any] | None = None,
+    ) -> list[Any]:
+        """Runs func(*args, **kwargs) for every args in args_list and returns the results in input order.
+
+        Args:
+            func (Callable): Module level (picklable) function to run.
+            args_list (Sequence[tuple]): Positional arguments for each task.
+            timeout_seconds (float | None): Wall-clock deadline for each task, measured from the moment
+                it's dispatched to a worker. None disables the deadline.
+            default (Any): Value returned for tasks that timed out, crashed or raised.
+            kwargs (dict[str, Any] | None): Keyword arguments shared by all tasks.
+
+        Returns:
+            list[Any]: Results in the same order as args_list.
+        """
+        with self._lock:
+            outcomes = self._run_tasks(func, args_list, kwargs or {}, timeout_seconds)
+
+        results = []
+        for index, (status, value) in enumerate(outcomes):
+            if status == "ok":
+                results.append(value)
+                continue
+            if status == "timeout":
+                logger.error(f"Timeout for task {index}, worker was killed")
+            else:
+                logger.error(f"Task {index} failed in worker: {value!r}")
+            results.append(default)
+        return results
+
+    def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout_seconds: float | None = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Runs a single func(*args, **kwargs) call in a worker.
+
+        Args:
+            func (Callable): Module level (picklable) function to run.
+            *args: Positional arguments of the call.
+            timeout_seconds (float | None): Wall-clock deadline of the call. None disables the deadline.
+            **kwargs: Keyword arguments of the call.
+
+        Returns:
+            Any: The return value of the call.
+
+        Raises:
+            TimeoutException: If the call didn't finish before the deadline, the worker is killed.
+            Exception: Any exception raised by the call is re-raised in the caller.
+        """
+        with self._lock:
+            [(status, value)] = self._run_tasks(func, [args], kwargs, timeout_seconds)
+
+        if status == "timeout":
+            raise TimeoutException("Operation timed out!")
+        if status == "error":
+            raise value
+        return value
+
+    def close(self) -> None:
+        """Stops all workers. The pool can't be used afterwards."""
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
+            self._workers = []
+            self._closed = True
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
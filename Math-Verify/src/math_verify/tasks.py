@@ -19,7 +19,16 @@ def as_lighteval_metric(
     metric: Callable[
         [list[str], list[str]], tuple[float, Optional[tuple[list[str], list[str]]]]
     ],
+    metric_name: str = "extractive_match",
 ) -> SampleLevelMetric:
+    """Wraps a `math_metric` as a lighteval metric.
+
+    Use a different metric_name for each metric of a task, e.g. "pass@8" for
+    `math_metric(aggregation_function=pass_at_k(8))` or "maj@16" for `math_metric(maj_at_k=16)`.
+    A metric_name of the form "name@k" registers a sampling metric, for which lighteval generates k
+    predictions per sample (it reads k from the name), other names get the single greedy prediction.
+    """
+
     def sample_level_fn(
         formatted_doc: Doc, golds: list[str], predictions: list[str]
     ) -> float:
@@ -31,9 +40,11 @@ def as_lighteval_metric(
         return result
 
     return SampleLevelMetric(
-        metric_name="extractive_match",
+        metric_name=metric_name,
         sample_level_fn=sample_level_fn,
-        category=MetricCategory.GENERATIVE,
+        category=MetricCategory.GENERATIVE_SAMPLING
+        if "@" in metric_name
+        else MetricCategory.GENERATIVE,
         use_case=MetricUseCase.ACCURACY,
         corpus_level_fn=np.mean,
         higher_is_better=True,
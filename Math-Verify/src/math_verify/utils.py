@@ -22,6 +22,11 @@
 
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
 
 from math_verify.errors import TimeoutException
 
@@ -29,15 +34,147 @@ TIMEOUT_WARNING_SHOWN = False
 logger = logging.getLogger(__name__)
 
 
-def timeout(timeout_seconds: int | None = 10):  # noqa: C901
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of the counters of an LRUCache.
+
+    Attributes:
+        hits (int): Number of lookups that found an entry (including cached failures)
+        misses (int): Number of lookups that didn't find an entry
+        evictions (int): Number of entries evicted because the cache was full
+        size (int): Current number of entries
+        maxsize (int): Maximum number of entries
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _CachedFailure:
+    __slots__ = ("exception",)
+
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+class LRUCache:
+    """A thread-safe, bounded least recently used cache with hit/miss/eviction counters.
+
+    Unlike functools.lru_cache, the size can be changed at runtime, the counters include evictions,
+    and failures can be cached too (see `get_or_compute`), so that an input which can't be processed
+    doesn't pay the full price again on every occurrence.
+
+    Args:
+        maxsize (int): Maximum number of entries. 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def lookup(self, key: Hashable) -> tuple[bool, Any]:
+        """Returns (True, value) if key is cached, (False, None) otherwise."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Any], cache_failures: bool = True
+    ) -> Any:
+        """Returns the cached value for key, computing and caching it on a miss.
+
+        Args:
+            key (Hashable): Cache key
+            compute (Callable[[], Any]): Function computing the value
+            cache_failures (bool): Whether an exception raised by compute should be cached and re-raised
+                on the next lookups. TimeoutException is never cached.
+
+        Returns:
+            Any: The cached or computed value
+        """
+        found, value = self.lookup(key)
+        if found:
+            if isinstance(value, _CachedFailure):
+                raise value.exception.with_traceback(None)
+            return value
+
+        try:
+            value = compute()
+        except Exception as e:
+            if cache_failures:
+                self.put(key, _CachedFailure(e))
+            raise
+        self.put(key, value)
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            if maxsize <= 0:
+                self._data.clear()
+            self._evict()
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._data),
+                maxsize=self.maxsize,
+            )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def timeout(timeout_seconds: float | None = 10):  # noqa: C901
     """A decorator that applies a timeout to the decorated function.
 
     Args:
-        timeout_seconds (int): Number of seconds before timing out the decorated function.
-            Defaults to 10 seconds.
+        timeout_seconds (float): Number of seconds before timing out the decorated function, fractions of
+            a second are supported (e.g. 0.15). Defaults to 10 seconds.
 
     Notes:
-        On Unix systems, uses a signal-based alarm approach which is more efficient as it doesn't require spawning a new process.
+        On Unix systems, uses a signal-based timer (setitimer with ITIMER_REAL) approach which is more efficient as it doesn't require spawning a new process.
+        Timeouts can be nested there: an inner timeout never extends an enclosing one, which is restored when the inner call returns.
         On Windows systems, uses a multiprocessing-based approach since signal.alarm is not available. This will incur a huge performance penalty.
     """
     if timeout_seconds is None or timeout_seconds <= 0:
@@ -48,7 +185,7 @@ def timeout(timeout_seconds: int | None = 10):  # noqa: C901
         return no_timeout_decorator
 
     if os.name == "posix":
-        # Unix-like approach: signal.alarm
+        # Unix-like approach: real-time interval timer, which unlike signal.alarm supports sub-second timeouts
         import signal
 
         def decorator(func):
@@ -58,13 +195,25 @@ def timeout(timeout_seconds: int | None = 10):  # noqa: C901
             def wrapper(*args, **kwargs):
                 old_handler = signal.getsignal(signal.SIGALRM)
                 signal.signal(signal.SIGALRM, handler)
-                signal.alarm(timeout_seconds)
+                start = time.monotonic()
+                outer_remaining, _ = signal.setitimer(
+                    signal.ITIMER_REAL, timeout_seconds
+                )
+                if 0 < outer_remaining < timeout_seconds:
+                    # An enclosing timeout expires first, keep it
+                    signal.setitimer(signal.ITIMER_REAL, outer_remaining)
                 try:
                     return func(*args, **kwargs)
                 finally:
-                    # Cancel the alarm and restore previous handler
-                    signal.alarm(0)
+                    # Cancel the timer and restore previous handler
+                    signal.setitimer(signal.ITIMER_REAL, 0)
                     signal.signal(signal.SIGALRM, old_handler)
+                    if outer_remaining > 0:
+                        # Restore the enclosing timer, it fires right away if it expired meanwhile
+                        elapsed = time.monotonic() - start
+                        signal.setitimer(
+                            signal.ITIMER_REAL, max(outer_remaining - elapsed, 1e-6)
+                        )
 
             return wrapper
 
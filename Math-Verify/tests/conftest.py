@@ -0,0 +1,12 @@
+import pytest
+
+
+@pytest.fixture(params=["numpy", "no numpy"])
+def numpy_backend(request, monkeypatch):
+    """Runs a test with numpy (skipped if it isn't installed) and with the fallbacks used without it."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr("math_verify.grader.np", None)
+        monkeypatch.setattr("math_verify.columnar.np", None)
+    return request.param
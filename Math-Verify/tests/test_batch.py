@@ -0,0 +1,130 @@
+import os
+import signal
+import time
+
+import pytest
+import sympy
+
+from math_verify import (
+    LatexExtractionConfig,
+    WorkerPool,
+    parse,
+    parse_many,
+    verify,
+    verify_many,
+)
+from math_verify.errors import TimeoutException
+
+
+def sleep_and_return(seconds: float, value: int) -> int:
+    time.sleep(seconds)
+    return value
+
+
+def raise_error() -> None:
+    raise ValueError("error")
+
+
+def test_pool_keeps_input_order():
+    with WorkerPool(num_workers=2) as pool:
+        results = pool.map(
+            sleep_and_return, [(0.3, 1), (0.0, 2), (0.1, 3)], timeout_seconds=5
+        )
+    assert results == [1, 2, 3]
+
+
+def test_pool_kills_stuck_worker():
+    with WorkerPool(num_workers=1) as pool:
+        start = time.monotonic()
+        results = pool.map(
+            sleep_and_return, [(10, 1), (0, 2)], timeout_seconds=0.5, default=-1
+        )
+        assert time.monotonic() - start < 5
+        assert results == [-1, 2]
+        # The killed worker was replaced and the pool is still usable
+        assert pool.map(sleep_and_return, [(0, 3)], timeout_seconds=1) == [3]
+
+
+def test_pool_failed_task_returns_default():
+    with WorkerPool(num_workers=1) as pool:
+        assert pool.map(raise_error, [(), ()], default="failed") == ["failed", "failed"]
+
+
+def test_pool_unpicklable_last_task():
+    with WorkerPool(num_workers=1) as pool:
+        start = time.monotonic()
+        results = pool.map(
+            len, [("ab",), ((lambda: 1),)], timeout_seconds=2, default="failed"
+        )
+        assert time.monotonic() - start < 5
+        assert results == [2, "failed"]
+        results = pool.map(len, [((lambda: 1),)], timeout_seconds=2, default="failed")
+        assert results == ["failed"]
+
+
+def test_parse_many():
+    preds = ["$\\frac{1}{2}$", "The answer is 3", "no answer here"]
+    with WorkerPool(num_workers=2) as pool:
+        results = parse_many(preds, pool=pool)
+    assert results == [parse(pred) for pred in preds]
+    assert results[0][0] == sympy.Rational(1, 2)
+
+
+def is_warm(config) -> bool:
+    from math_verify.parser import _pattern_registry
+
+    return config in _pattern_registry
+
+
+def test_parse_many_workers_inherit_patterns():
+    config = LatexExtractionConfig(boxed_match_priority=7)
+    with WorkerPool(num_workers=1, start_method="fork") as pool:
+        parse_many(["$1$"], extraction_config=[config], pool=pool)
+        # The workers were forked after the patterns were compiled by parse_many
+        assert pool.run(is_warm, config)
+
+
+def test_verify_many():
+    golds = [parse("$1$"), parse("$\\frac{1}{2}$"), parse("$x^2$")]
+    targets = [parse("$1$"), parse("$0.5$"), parse("$x^3$")]
+    with WorkerPool(num_workers=2) as pool:
+        assert verify_many(golds, targets, pool=pool) == [True, True, False]
+
+
+def ignore_alarm_and_sleep(seconds: float) -> None:
+    # Simulates C-level work that SIGALRM can't interrupt
+    signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+    time.sleep(seconds)
+
+
+def allocate(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def test_sandbox_kills_uninterruptible_call():
+    with WorkerPool(num_workers=1) as pool:
+        with pytest.raises(TimeoutException):
+            pool.run(ignore_alarm_and_sleep, 10, timeout_seconds=0.5)
+        assert pool.run(sleep_and_return, 0, 1, timeout_seconds=1) == 1
+
+
+def test_sandbox_recycles_workers():
+    with WorkerPool(num_workers=1, max_tasks_per_worker=2) as pool:
+        pids = pool.map(os.getpid, [(), (), (), ()])
+    assert len(set(pids)) == 2
+
+
+def test_sandbox_memory_limit():
+    with WorkerPool(num_workers=1, memory_limit_mb=1024) as pool:
+        with pytest.raises(MemoryError):
+            pool.run(allocate, 2048)
+        assert pool.run(allocate, 1) == 1024 * 1024
+
+
+def test_sandbox_parse_and_verify():
+    with WorkerPool(num_workers=1) as pool:
+        gold = parse("$\\frac{1}{2}$", sandbox=pool)
+        pred = parse("The answer is 0.5", sandbox=pool)
+        assert gold == parse("$\\frac{1}{2}$")
+        assert verify(gold, pred, sandbox=pool)
+        assert not verify(gold, parse("$3$"), sandbox=pool)
@@ -0,0 +1,45 @@
+import pytest
+import sympy
+
+from math_verify import MultiChoiceExtractionConfig, parse
+from math_verify.parser import find_boxed_spans, pad_boxed_content
+
+
+def test_find_boxed_spans_balances_braces():
+    text = "a \\boxed{\\frac{1}{2}} and \\fbox {3} \\boxed{\\boxed{4}} \\boxed{x"
+    spans = find_boxed_spans(text)
+    assert [text[start : end + 1] for start, _, end in spans] == [
+        "\\boxed{\\frac{1}{2}}",
+        "\\fbox {3}",
+        "\\boxed{\\boxed{4}}",
+    ]
+    assert [text[content_start:end] for _, content_start, end in spans] == [
+        "\\frac{1}{2}",
+        "3",
+        "\\boxed{4}",
+    ]
+
+
+def test_pad_boxed_content_keeps_nested_braces():
+    assert (
+        pad_boxed_content("so $\\boxed{ \\frac{1}{2}}$ or \\boxed{}")
+        == "so $\\boxed{ \\frac{1}{2} }$ or \\boxed{}"
+    )
+
+
+def test_nested_boxed():
+    parsed = parse("The result is $\\boxed{\\frac{1}{2}}$, so \\boxed{3}")
+    assert set(parsed[0].args) == {sympy.Rational(1, 2), sympy.Integer(3)}
+    assert parsed[1] == "\\frac{1}{2},3"
+
+
+@pytest.mark.parametrize(
+    "pred,expected",
+    [
+        ("I choose A and the answer is \\boxed{B}", "b"),
+        ("so it's $\\boxed{ C }$ not D", "c"),
+        ("the final answer is \\fbox{D} and not A", "d"),
+    ],
+)
+def test_multichoice_boxed(pred, expected):
+    assert parse(pred, [MultiChoiceExtractionConfig()])[0] == expected
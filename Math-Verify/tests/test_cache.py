@@ -0,0 +1,219 @@
+from unittest.mock import patch
+
+import sympy
+
+from math_verify import (
+    LatexExtractionConfig,
+    ParseCache,
+    VerifyCache,
+    WorkerPool,
+    compile_gold,
+    parse,
+    verify,
+    verify_many,
+)
+from math_verify.errors import TimeoutException
+
+
+def test_parse_cache_roundtrip(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache.sqlite"))
+    result = parse("$\\frac{1}{2}$", cache=cache)
+    assert result[0] == sympy.Rational(1, 2)
+    assert len(cache) == 1
+
+    # A new cache on the same file is used without any extraction
+    cache = ParseCache(str(tmp_path / "cache.sqlite"))
+    with patch("math_verify.parser.extract_target_from_pred") as mock_extract:
+        assert parse("$\\frac{1}{2}$", cache=cache) == result
+        mock_extract.assert_not_called()
+
+
+def test_parse_cache_key_depends_on_config(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache.sqlite"))
+    parse("\\boxed{1}", cache=cache)
+    no_boxed = parse(
+        "\\boxed{1}",
+        [LatexExtractionConfig(boxed_match_priority=-1)],
+        fallback_mode="no_fallback",
+        cache=cache,
+    )
+    assert no_boxed == []
+    assert len(cache) == 2
+
+
+def test_parse_cache_eviction(tmp_path):
+    cache = ParseCache(str(tmp_path / "cache.sqlite"), max_entries=10)
+    config = [LatexExtractionConfig()]
+    for i in range(30):
+        parse(f"${i}$", config, cache=cache)
+    assert len(cache) <= 10
+    # Least recently used entries are evicted first
+    assert (
+        cache.get(ParseCache.make_key("$0$", config, "first_match", "any_match"))
+        is None
+    )
+    assert (
+        cache.get(ParseCache.make_key("$29$", config, "first_match", "any_match"))[0]
+        == 29
+    )
+
+
+def test_in_memory_parse_caches_cache_failures():
+    from math_verify.parser import (
+        clear_parse_caches,
+        get_parse_cache_stats,
+        parse_latex_cached,
+    )
+
+    clear_parse_caches()
+    with patch(
+        "math_verify.parser.latex2sympy", side_effect=ValueError("invalid")
+    ) as mock_latex2sympy:
+        for _ in range(3):
+            try:
+                parse_latex_cached("\\frac{")
+            except ValueError:
+                pass
+        assert mock_latex2sympy.call_count == 1
+
+    stats = get_parse_cache_stats()["parse_latex"]
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+    clear_parse_caches()
+
+
+def test_in_memory_parse_cache_resize():
+    from math_verify.parser import (
+        DEFAULT_PARSE_CACHE_SIZE,
+        clear_parse_caches,
+        get_parse_cache_stats,
+        parse_expr_cached,
+        set_parse_cache_size,
+    )
+
+    clear_parse_caches()
+    try:
+        set_parse_cache_size(2)
+        for expr in ["1", "2", "3"]:
+            parse_expr_cached(expr)
+        stats = get_parse_cache_stats()["parse_expr"]
+        assert (stats.size, stats.maxsize, stats.evictions) == (2, 2, 1)
+    finally:
+        set_parse_cache_size(DEFAULT_PARSE_CACHE_SIZE)
+        clear_parse_caches()
+
+
+def test_latex_groups_are_cached_by_content():
+    from math_verify.parser import clear_parse_caches, get_parse_cache_stats
+
+    clear_parse_caches()
+    first = parse("Long reasoning... so the answer is $\\boxed{\\frac{1}{3}}$")
+    second = parse("Other reasoning, the answer is $\\boxed{\\frac{1}{3}}$")
+    assert first[0] == second[0] == sympy.Rational(1, 3)
+    assert get_parse_cache_stats()["latex_group"].hits >= 1
+    clear_parse_caches()
+
+
+def test_verify_cache_roundtrip(tmp_path):
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    gold, pred = parse("$x^2 - 1$"), parse("$(x - 1)(x + 1)$")
+    assert verify(gold, pred, cache=cache)
+    assert not verify(gold, parse("$x^2 + 1$"), cache=cache)
+    assert len(cache) == 2
+
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    with patch("math_verify.grader.sympy_expr_eq") as mock_eq:
+        assert verify(gold, pred, cache=cache)
+        assert not verify(gold, parse("$x^2 + 1$"), cache=cache)
+        mock_eq.assert_not_called()
+
+
+def test_verify_cache_key_depends_on_settings(tmp_path):
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    gold, pred = parse("$\\frac{1}{3}$"), parse("$0.333$")
+    assert verify(gold, pred, float_rounding=3, cache=cache)
+    assert not verify(gold, pred, cache=cache)
+    assert len(cache) == 2
+    # Symbols with different assumptions have the same str, but not the same srepr
+    x, x_positive = sympy.Symbol("x"), sympy.Symbol("x", positive=True)
+    assert VerifyCache.make_key(
+        [x], [x], 6, 15, True, "reject"
+    ) != VerifyCache.make_key([x], [x_positive], 6, 15, True, "reject")
+
+
+def test_verify_cache_skips_timeouts(tmp_path):
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    with patch(
+        "math_verify.grader.sympy_expr_eq", side_effect=TimeoutException("timeout")
+    ):
+        assert not verify(parse("$x$"), parse("$y + 1$"), cache=cache)
+    assert len(cache) == 0
+
+
+def test_gold_checker_uses_verify_cache(tmp_path):
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    gold, pred = parse("$\\frac{3}{4}$"), parse("$0.75$")
+    assert compile_gold(gold, cache=cache).check(pred)
+    # Same key as verify with the same settings
+    with patch("math_verify.grader.sympy_expr_eq") as mock_eq:
+        assert verify(gold, pred, cache=cache)
+        mock_eq.assert_not_called()
+
+
+def test_verify_many_shares_verify_cache(tmp_path):
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    golds = [parse(f"${i}$") for i in range(6)]
+    targets = [parse(f"${i if i % 2 else i + 1}$") for i in range(6)]
+    with WorkerPool(num_workers=2) as pool:
+        results = verify_many(golds, targets, pool=pool, cache=cache)
+    assert results == [i % 2 == 1 for i in range(6)]
+    # Written by the workers
+    assert len(cache) == 6
+    assert verify(golds[1], targets[1], cache=cache)
+
+
+def test_sympy_caches_reuse_results():
+    from math_verify.grader import (
+        clear_sympy_caches,
+        get_sympy_cache_stats,
+        simplify,
+        solve,
+    )
+
+    clear_sympy_caches()
+    gold, pred = parse("$\\sin(x)^2 + \\cos(x)^2 + x$"), parse("$1 + x$")
+    with patch("math_verify.grader.simplify", wraps=simplify) as mock_simplify:
+        for _ in range(3):
+            assert verify(gold, pred, numeric_probing="off")
+    assert mock_simplify.call_count == 1
+    assert get_sympy_cache_stats()["simplify"].hits == 2
+
+    with patch("math_verify.grader.solve", wraps=solve) as mock_solve:
+        for _ in range(2):
+            assert verify(parse("$x^2 - 3x + 2 \\geq 0$"), parse("$x^2 + 2 \\geq 3x$"))
+    solved = [call.args[0] for call in mock_solve.call_args_list]
+    assert len(solved) == len(set(solved))
+    clear_sympy_caches()
+
+
+def test_sympy_cache_resize():
+    from math_verify.grader import (
+        DEFAULT_SYMPY_CACHE_SIZE,
+        clear_sympy_caches,
+        evalf_cached,
+        get_sympy_cache_stats,
+        set_sympy_cache_size,
+    )
+
+    clear_sympy_caches()
+    try:
+        set_sympy_cache_size(2)
+        for value in [1, 2, 3]:
+            evalf_cached(sympy.sqrt(value))
+        stats = get_sympy_cache_stats()["evalf"]
+        assert (stats.size, stats.maxsize, stats.evictions) == (2, 2, 1)
+        # Unhashable matrices are computed without caching
+        assert evalf_cached(sympy.Matrix([[sympy.sqrt(2)]]))[0] == sympy.sqrt(2).evalf()
+        assert get_sympy_cache_stats()["evalf"].size == 2
+    finally:
+        set_sympy_cache_size(DEFAULT_SYMPY_CACHE_SIZE)
+        clear_sympy_caches()
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+import pytest
+
+from math_verify import extract_candidates, parse
+from math_verify.parser import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    MultiChoiceExtractionConfig,
+    StringExtractionConfig,
+    latex2sympy,
+)
+
+TARGETS = [
+    LatexExtractionConfig(),
+    ExprExtractionConfig(),
+    MultiChoiceExtractionConfig(),
+]
+
+
+@pytest.mark.parametrize(
+    "pred",
+    [
+        "The final answer is $\\frac{1}{2}$. I hope it is correct.",
+        "Answer: 3/4",
+        "so the result is \\boxed{5} and also \\boxed{x}",
+        "The correct option is (B) is the right choice",
+        "Đáp án đúng là 7",
+        "$$x = 2$$ so \\boxed{A}",
+        "Nothing to see here",
+    ],
+)
+@pytest.mark.parametrize(
+    "config",
+    [
+        [LatexExtractionConfig(), ExprExtractionConfig()],
+        [ExprExtractionConfig()],
+        [MultiChoiceExtractionConfig()],
+        [MultiChoiceExtractionConfig(), ExprExtractionConfig()],
+    ],
+)
+def test_candidates_parse_matches_parse(pred, config):
+    candidates = extract_candidates(pred, TARGETS)
+    for fallback_mode in ["first_match", "no_fallback"]:
+        assert [str(x) for x in candidates.parse(config, fallback_mode)] == [
+            str(x) for x in parse(pred, config, fallback_mode)
+        ]
+
+
+def test_candidates_parse_each_span_once():
+    candidates = extract_candidates("Some text $\\frac{1}{2}$ and $x+1$", TARGETS)
+    with patch("math_verify.parser.latex2sympy", wraps=latex2sympy) as mock:
+        first = candidates.parse([LatexExtractionConfig(), ExprExtractionConfig()])
+        calls = mock.call_count
+        second = candidates.parse([LatexExtractionConfig()])
+        third = candidates.parse([LatexExtractionConfig(), ExprExtractionConfig()])
+    assert calls > 0
+    assert mock.call_count == calls
+    assert first == third
+    assert [str(x) for x in second] == [str(x) for x in first]
+
+
+def test_candidates_list_every_match():
+    candidates = extract_candidates("$1$ then $2$", TARGETS)
+    found = candidates.candidates(LatexExtractionConfig())
+    assert [extracted for _, _, extracted in found] == ["2", "1"]
+
+
+def test_candidates_reject_unrequested_target():
+    candidates = extract_candidates("Answer: 1", TARGETS)
+    with pytest.raises(ValueError):
+        candidates.parse([StringExtractionConfig()])
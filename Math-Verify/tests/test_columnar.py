@@ -0,0 +1,91 @@
+from fractions import Fraction
+
+import pytest
+
+from math_verify import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    evaluate_numeric_column,
+    extract_numeric_column,
+    math_metric,
+    numeric_column_match,
+    parse,
+    verify,
+)
+
+# The columns are numpy arrays if it's installed, otherwise lists
+pytestmark = pytest.mark.usefixtures("numpy_backend")
+
+ROWS = [
+    ("72", "So she sold 72 clips. The final answer is $\\boxed{72}$"),
+    ("72", "The answer is 73"),
+    ("1,000", "The final answer is 1000. I hope it is correct."),
+    ("0.75", "The answer is $\\frac{3}{4}$"),
+    ("0.333333", "The answer is $\\frac{1}{3}$"),
+    ("0.33", "The answer is $\\frac{1}{3}$"),
+    ("2", "The answer is $\\frac{4}{2}$"),
+    ("50", "The answer is 50%"),
+    ("0.5", "The answer is 50%"),
+    ("-3", "Answer: -3"),
+    ("12", "The answer is $x + 1$"),
+    ("12", "No idea"),
+    ("3,5", "Đáp án đúng là 3,5"),
+]
+
+
+def test_extract_numeric_column():
+    column = extract_numeric_column(["$\\frac{6}{8}$", "1.5", "$x$", "1.5", "12%"])
+    assert list(column.fractions) == [
+        Fraction(3, 4),
+        Fraction(3, 2),
+        None,
+        Fraction(3, 2),
+        Fraction(3, 25),
+    ]
+    assert list(column.is_float) == [False, True, False, True, False]
+    assert list(column.valid) == [True, True, False, True, True]
+    assert column.values[1] == 1.5
+    assert column.values[2] != column.values[2]
+
+
+def test_columns_match_math_metric():
+    golds, predictions = zip(*ROWS, strict=True)
+    metric = math_metric(
+        gold_extraction_target=(ExprExtractionConfig(),),
+        pred_extraction_target=(LatexExtractionConfig(), ExprExtractionConfig()),
+    )
+    expected = [bool(metric([gold], [pred])[0]) for gold, pred in ROWS]
+    assert [
+        bool(match) for match in evaluate_numeric_column(golds, predictions)
+    ] == expected
+    assert sum(expected) == 9
+
+
+def test_float_rounding():
+    gold = extract_numeric_column(["$\\frac{1}{3}$"] * 2, (LatexExtractionConfig(),))
+    pred = extract_numeric_column(["0.3333", "0.333333"], (ExprExtractionConfig(),))
+    assert list(numeric_column_match(gold, pred)) == [False, True]
+    assert list(numeric_column_match(gold, pred, float_rounding=4)) == [True, True]
+    with pytest.raises(ValueError):
+        numeric_column_match(gold, extract_numeric_column(["1"]))
+
+
+def test_float_rounding_ties():
+    # Ties are broken on the decimal values like verify, not on the binary ones (0.0679215 is 0.06792149999...)
+    golds = ["0.0679215", "0.0679215", "0.1234565", "73", "73", "0.1"]
+    predictions = [
+        "0.067921",
+        "0.067922",
+        "0.123456",
+        "73.0",
+        "73.0000001",
+        "0.09999999",
+    ]
+    expected = [
+        verify(parse(gold), parse(pred))
+        for gold, pred in zip(golds, predictions, strict=True)
+    ]
+    assert expected == [False, True, True, True, False, False]
+    gold = extract_numeric_column(golds, (ExprExtractionConfig(),))
+    pred = extract_numeric_column(predictions, (ExprExtractionConfig(),))
+    assert [bool(match) for match in numeric_column_match(gold, pred)] == expected
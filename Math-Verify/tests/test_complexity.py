@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+import sympy
+
+from math_verify import ComplexityLimits, verify
+from math_verify.grader import (
+    expression_complexity,
+    get_oversized_stats,
+    reset_oversized_stats,
+)
+
+x = sympy.Symbol("x")
+symbols = sympy.symbols("a0:1500")
+big_sum = sympy.Add(*(s**2 for s in symbols))
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (x**2 + 2 * x + 1, None),
+        (sympy.Matrix([[x, 1], [2, x**2]]), None),
+        (big_sum, "ops"),
+        (sympy.Matrix([[big_sum]]), "ops"),
+        (sympy.Integer(2) ** 20000, "integer_bits"),
+        (sympy.Rational(1, 3**10000), "integer_bits"),
+        (sympy.Pow(x, 100000, evaluate=False), "exponent"),
+    ],
+)
+def test_expression_complexity(expr, expected):
+    assert expression_complexity(expr) == expected
+
+
+def test_expression_depth():
+    expr = x
+    for _ in range(150):
+        expr = sympy.sin(expr)
+    assert expression_complexity(expr) == "depth"
+    assert expression_complexity(expr, ComplexityLimits(max_depth=200)) is None
+
+
+def test_oversized_pairs_skip_expensive_tiers():
+    reset_oversized_stats()
+    with patch("math_verify.grader.sympy_expr_eq") as mock:
+        assert verify(big_sum, sympy.Add(*reversed(big_sum.args)))
+        assert not verify(big_sum, big_sum + 1)
+        assert verify(x + sympy.Integer(2) ** 20000, x + sympy.Integer(2) ** 20000)
+        mock.assert_not_called()
+    assert get_oversized_stats()["ops"] == 2
+    assert get_oversized_stats()["integer_bits"] == 1
+
+    limits = ComplexityLimits(oversized="reject")
+    assert not verify(big_sum, big_sum, complexity_limits=limits)
+    # Without the guard the pair goes through the ladder
+    with patch("math_verify.grader.sympy_expr_eq", return_value=True) as mock:
+        assert verify(big_sum, big_sum + 1, complexity_limits=None)
+        mock.assert_called_once()
+    reset_oversized_stats()
+
+
+def test_oversized_pairs_accept_by_probing_only_if_probabilistic():
+    gold = big_sum + (x + 1) ** 2
+    pred = big_sum + x**2 + 2 * x + 1
+    with patch("math_verify.grader.sympy_expr_eq") as mock:
+        assert not verify(gold, pred)
+        assert not verify(gold, pred, numeric_probing="off")
+        assert verify(gold, pred, numeric_probing="probabilistic")
+        mock.assert_not_called()
+    reset_oversized_stats()
@@ -1,7 +1,7 @@
 import sympy
 from latex2sympy2_extended import NormalizationConfig
 
-from math_verify.parser import LatexExtractionConfig, parse
+from math_verify.parser import ExprExtractionConfig, LatexExtractionConfig, parse
 
 
 def test_boxed_match_priority():
@@ -70,3 +70,22 @@ def test_normalization_config():
         extraction_mode="first_match",
     )
     assert x[0] == sympy.Rational(1, 2)
+
+
+def test_warmup_compiles_patterns_once():
+    from unittest.mock import patch
+
+    from math_verify import warmup
+    from math_verify.parser import get_extraction_regexes
+
+    configs = [
+        LatexExtractionConfig(boxed_match_priority=0),
+        LatexExtractionConfig(),
+        ExprExtractionConfig(),
+    ]
+    warmup(configs)
+    with patch("math_verify.parser.lazy_latex_regex") as mock_latex_regex:
+        for _ in range(3):
+            get_extraction_regexes(configs[:1])
+            get_extraction_regexes(configs[1:])
+        mock_latex_regex.assert_not_called()
@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+import pytest
+
+from math_verify import parse, verify
+from math_verify.grader import (
+    canonical_latex_string,
+    get_verify_stats,
+    reset_verify_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_stats():
+    reset_verify_stats()
+    yield
+    reset_verify_stats()
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        ("\\dfrac{\\sqrt{10}}{2}", "\\frac{\\sqrt{10}}{2}"),
+        ("\\left( 1, 2 \\right)", "(1,2)"),
+        ("x \\geq 2", "x\\ge 2"),
+        ("a\\,b", "a b"),
+    ],
+)
+def test_canonical_latex_string_equal(a, b):
+    assert canonical_latex_string(a) == canonical_latex_string(b)
+
+
+@pytest.mark.parametrize(
+    "a,b",
+    [
+        ("x \\ge y", "x \\gey"),
+        ("\\frac{1}{2}", "\\frac{2}{1}"),
+        ("1 \\\\ 2", "1 \\ 2"),
+    ],
+)
+def test_canonical_latex_string_different(a, b):
+    assert canonical_latex_string(a) != canonical_latex_string(b)
+
+
+def test_equal_strings_skip_sympy():
+    gold = parse("$\\frac{\\sqrt{10}}{2}$")
+    pred = parse("The answer is $\\dfrac{\\sqrt{10}}{2}$")
+    with patch("math_verify.grader.sympy_expr_eq") as mock:
+        assert verify(gold, pred)
+        mock.assert_not_called()
+    assert get_verify_stats() == {"string": 1, "numeric": 0, "sympy": 0, "rejected": 0}
+
+
+def test_different_strings_use_sympy():
+    assert verify(parse("$\\frac{3}{4}$"), parse("$0.75$"))
+    assert verify(parse("$x^2$"), parse("$x \\cdot x$"))
+    assert not verify(parse("$\\frac{1}{3}$"), parse("$2$"))
+    assert not verify(parse("$x$"), [])
+    assert get_verify_stats() == {"string": 0, "numeric": 1, "sympy": 1, "rejected": 2}
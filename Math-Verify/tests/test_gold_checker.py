@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+import pytest
+
+from math_verify import compile_gold, parse, verify
+from math_verify.grader import clear_sympy_caches, solve
+
+PREDICTIONS = [
+    "$x = 2$",
+    "$2$",
+    "$y = 2$",
+    "$\\{1, 2, 3\\}$",
+    "$\\{3, 2, 1\\}$",
+    "$(1, 3)$",
+    "$1 < x < 3$",
+    "$\\frac{x^2 - 1}{x - 1}$",
+    "$x + 1$",
+    "$x \\geq 2$",
+    "$2 \\leq x$",
+    "$A$",
+]
+
+
+@pytest.mark.parametrize(
+    "gold",
+    [
+        "$x = 2$",
+        "$2$",
+        "$\\{1, 2, 3\\}$",
+        "$(1, 3)$",
+        "$x + 1$",
+        "$x \\geq 2$",
+        "$A$",
+    ],
+)
+def test_checker_matches_verify(gold):
+    parsed_gold = parse(gold)
+    checker = compile_gold(parsed_gold)
+    for pred in PREDICTIONS:
+        parsed_pred = parse(pred)
+        assert checker.check(parsed_pred) == verify(parsed_gold, parsed_pred), pred
+
+
+def test_checker_solves_gold_once():
+    # The process wide solve cache could already hold the gold
+    clear_sympy_caches()
+    checker = compile_gold(parse("$x^2 - 3x + 2 \\geq 0$"))
+    with patch("math_verify.grader.solve", wraps=solve) as mock:
+        for pred in ["$x^2 \\geq 3x - 2$", "$x^2 - 3x + 1 \\geq 0$", "$x \\leq 1$"]:
+            checker.check(parse(pred))
+    gold_solves = [
+        call for call in mock.call_args_list if call.args[0] == checker.gold[0]
+    ]
+    assert len(gold_solves) == 1
+    assert checker.gold_analyses[0].stats().hits > 0
@@ -0,0 +1,117 @@
+import time
+from unittest.mock import patch
+
+import pytest
+import sympy
+
+from math_verify import VerifyCache, grader, verify
+from math_verify.errors import TimeoutException
+from math_verify.utils import timeout
+
+x = sympy.Symbol("x")
+
+
+def slow_symbolic_eq(a, b):
+    time.sleep(5)
+    return False
+
+
+def test_nested_timeouts():
+    def inner():
+        time.sleep(5)
+
+    def outer():
+        start = time.monotonic()
+        with pytest.raises(TimeoutException):
+            timeout(0.1)(inner)()
+        assert time.monotonic() - start < 0.3
+        # The enclosing timeout is restored
+        time.sleep(5)
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutException):
+        timeout(0.5)(outer)()
+    assert time.monotonic() - start < 1
+
+    # An inner timeout doesn't extend the enclosing one
+    start = time.monotonic()
+    with pytest.raises(TimeoutException):
+        timeout(0.3)(lambda: timeout(5)(inner)())()
+    assert time.monotonic() - start < 1
+
+
+def test_cheap_match_is_not_lost_to_slow_pair():
+    with patch("math_verify.grader.sympy_symbolic_eq", side_effect=slow_symbolic_eq):
+        start = time.monotonic()
+        assert verify(
+            [x + 1, sympy.Integer(2)],
+            [sympy.Integer(2)],
+            timeout_seconds=1,
+            total_timeout_seconds=1,
+            numeric_probing="off",
+        )
+        assert time.monotonic() - start < 0.5
+
+
+def test_pairs_decided_by_cheap_tiers_are_compared_once():
+    # Probing rejects both pairs without reaching the expensive tiers
+    with patch(
+        "math_verify.grader.sympy_numeric_probe", wraps=grader.sympy_numeric_probe
+    ) as probe:
+        assert not verify([x + 1, x + 3], [x + 2])
+    assert probe.call_count == 2
+
+    # A pair which needs simplify is compared again without the deadline of the cheap pass
+    with patch(
+        "math_verify.grader.sympy_symbolic_eq", return_value=True
+    ) as symbolic_eq:
+        assert verify(
+            [x + 1, sympy.sin(x) ** 2 + sympy.cos(x) ** 2], [sympy.Integer(1)]
+        )
+    symbolic_eq.assert_called_once()
+
+
+def test_slow_tier_falls_through_to_next_tier():
+    # lhs - rhs differ (2x + 2y - 6 vs x + y - 3), simplify would time out, but solve decides.
+    # The tiers only split the time of a comparison which shares the total budget with other pairs.
+    y = sympy.Symbol("y")
+    gold = sympy.Eq(2 * x + 2 * y, 6, evaluate=False)
+    other_gold = sympy.Eq(x - y, 1, evaluate=False)
+    pred = sympy.Eq(x + y, 3, evaluate=False)
+    with patch("math_verify.grader.sympy_symbolic_eq", side_effect=slow_symbolic_eq):
+        start = time.monotonic()
+        assert verify(
+            [gold, other_gold],
+            pred,
+            timeout_seconds=3,
+            total_timeout_seconds=3,
+            numeric_probing="off",
+        )
+        assert time.monotonic() - start < 3
+
+
+def test_slow_simplify_gets_the_whole_timeout():
+    def slow_but_equal(a, b):
+        time.sleep(3)
+        return True
+
+    # A single pair, at the default settings, simplify may use all of timeout_seconds
+    with patch("math_verify.grader.sympy_symbolic_eq", side_effect=slow_but_equal):
+        assert verify(sympy.sin(x) ** 2 + sympy.cos(x) ** 2, sympy.Integer(1))
+
+
+def test_expensive_tiers_skipped_close_to_deadline():
+    with patch("math_verify.grader.sympy_symbolic_eq") as mock:
+        assert not verify(x + 1, x + 2, timeout_seconds=0.01, numeric_probing="off")
+        mock.assert_not_called()
+
+
+def test_degraded_result_is_not_cached(tmp_path):
+    cache = VerifyCache(str(tmp_path / "verify.sqlite"))
+    with patch("math_verify.grader.sympy_symbolic_eq", side_effect=slow_symbolic_eq):
+        assert not verify(
+            x + 1, x + 2, timeout_seconds=0.5, numeric_probing="off", cache=cache
+        )
+    assert len(cache) == 0
+    assert not verify(x + 1, x + 2, cache=cache)
+    assert len(cache) == 1
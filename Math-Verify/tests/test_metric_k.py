@@ -0,0 +1,93 @@
+from math import comb
+from unittest.mock import patch
+
+import pytest
+import sympy
+
+from math_verify import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    majority_vote,
+    math_metric,
+    parse,
+    pass_at_k,
+)
+from math_verify.grader import GoldChecker, compile_gold
+from math_verify.metric import answer_key
+
+GOLD_TARGET = (LatexExtractionConfig(),)
+PRED_TARGET = (LatexExtractionConfig(), ExprExtractionConfig())
+
+
+def test_pass_at_k():
+    assert pass_at_k(1)([1.0, 0.0, 0.0, 1.0]) == 0.5
+    assert pass_at_k(2)([1.0, 0.0, 0.0, 0.0]) == 1 - comb(3, 2) / comb(4, 2)
+    assert pass_at_k(3)([0.0, 1.0, 0.0]) == 1.0
+    assert pass_at_k(2)([0.0, 0.0, 0.0]) == 0.0
+    with pytest.raises(ValueError):
+        pass_at_k(4)([1.0, 0.0])
+
+
+def test_answer_key():
+    assert answer_key(parse("$\\frac{3}{4}$")) == answer_key(
+        parse("The answer is $\\frac{3}{4}$")
+    )
+    assert answer_key(parse("$\\frac{3}{4}$")) != answer_key(parse("$0.75$"))
+    assert answer_key(["\\dfrac{1}{x}"]) == answer_key(["\\frac{1}{x}"])
+    assert answer_key([]) == ()
+
+
+def test_answer_key_keeps_the_order_of_sets():
+    # Against an ordered gold, the elements of a set are compared in the order they were written
+    checker = compile_gold([sympy.Tuple(1, 2)])
+    in_order = parse("$\\{1,2\\}$", fallback_mode="no_fallback")
+    reversed_order = parse("$\\{2,1\\}$", fallback_mode="no_fallback")
+    assert checker.check(in_order)
+    assert not checker.check(reversed_order)
+    assert answer_key(in_order) != answer_key(reversed_order)
+    assert answer_key(in_order) == answer_key(
+        parse("The answer is $\\{1, 2\\}$", fallback_mode="no_fallback")
+    )
+
+
+def test_unique_answers_verified_once():
+    metric = math_metric(GOLD_TARGET, PRED_TARGET)
+    preds = ["$\\frac{3}{4}$"] * 5 + ["The answer is $\\frac{3}{4}$", "$1$", "$1$"]
+    with patch.object(GoldChecker, "check", autospec=True, return_value=True) as check:
+        score, _ = metric(["$\\frac{3}{4}$"], preds)
+    assert score == 1.0
+    # One call per unique answer: 3/4 and 1
+    assert check.call_count == 2
+
+
+def test_pass_at_k_metric():
+    metric = math_metric(GOLD_TARGET, PRED_TARGET, aggregation_function=pass_at_k(2))
+    preds = ["$\\frac{3}{4}$", "$0.75$", "$1$", "$2$"]
+    score, _ = metric(["$\\frac{3}{4}$"], preds)
+    assert score == pytest.approx(1 - comb(2, 2) / comb(4, 2))
+
+
+def test_majority_vote_clusters_equivalent_answers():
+    gold_checkers = [compile_gold(parse("$\\frac{3}{4}$"))]
+    answers = [
+        parse(pred)
+        for pred in ["$1$", "$\\frac{3}{4}$", "$0.75$", "$1$", "$\\frac{6}{8}$", "no"]
+    ]
+    # 3/4 has three votes in three forms, 1 only two
+    assert majority_vote(answers, gold_checkers) == 1.0
+    assert majority_vote(answers[:4], gold_checkers) == 0.0
+    assert majority_vote([[], []], gold_checkers) == 0.0
+
+
+def test_majority_vote_tie_goes_to_first_answer():
+    gold_checkers = [compile_gold(parse("$2$"))]
+    assert majority_vote([parse("$2$"), parse("$3$")], gold_checkers) == 1.0
+    assert majority_vote([parse("$3$"), parse("$2$")], gold_checkers) == 0.0
+
+
+def test_maj_at_k_metric():
+    metric = math_metric(GOLD_TARGET, PRED_TARGET, maj_at_k=3)
+    preds = ["$x = 2$", "$\\frac{4}{2}$", "$3$", "$3$", "$3$"]
+    assert metric(["$2$"], preds)[0] == 1.0
+    metric = math_metric(GOLD_TARGET, PRED_TARGET, maj_at_k=5)
+    assert metric(["$2$"], preds)[0] == 0.0
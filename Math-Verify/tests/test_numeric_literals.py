@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+import pytest
+import sympy
+from latex2sympy2_extended.latex2sympy2 import latex2sympy
+
+from math_verify import ExprExtractionConfig, parse, verify
+from math_verify.grader import get_verify_stats, numeric_literal_eq, reset_verify_stats
+from math_verify.parser import parse_numeric_literal
+
+
+@pytest.mark.parametrize(
+    "latex",
+    [
+        "42",
+        "-7",
+        "007",
+        "3.14",
+        "-.5",
+        "0.000",
+        "\\frac{3}{4}",
+        "\\frac{-6}{8}",
+        "-\\frac{1}{3}",
+        "50\\%",
+        "-12.5\\%",
+    ],
+)
+def test_literals_match_latex2sympy(latex):
+    expected = latex2sympy(
+        latex, is_real=True, convert_degrees=False, normalization_config=None
+    )
+    assert sympy.srepr(parse_numeric_literal(latex)) == sympy.srepr(expected)
+
+
+@pytest.mark.parametrize(
+    "latex", ["x", "2x", "1+1", "\\frac{1}{0}", "3,14", "1e5", "\\sqrt{2}"]
+)
+def test_non_literals_use_latex_parser(latex):
+    assert parse_numeric_literal(latex) is None
+
+
+def test_decimal_comma():
+    # In latex a comma separates the answers of a list, expression extraction reads 3,14 as a decimal
+    assert set(parse("$3,14$")[0]) == {3, 14}
+    assert parse("3,14", [ExprExtractionConfig()])[0] == sympy.Float("3.14")
+
+
+def test_literals_skip_latex2sympy():
+    with patch("math_verify.parser.latex2sympy") as mock:
+        assert parse("$\\frac{3}{4}$")[0] == sympy.Rational(3, 4)
+        assert parse("The answer is $50\\%$")[0].doit() == sympy.Rational(1, 2)
+        mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "gold,target,expected",
+    [
+        (sympy.Integer(2), sympy.Rational(4, 2), True),
+        (sympy.Rational(1, 3), sympy.Rational(2, 3), False),
+        (sympy.Rational(3, 4), sympy.Float("0.75"), True),
+        (sympy.Rational(1, 3), sympy.Float("0.3333333"), True),
+        (sympy.Integer(0), sympy.Float("-0.0"), True),
+        # Left to sympy, e.g. for the numeric_precision comparison
+        (sympy.Rational(1, 3), sympy.Float("0.33"), None),
+        (sympy.Integer(1), sympy.Symbol("x"), None),
+        (sympy.Float("inf"), sympy.Float("inf"), None),
+        # Ties are broken on the decimal value like sympy, not on the binary one (0.06792149999...)
+        (sympy.Float("0.0679215"), sympy.Float("0.067922"), True),
+        (sympy.Float("0.0679215"), sympy.Float("0.067921"), None),
+        (sympy.Float("0.1234565"), sympy.Float("0.123456"), True),
+        # sympy keeps rounded integers Integers, which only equal Floats of the same value
+        (sympy.Integer(73), sympy.Float("73.0"), True),
+        (sympy.Integer(73), sympy.Float("73.0000001"), None),
+        # sympy rounds these to two Floats of different precision for 0.1
+        (sympy.Float("0.0999999996"), sympy.Float("0.1000000004"), None),
+        (sympy.Float("0.0999999996"), sympy.Float("0.0999999997"), True),
+    ],
+)
+def test_numeric_literal_eq(gold, target, expected):
+    assert numeric_literal_eq(gold, target) is expected
+
+
+@pytest.mark.parametrize(
+    "gold,target",
+    [
+        ("0.0679215", "0.067921"),
+        ("0.9392115", "0.939211"),
+        ("0.0679215", "0.067922"),
+        ("0.1234565", "0.123457"),
+        ("0.1234565", "0.123456"),
+        ("73", "73.0000001"),
+        ("0.1", "0.09999999"),
+        ("\\frac{1}{3}", "0.3333333"),
+    ],
+)
+def test_rounding_matches_sympy(gold, target):
+    gold_number, target_number = parse(f"${gold}$")[0], parse(f"${target}$")[0]
+    with patch("math_verify.grader.numeric_literal_eq", return_value=None):
+        expected = verify([gold_number], [target_number])
+    assert verify([gold_number], [target_number]) == expected
+
+
+def test_numbers_are_verified_without_sympy():
+    reset_verify_stats()
+    with patch("math_verify.grader.sympy_expr_eq") as mock:
+        assert verify(parse("$\\frac{3}{4}$"), parse("$0.75$"))
+        assert not verify(parse("$\\frac{1}{3}$"), parse("$2$"))
+        mock.assert_not_called()
+    assert get_verify_stats()["numeric"] == 1
+    reset_verify_stats()
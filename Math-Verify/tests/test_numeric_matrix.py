@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+from sympy import Float, Integer, Matrix, Mul, Rational, Symbol, pi, sqrt
+
+from math_verify import parse, verify
+from math_verify.grader import (
+    MATRIX_VECTORIZE_MIN_ENTRIES,
+    sympy_numeric_eq,
+    sympy_numeric_matrix_eq,
+)
+
+x = Symbol("x")
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        (Matrix([[1, Rational(1, 2)]]), Matrix([[1, Rational(1, 2)]]), True),
+        (Matrix([[1, Rational(1, 3)]]), Matrix([[1, Float("0.3333333")]]), True),
+        (Matrix([[1, Rational(1, 3)]]), Matrix([[1, Float("0.33")]]), False),
+        (Matrix([[2, 3]]), Matrix([[2, 4]]), False),
+        (
+            Matrix([[Mul(Integer(50), Rational(1, 100), evaluate=False)]]),
+            Matrix([[Float("0.5")]]),
+            True,
+        ),
+        (Matrix([[sqrt(2), pi]]), Matrix([[2 ** Rational(1, 2), pi]]), True),
+        (Matrix([[1, sqrt(2)]]), Matrix([[1, sqrt(3)]]), False),
+        # Rounded like sympy, on the decimal values
+        (Matrix([[Float("0.0679215"), 1]]), Matrix([[Float("0.067921"), 1]]), False),
+        (Matrix([[Float("0.0679215"), 1]]), Matrix([[Float("0.067922"), 1]]), True),
+        (Matrix([[73, 1]]), Matrix([[Float("73.0000001"), 1]]), False),
+        (Matrix([[Float("0.1")]]), Matrix([[Float("0.09999999")]]), False),
+        # Compared entry by entry
+        (Matrix([[x, 1]]), Matrix([[x, 1]]), None),
+        (Matrix([[sqrt(2)]]), Matrix([[Float("1.414214")]]), None),
+    ],
+)
+def test_numeric_matrix_eq(a, b, expected):
+    assert sympy_numeric_matrix_eq(a, b, 6, 15) is expected
+    if expected is not None:
+        with patch("math_verify.grader.sympy_numeric_matrix_eq", return_value=None):
+            assert bool(sympy_numeric_eq(a, b, 6, 15)) is expected
+
+
+@pytest.mark.usefixtures("numpy_backend")
+def test_large_matrix():
+    n = MATRIX_VECTORIZE_MIN_ENTRIES
+    a = Matrix(n, 2, lambda i, j: Rational(i + 1, j + 3))
+    b = a.applyfunc(lambda v: Float(f"{float(v):.7f}"))
+    assert sympy_numeric_matrix_eq(a, b, 6, 15) is True
+    assert sympy_numeric_matrix_eq(a, b, 8, 15) is False
+    c = a.copy()
+    c[n - 1, 1] = Integer(2) ** 70
+    assert sympy_numeric_matrix_eq(a, c, 6, 15) is False
+    assert sympy_numeric_matrix_eq(c, c.copy(), 6, 15) is True
+
+
+@pytest.mark.usefixtures("numpy_backend")
+def test_large_matrix_rounding_ties():
+    n = MATRIX_VECTORIZE_MIN_ENTRIES
+    a = Matrix(n, 1, lambda i, j: Float(f"0.{int(i):02d}79215"))
+    # 0.0079215 rounds to 0.007922 (half to even on the decimal value)
+    b = a.copy()
+    b[0, 0] = Float("0.007922")
+    assert sympy_numeric_matrix_eq(a, b, 6, 15) is True
+    b[0, 0] = Float("0.007921")
+    assert sympy_numeric_matrix_eq(a, b, 6, 15) is False
+    # sympy rounds these to two Floats of different precision for 0.1
+    a[0, 0], b[0, 0] = Float("0.1"), Float("0.09999999")
+    assert sympy_numeric_matrix_eq(a, b, 6, 15) is False
+
+
+def test_verify_numeric_matrices():
+    gold = parse("$\\begin{pmatrix} 1 & \\frac{1}{3} \\\\ 2 & 0.5 \\end{pmatrix}$")
+    pred = parse("$\\begin{pmatrix} 1 & 0.333333 \\\\ 2 & \\frac{1}{2} \\end{pmatrix}$")
+    with patch(
+        "math_verify.grader.sympy_numeric_eq", wraps=sympy_numeric_eq
+    ) as numeric_eq:
+        assert verify(gold, pred)
+        # The matrices are compared at once, not entry by entry
+        numeric_eq.assert_called_once()
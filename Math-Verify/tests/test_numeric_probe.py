@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+import pytest
+from sympy import (
+    Abs,
+    Float,
+    Function,
+    Integer,
+    Rational,
+    Symbol,
+    cos,
+    floor,
+    log,
+    sin,
+    sqrt,
+)
+
+from math_verify import parse, verify
+from math_verify.grader import sympy_numeric_probe
+
+# Probing evaluates the points with numpy if it's installed, otherwise with mpmath
+pytestmark = pytest.mark.usefixtures("numpy_backend")
+
+x = Symbol("x", real=True)
+y = Symbol("y", real=True)
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ((x + 1) ** 2, x**2 + 2 * x + 1, True),
+        (sin(x) ** 2 + cos(x) ** 2, Integer(1), True),
+        (x * y, y * x, True),
+        (Rational(1, 3), Float("0.333333333333333"), True),
+        (sqrt(x**2), x, False),
+        (log(x**2), 2 * log(x), False),
+        (floor(x), x, False),
+        (x / 3, Float("0.333333") * x, None),
+        (Function("f")(x), x, None),
+        (Abs(x) < 1, x < 1, None),
+    ],
+)
+def test_sympy_numeric_probe(a, b, expected):
+    assert sympy_numeric_probe(a, b) is expected
+
+
+def test_probe_rejects_without_simplify():
+    gold = parse("$(x+1)^{5} - x^{5}$")
+    pred = parse("$5x^4+10x^3+10x^2+5x$")
+    with patch("math_verify.grader.simplify") as mock:
+        assert not verify(gold, pred)
+        mock.assert_not_called()
+
+
+@pytest.mark.parametrize("numeric_probing", ["off", "reject", "probabilistic"])
+def test_probe_modes_agree(numeric_probing):
+    gold = parse("$(x+1)^{2}$")
+    assert verify(gold, parse("$x^2+2x+1$"), numeric_probing=numeric_probing)
+    assert not verify(gold, parse("$x^2+2x$"), numeric_probing=numeric_probing)
+
+
+def test_probabilistic_accepts_without_simplify():
+    gold = parse("$\\sin(x)^{2} + \\cos(x)^{2}$")
+    with patch("math_verify.grader.simplify") as mock:
+        assert verify(gold, parse("$1$"), numeric_probing="probabilistic")
+        mock.assert_not_called()
@@ -0,0 +1,72 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from math_verify import ParsedAnswer, math_metric, parse
+from math_verify.parser import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    MultiChoiceExtractionConfig,
+    clear_parse_caches,
+    latex2sympy,
+)
+
+
+@pytest.mark.parametrize(
+    "pred,config",
+    [
+        (
+            "The final answer is $\\frac{1}{2}$. I hope it is correct.",
+            [LatexExtractionConfig()],
+        ),
+        (
+            "So \\boxed{  x + 1 } and \\boxed{ 40\\% }",
+            [LatexExtractionConfig(), ExprExtractionConfig()],
+        ),
+        ("Answer: 3/4", [ExprExtractionConfig()]),
+        ("The correct option is (B)", [MultiChoiceExtractionConfig()]),
+        ("$\\invalid{$", [LatexExtractionConfig()]),
+    ],
+)
+def test_structured_values_match_parse(pred, config):
+    plain = parse(pred, config)
+    structured = parse(pred, config, structured=True)
+    assert all(isinstance(answer, ParsedAnswer) for answer in structured)
+    assert [answer.value for answer in structured] == plain
+
+
+def test_structured_record_fields():
+    pred = "We get \\boxed{ 7 } at first, the final answer is $\\boxed{  8 }$. I hope it is correct."
+    answer, fallback = parse(pred, [LatexExtractionConfig()], structured=True)
+    assert answer.normalized == "8"
+    assert answer.priority == 0
+    assert isinstance(answer.config, LatexExtractionConfig)
+    assert pred[answer.span[0] : answer.span[1]].startswith(
+        "final answer is $\\boxed{  8 }$"
+    )
+    assert not answer.is_fallback
+    assert fallback.is_fallback and fallback.value == "8"
+
+
+def test_value_is_not_pickled():
+    [answer, _] = parse("The answer is $x^2 + 1$", structured=True)
+    restored = pickle.loads(pickle.dumps(answer))
+    assert "Pow" not in str(pickle.dumps(answer))
+    clear_parse_caches()
+    with patch("math_verify.parser.latex2sympy", wraps=latex2sympy) as mock:
+        assert restored.normalized == "x^2 + 1"
+        assert mock.call_count == 0
+        assert restored.value == answer.value
+        assert mock.call_count == 1
+
+
+def test_metric_reports_normalized_strings():
+    metric = math_metric(
+        gold_extraction_target=(LatexExtractionConfig(),),
+        pred_extraction_target=(LatexExtractionConfig(), ExprExtractionConfig()),
+    )
+    score, (golds, preds) = metric(["$\\frac{3}{4}$"], ["The answer is $0.75$"])
+    assert score == 1.0
+    assert golds == ["\\frac{3}{4}", "\\frac{3}{4}"]
+    assert preds == ["0.75", "0.75"]
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+import pytest
+
+from math_verify.parser import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    MultiChoiceExtractionConfig,
+    StringExtractionConfig,
+    extract_target_from_pred,
+    get_extraction_regexes,
+    scan_anchors,
+)
+
+
+def test_scan_anchors_finds_overlapping_anchors():
+    found = scan_anchors(
+        "The FINAL answer is: $1$",
+        ["final answer", "answer", "answer:", "$", "\\boxed"],
+    )
+    assert found == {"final answer": [4], "answer": [10], "$": [21, 23]}
+
+
+@pytest.mark.parametrize(
+    "pred",
+    [
+        "The final answer is $\\frac{1}{2}$. I hope it is correct.",
+        "Answer: 3/4",
+        "so the result is \\boxed{5}",
+        "The correct option is (B) is the right choice",
+        "Đáp án đúng là 7",
+        "Nothing to see here",
+    ],
+)
+@pytest.mark.parametrize(
+    "config",
+    [
+        (LatexExtractionConfig(), ExprExtractionConfig()),
+        (StringExtractionConfig(),),
+        (MultiChoiceExtractionConfig(),),
+    ],
+)
+def test_prefilter_doesnt_change_results(pred, config):
+    target_res = get_extraction_regexes(config)
+    prefiltered = extract_target_from_pred(
+        pred, target_res, fallback_mode="first_match"
+    )
+    with patch("math_verify.parser.can_match", return_value=True):
+        full = extract_target_from_pred(pred, target_res, fallback_mode="first_match")
+    assert prefiltered == full
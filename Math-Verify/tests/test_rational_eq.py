@@ -0,0 +1,48 @@
+from unittest.mock import patch
+
+import pytest
+import sympy
+
+from math_verify import parse, verify
+from math_verify.grader import rational_function_eq, sympy_symbolic_eq
+
+x, y = sympy.symbols("x y")
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ((x**2 - 1) / (x - 1), x + 1, True),
+        ((x + y) ** 6, sympy.expand((x + y) ** 6), True),
+        (1 / x + 1 / y, (x + y) / (x * y), True),
+        (sympy.Rational(1, 2) * x, x / 2, True),
+        (x**2, x, False),
+        ((x + 1) / (x - 1), (x - 1) / (x + 1), False),
+        (sympy.Integer(3), sympy.Rational(6, 2), True),
+        # Transcendental, algebraic or float content is left to simplify
+        (sympy.sin(x) ** 2 + sympy.cos(x) ** 2, sympy.Integer(1), None),
+        (sympy.sqrt(2) * x, x, None),
+        (sympy.pi * x, x, None),
+        (sympy.Float("0.5") * x, x / 2, None),
+        (sympy.I * x, x, None),
+    ],
+)
+def test_rational_function_eq(a, b, expected):
+    assert rational_function_eq(a, b) is expected
+
+
+def test_rational_functions_skip_simplify():
+    with patch("math_verify.grader.simplify") as mock:
+        assert sympy_symbolic_eq((x**3 - y**3) / (x - y), x**2 + x * y + y**2)
+        assert not sympy_symbolic_eq((x + y) ** 2, x**2 + y**2)
+        mock.assert_not_called()
+
+
+def test_transcendental_escalates_to_simplify():
+    assert sympy_symbolic_eq(sympy.sin(x) ** 2 + sympy.cos(x) ** 2, sympy.Integer(1))
+
+
+def test_verify_polynomials():
+    assert verify(parse("$(a+b)^3$"), parse("$a^3+3a^2b+3ab^2+b^3$"))
+    assert verify(parse("$\\frac{x^2-4}{x+2}$"), parse("$x-2$"))
+    assert not verify(parse("$(a+b)^2$"), parse("$a^2+b^2$"))
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from math_verify import (
+    ExprExtractionConfig,
+    LatexExtractionConfig,
+    MultiChoiceExtractionConfig,
+    StringExtractionConfig,
+    parse,
+)
+
+TOKENS = [
+    "$", "$$", "\\$", "5$", "\\[", "\\]", "\\(", "\\)", "\\boxed{", "\\fbox{", "{", "}",
+    "[", "]", "[0,9)", "3", "28", "-1", "0.5", "1/2", "\\frac{1}{2}", "x", "A", "B",
+    " ", " ", " ", "\n", ",", ".", "=", "%", "pct", "and", "or", "is", "words",
+]  # fmt: skip
+
+ANSWER_TOKENS = [
+    "final answer is", "The final answer is", "I hope", "answer", "Answer:", "option",
+    "is correct", "Đáp án đúng là",
+]  # fmt: skip
+
+# Answers as they end a chain of thought
+ANSWER_SNIPPETS = [
+    "The final answer is $3$. I hope it is correct.", "final answer is 28. I hope",
+    "Final answer: the value is 1/2", "Answer: B", "the answer is A.", "\\boxed{3}",
+    "$\\boxed{B}$", "B is the correct option", "Đáp án đúng là 5", "answer $x=2$",
+]  # fmt: skip
+
+CONFIGS = [
+    [LatexExtractionConfig(), ExprExtractionConfig()],
+    [LatexExtractionConfig(boxed_match_priority=0)],
+    [ExprExtractionConfig()],
+    [StringExtractionConfig()],
+    [MultiChoiceExtractionConfig()],
+]
+
+
+def random_text(rng: random.Random, tokens: list[str], length: int) -> str:
+    return "".join(rng.choice(tokens) for _ in range(length))
+
+
+def random_prediction(rng: random.Random) -> str:
+    mode = rng.randrange(3)
+    if mode == 0:
+        return random_text(rng, TOKENS + ANSWER_TOKENS, rng.randint(5, 80))
+    # Answer phrases only near the end, as in a chain of thought, so that the window can decide
+    if mode == 1:
+        return random_text(rng, TOKENS, rng.randint(20, 80)) + random_text(
+            rng, TOKENS + ANSWER_TOKENS * 3, rng.randint(3, 15)
+        )
+    # No box before the answer either, boxes may be matched from the start of the text
+    reasoning = random_text(rng, [t for t in TOKENS if "box" not in t], 50)
+    return reasoning + rng.choice(ANSWER_SNIPPETS) + random_text(rng, TOKENS, 2)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_search_window_matches_full_scan(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        pred = random_prediction(rng)
+        config = rng.choice(CONFIGS)
+        fallback_mode = rng.choice(["no_fallback", "first_match"])
+        extraction_mode = rng.choice(["first_match", "any_match"])
+        search_window = rng.choice([8, 32, 64, 128])
+        full = parse(pred, config, fallback_mode, extraction_mode)
+        windowed = parse(
+            pred, config, fallback_mode, extraction_mode, search_window=search_window
+        )
+        assert str(windowed) == str(full), (pred, config, search_window)
+
+
+@pytest.mark.parametrize(
+    "pred",
+    [
+        # A display math environment opened before the window
+        "$$\\boxed{28}$ pct " + "words " * 12 + "so $\\boxed{3}.$$[0,9)",
+        # A stray $ far before the window pairs with the opening $ of the last formula
+        "a $b$ c " * 36 + "x $ y " + "padding text " * 100 + "$z$ w $q",
+        # Higher priority match far before the window must still win
+        "The final answer is $7$. I hope it is correct. "
+        + "Let us consider $x^2 - 5x + 6 = 0$. " * 100
+        + "which gives $8$.",
+    ],
+)
+def test_search_window_match_before_window(pred):
+    assert str(parse(pred, search_window=32)) == str(parse(pred))
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+from latex2sympy2_extended.sets import FiniteSet
+from sympy import Eq, Float, Integer, Symbol, Tuple, primerange, sqrt
+
+from math_verify import parse, verify
+from math_verify.grader import (
+    _match_sets,
+    set_element_key,
+    sympy_deep_compare_set_and_tuple,
+    sympy_expr_eq,
+)
+
+x, y = Symbol("x"), Symbol("y")
+
+
+@pytest.mark.parametrize(
+    "gold,pred,expected",
+    [
+        (FiniteSet(1, 2, 3), FiniteSet(3, 1, 2), True),
+        (FiniteSet(x, 1), FiniteSet(1, x), True),
+        (FiniteSet(x, 2), FiniteSet(y, 2), False),
+        (FiniteSet(Eq(x, 3, evaluate=False), 1), FiniteSet(3, 1), True),
+        # The numeric orders differ: 1.41421356 < sqrt(2) < 1.414214
+        (
+            FiniteSet(sqrt(2), Float("1.41421356")),
+            FiniteSet(Float("1.414214"), sqrt(2)),
+            True,
+        ),
+        (FiniteSet(1, 2), FiniteSet(1, 2, 3), False),
+        # Numbers are rounded like sympy, on their decimal values
+        (FiniteSet(Float("0.0679215")), FiniteSet(Float("0.067921")), False),
+        (FiniteSet(Float("0.0679215"), 2), FiniteSet(2, Float("0.067922")), True),
+        (FiniteSet(Float("0.1")), FiniteSet(Float("0.09999999")), False),
+        # Tuples are compared in order
+        (Tuple(1, 2), Tuple(2, 1), False),
+    ],
+)
+def test_set_matching(gold, pred, expected):
+    assert sympy_deep_compare_set_and_tuple(gold, pred, 6, 15) is expected
+
+
+def test_element_keys():
+    assert set_element_key(Integer(2)) == 2
+    assert set_element_key(Eq(x, 2, evaluate=False)) == 2
+    assert set_element_key(x + 1) is None
+    assert set_element_key(Float("inf")) is None
+
+
+def test_ties_use_bipartite_matching():
+    # Gold 0 first takes pred 0, which gold 1 needs
+    assert _match_sets([[0, 1], [0]], 2, lambda i, j: True)
+    assert not _match_sets([[0], [0]], 2, lambda i, j: True)
+    assert not _match_sets([[0, 1], []], 2, lambda i, j: True)
+
+
+def test_large_sets_compare_close_elements_only():
+    primes = list(primerange(1000))
+    gold = FiniteSet(*primes)
+    pred = FiniteSet(*[Float(p) for p in reversed(primes)])
+    with patch("math_verify.grader.sympy_expr_eq", wraps=sympy_expr_eq) as mock:
+        assert sympy_deep_compare_set_and_tuple(gold, pred, 6, 15)
+        # All pairs are numbers, decided without sympy
+        mock.assert_not_called()
+    assert not sympy_deep_compare_set_and_tuple(
+        gold, FiniteSet(*primes[:-1], Float(primes[-1] + 2)), 6, 15
+    )
+
+
+def test_verify_sets_in_any_order():
+    assert verify(
+        parse("$\\{\\sqrt{2}, 1.41421356\\}$"), parse("$\\{1.414214, \\sqrt{2}\\}$")
+    )
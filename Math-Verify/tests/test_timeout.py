@@ -1,8 +1,16 @@
 import time
 from unittest.mock import patch
 
+import pytest
+
 from math_verify.grader import verify
-from math_verify.parser import parse
+from math_verify.parser import clear_parse_caches, parse
+
+
+@pytest.fixture(autouse=True)
+def _clear_parse_caches():
+    # Cached parses would bypass the mocked parsing functions
+    clear_parse_caches()
 
 
 @patch("math_verify.parser.parse_expr")
@@ -54,3 +62,32 @@ def test_timeout_verify(mock_verify):
 
     gold = [parse("1+1")[0]]
     assert not verify(gold, gold, timeout_seconds=1)
+
+
+@patch("math_verify.grader.sympy_expr_eq")
+def test_subsecond_timeout_verify(mock_verify):
+    def delayed_sympy_expr_eq(*args, **kwargs):
+        time.sleep(5)
+        return True
+
+    mock_verify.side_effect = delayed_sympy_expr_eq
+
+    gold = [parse("1+1")[0]]
+    start = time.monotonic()
+    assert not verify(gold, gold, timeout_seconds=0.15)
+    assert time.monotonic() - start < 1
+
+
+@patch("math_verify.grader.sympy_expr_eq")
+def test_total_timeout_verify(mock_verify):
+    def delayed_sympy_expr_eq(*args, **kwargs):
+        time.sleep(5)
+        return True
+
+    mock_verify.side_effect = delayed_sympy_expr_eq
+
+    # 9 gold x target pairs share a single budget instead of 9 full timeouts
+    gold = [parse("$x+1$")[0], parse("$x+2$")[0], parse("$x+3$")[0]]
+    start = time.monotonic()
+    assert not verify(gold, gold, timeout_seconds=1, total_timeout_seconds=0.5)
+    assert time.monotonic() - start < 1.5